@@ -0,0 +1,43 @@
+"""add recurrence to Reservation
+
+Revision ID: 7d2a4c8e1f03
+Revises: 3c1f5e9a7b42
+Create Date: 2026-10-18 12:40:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4c8e1f03'
+down_revision: Union[str, None] = '3c1f5e9a7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('reservation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('repeat_frequency', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('repeat_interval', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('repeat_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_to_reserve', sa.DateTime(), nullable=True))
+
+    op.execute('UPDATE reservation SET last_to_reserve = to_reserve')
+
+    with op.batch_alter_table('reservation', schema=None) as batch_op:
+        batch_op.alter_column('last_to_reserve', existing_type=sa.DateTime(), nullable=False)
+        batch_op.drop_index('ix_reservation_meetingroom_id_to_reserve')
+        batch_op.create_index('ix_reservation_meetingroom_id_last_to_reserve', ['meetingroom_id', 'last_to_reserve'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reservation', schema=None) as batch_op:
+        batch_op.drop_index('ix_reservation_meetingroom_id_last_to_reserve')
+        batch_op.create_index('ix_reservation_meetingroom_id_to_reserve', ['meetingroom_id', 'to_reserve'], unique=False)
+        batch_op.drop_column('last_to_reserve')
+        batch_op.drop_column('repeat_count')
+        batch_op.drop_column('repeat_interval')
+        batch_op.drop_column('repeat_frequency')
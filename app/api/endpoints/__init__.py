@@ -1,3 +1,4 @@
 from .meeting_room import router as meeting_room_router # noqa
 from .reservation import router as reservation_router # noqa
 from .user import router as user_router # noqa
+from .metrics import router as metrics_router # noqa
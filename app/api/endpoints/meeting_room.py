@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends
+import datetime as dt
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.meeting_room import (MeetingRoomCreate, MeetingRoomDB,
-                                      MeetingRoomUpdate)
+from app.core.pagination import Pagination, get_page_headers
+from app.core.room_cache import meeting_room_cache
+from app.core.serialization import (dump_meeting_rooms, dump_reservations,
+                                    json_response)
+from app.core.timeline import SLOT_MINUTES, get_busy_periods
+from app.models import MeetingRoom
+from app.schemas.meeting_room import (MEETING_ROOM_BATCH_MAX_SIZE,
+                                      MeetingRoomCacheStats,
+                                      MeetingRoomCreate, MeetingRoomDB,
+                                      MeetingRoomTimeline, MeetingRoomUpdate)
 from app.schemas.reservation import ReservationDB
 from app.crud.meeting_room import meeting_room_crud
 from app.crud.reservation import reservation_crud
-from app.core.db import get_async_session
-from app.api.validators import check_meeting_room_exists, check_name_duplicate
+from app.core.db import get_async_session, get_read_session
+from app.api.validators import (check_meeting_room_exists,
+                                check_meeting_rooms_exist,
+                                check_name_duplicate, check_names_duplicate,
+                                check_period)
 from app.core.user import current_superuser
 
 router = APIRouter()
@@ -33,19 +47,149 @@ async def create_new_meeting_room(
     return new_room
 
 
+@router.post(
+    '/batch',
+    response_model=list[MeetingRoomDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def create_meeting_rooms_batch(
+    meeting_rooms: list[MeetingRoomCreate] = Body(
+        min_length=1, max_length=MEETING_ROOM_BATCH_MAX_SIZE
+    ),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Только для суперюзеров.
+
+    Создает набор переговорных комнат одним запросом в одной транзакции.
+    """
+    await check_names_duplicate(
+        [meeting_room.name for meeting_room in meeting_rooms], session
+    )
+    new_rooms = await meeting_room_crud.create_many(meeting_rooms, session)
+    return new_rooms
+
+
+@router.patch(
+    '/batch',
+    response_model=list[MeetingRoomDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def partially_update_meeting_rooms_batch(
+    obj_in: MeetingRoomUpdate,
+    ids: list[int] = Query(
+        min_length=1, max_length=MEETING_ROOM_BATCH_MAX_SIZE
+    ),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Только для суперюзеров.
+
+    Присваивает переговорным комнатам с идентификаторами ids одинаковые
+    значения полей одним запросом. Имя можно задать только одной комнате.
+    """
+    await check_meeting_rooms_exist(ids, session)
+    if obj_in.name is not None:
+        if len(set(ids)) > 1:
+            raise HTTPException(
+                status_code=422,
+                detail='Нельзя присвоить одно имя нескольким переговоркам'
+            )
+        await check_name_duplicate(obj_in.name, session)
+    updated_rooms = await meeting_room_crud.update_many(
+        obj_in, session, MeetingRoom.id.in_(set(ids))
+    )
+    return updated_rooms
+
+
+@router.delete(
+    '/batch',
+    response_model=list[MeetingRoomDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def remove_meeting_rooms_batch(
+    ids: list[int] = Query(
+        min_length=1, max_length=MEETING_ROOM_BATCH_MAX_SIZE
+    ),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Только для суперюзеров.
+
+    Удаляет переговорные комнаты с идентификаторами ids вместе
+    с их бронированиями в одной транзакции.
+    """
+    await check_meeting_rooms_exist(ids, session)
+    meeting_rooms = await meeting_room_crud.remove_many(
+        session, MeetingRoom.id.in_(set(ids))
+    )
+    return meeting_rooms
+
+
 @router.get(
     '/',
     response_model=list[MeetingRoomDB],
     response_model_exclude_none=True,
 )
 async def get_all_meeting_rooms(
-    session: AsyncSession = Depends(get_async_session)
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
-    Получает список всех переговорных комнат.
+    Получает страницу списка переговорных комнат.
+
+    Если есть следующая страница, ее курсор передается
+    в заголовке X-Next-Cursor.
     """
-    all_rooms = await meeting_room_crud.get_multi(session)
-    return all_rooms
+    all_rooms, next_cursor = await meeting_room_crud.get_page(
+        session, pagination.limit, pagination.cursor, rows=True
+    )
+    return json_response(
+        dump_meeting_rooms(all_rooms), get_page_headers(next_cursor)
+    )
+
+
+@router.get(
+    '/available',
+    response_model=list[MeetingRoomDB],
+    response_model_exclude_none=True,
+)
+async def get_available_meeting_rooms(
+    from_reserve: dt.datetime = Query(alias='from'),
+    to_reserve: dt.datetime = Query(alias='to'),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Получает список переговорных комнат, свободных в указанный период.
+    """
+    check_period(from_reserve, to_reserve)
+    available_rooms = await meeting_room_crud.get_available(
+        from_reserve, to_reserve, session, rows=True
+    )
+    return json_response(dump_meeting_rooms(available_rooms))
+
+
+@router.get(
+    '/cache',
+    response_model=MeetingRoomCacheStats,
+    dependencies=[Depends(current_superuser)]
+)
+async def get_meeting_room_cache_stats():
+    """
+    Только для суперюзеров.
+
+    Получает размер кэша переговорных комнат и счетчики попаданий
+    и промахов.
+    """
+    return MeetingRoomCacheStats(
+        enabled=meeting_room_cache.enabled,
+        size=meeting_room_cache.size,
+        hits=meeting_room_cache.hits,
+        misses=meeting_room_cache.misses
+    )
 
 
 @router.patch(
@@ -101,13 +245,47 @@ async def remove_meeting_room(
 )
 async def get_reservations_for_room(
     meetingroom_id: int,
-    session: AsyncSession = Depends(get_async_session)
+    from_reserve: Optional[dt.datetime] = None,
+    to_reserve: Optional[dt.datetime] = None,
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Получает все бронирования для определенной переговорной комнаты.
+
+    Серии бронирований возвращаются отдельными повторениями в пределах
+    периода from_reserve - to_reserve, по умолчанию начиная с текущего
+    времени.
     """
     await check_meeting_room_exists(meetingroom_id, session)
     reservations = await reservation_crud.get_future_reservations_for_room(
-        meetingroom_id, session
+        meetingroom_id, session, from_reserve, to_reserve, rows=True
+    )
+    return json_response(
+        dump_reservations(reservations, exclude=frozenset({'user_id'}))
+    )
+
+
+@router.get(
+    '/{meetingroom_id}/timeline',
+    response_model=MeetingRoomTimeline,
+)
+async def get_timeline_for_room(
+    meetingroom_id: int,
+    date: dt.date,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Получает занятость переговорной комнаты за день по слотам.
+    """
+    await check_meeting_room_exists(meetingroom_id, session)
+    bitmap = await reservation_crud.get_timeline(meetingroom_id, date, session)
+    return MeetingRoomTimeline(
+        meetingroom_id=meetingroom_id,
+        date=date,
+        slot_minutes=SLOT_MINUTES,
+        bitmap=bitmap.hex(),
+        busy=[
+            {'from_reserve': from_reserve, 'to_reserve': to_reserve}
+            for from_reserve, to_reserve in get_busy_periods(bitmap, date)
+        ]
     )
-    return reservations
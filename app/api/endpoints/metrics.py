@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import CONTENT_TYPE, metrics
+
+router = APIRouter()
+
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics():
+    """
+    Получает метрики в текстовом формате Prometheus.
+    """
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,14 +1,32 @@
-from fastapi import APIRouter, Depends
+import datetime as dt
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_async_session
-from app.schemas.reservation import (ReservationDB, ReservationCreate,
-                                     ReservationUpdate)
-from app.api.validators import (check_reservation_intersections,
+from app.core.archive import reservation_archiver
+from app.core.db import (async_read_session, get_async_session,
+                         get_read_session)
+from app.core.export import ENCODERS, MEDIA_TYPES, ExportFormat
+from app.core.pagination import Pagination, get_page_headers
+from app.core.pipeline import write_pipeline
+from app.core.serialization import dump_reservations, json_response
+from app.schemas.reservation import (RESERVATION_BATCH_MAX_SIZE,
+                                     ReservationArchiveResult,
+                                     ReservationDB, ReservationCreate,
+                                     ReservationReassign, ReservationUpdate)
+from app.api.validators import (check_batch_criteria,
+                                check_batch_intersections, check_period,
+                                check_reservation_intersections,
                                 check_meeting_room_exists,
-                                check_reservation_before_edit)
+                                check_meeting_rooms_exist,
+                                check_reservation_before_edit,
+                                check_reservation_room_id,
+                                check_series_step, check_user_exists)
 from app.crud.reservation import reservation_crud
+from app.crud.reservation_archive import reservation_archive_crud
 from app.models import User
 from app.core.user import current_user, current_superuser
 
@@ -27,13 +45,109 @@ async def create_reservation(
 ):
     """
     Создает новое бронирование.
+
+    Проверка пересечений и запись выполняются под блокировкой комнаты
+    или в конвейере записи, поэтому одновременные запросы не могут
+    дважды занять одно время.
+    """
+    async def write(session: AsyncSession):
+        await check_meeting_room_exists(
+            reservation.meetingroom_id, session, for_update=True
+        )
+        await check_reservation_intersections(
+            **reservation.model_dump(), session=session
+        )
+        return await reservation_crud.create(reservation, session, user)
+
+    return await write_pipeline.run(
+        write, session, reservation.meetingroom_id
+    )
+
+
+@router.post(
+    '/batch',
+    response_model=list[ReservationDB],
+    response_model_exclude_none=True
+)
+async def create_reservations_batch(
+    reservations: list[ReservationCreate] = Body(
+        min_length=1, max_length=RESERVATION_BATCH_MAX_SIZE
+    ),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user)
+):
+    """
+    Создает набор бронирований в одной транзакции.
+
+    Если хотя бы одно бронирование пересекается с существующими
+    или с другими элементами набора, ни одно не создается, а в ответе
+    перечисляются конфликты для каждого элемента.
+    """
+    meeting_room_ids = [
+        reservation.meetingroom_id for reservation in reservations
+    ]
+
+    async def write(session: AsyncSession):
+        await check_meeting_rooms_exist(
+            meeting_room_ids, session, for_update=True
+        )
+        await check_batch_intersections(reservations, session)
+        return await reservation_crud.create_many(reservations, session, user)
+
+    return await write_pipeline.run(write, session, *meeting_room_ids)
+
+
+@router.patch(
+    '/batch',
+    response_model=list[ReservationDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def reassign_reservations_batch(
+    reassign: ReservationReassign,
+    ids: Optional[list[int]] = Query(None),
+    user_id: Optional[int] = None,
+    meetingroom_id: Optional[int] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
     """
-    await check_meeting_room_exists(reservation.meetingroom_id, session)
-    await check_reservation_intersections(
-        **reservation.model_dump(), session=session
+    Только для суперюзеров.
+
+    Переназначает другому пользователю все бронирования, подходящие
+    под фильтры ids, user_id и meetingroom_id, одним запросом.
+    """
+    criteria = reservation_crud.get_criteria(ids, user_id, meetingroom_id)
+    check_batch_criteria(criteria)
+    await check_user_exists(reassign.user_id, session)
+    reservations = await reservation_crud.update_many(
+        reassign, session, *criteria
     )
-    new_reservation = await reservation_crud.create(reservation, session, user)
-    return new_reservation
+    return reservations
+
+
+@router.delete(
+    '/batch',
+    response_model=list[ReservationDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def delete_reservations_batch(
+    ids: Optional[list[int]] = Query(None),
+    user_id: Optional[int] = None,
+    meetingroom_id: Optional[int] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Только для суперюзеров.
+
+    Удаляет все бронирования, подходящие под фильтры ids, user_id
+    и meetingroom_id, одним запросом. Например, user_id отменяет
+    все бронирования уходящего сотрудника.
+    """
+    criteria = reservation_crud.get_criteria(ids, user_id, meetingroom_id)
+    check_batch_criteria(criteria)
+    reservations = await reservation_crud.remove_many(session, *criteria)
+    return reservations
 
 
 @router.get(
@@ -43,15 +157,108 @@ async def create_reservation(
     dependencies=[Depends(current_superuser)]
 )
 async def get_all_reservations(
-    session: AsyncSession = Depends(get_async_session)
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Только для суперюзеров.
 
-    Получает список всех бронирований.
+    Получает страницу списка всех бронирований. Если есть следующая
+    страница, ее курсор передается в заголовке X-Next-Cursor.
     """
-    reservations = await reservation_crud.get_multi(session)
-    return reservations
+    reservations, next_cursor = await reservation_crud.get_page(
+        session, pagination.limit, pagination.cursor, rows=True
+    )
+    return json_response(
+        dump_reservations(reservations), get_page_headers(next_cursor)
+    )
+
+
+@router.get(
+    '/archive',
+    response_model=list[ReservationDB],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)]
+)
+async def get_archived_reservations(
+    meetingroom_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Только для суперюзеров.
+
+    Получает страницу архивных бронирований в порядке времени начала,
+    при необходимости только для комнаты meetingroom_id или пользователя
+    user_id. Если есть следующая страница, ее курсор передается
+    в заголовке X-Next-Cursor.
+    """
+    reservations, next_cursor = await reservation_archive_crud.get_page(
+        session, pagination.limit, pagination.cursor,
+        meetingroom_id=meetingroom_id, user_id=user_id
+    )
+    return json_response(
+        dump_reservations(reservations), get_page_headers(next_cursor)
+    )
+
+
+@router.post(
+    '/archive',
+    response_model=ReservationArchiveResult,
+    dependencies=[Depends(current_superuser)]
+)
+async def archive_reservations():
+    """
+    Только для суперюзеров.
+
+    Сразу переносит в архив бронирования, закончившиеся раньше,
+    чем RESERVATION_ARCHIVE_AFTER_DAYS дней назад.
+    """
+    archived = await reservation_archiver.run(reservation_crud.archive)
+    return ReservationArchiveResult(archived=archived)
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    dependencies=[Depends(current_superuser)]
+)
+async def export_reservations(
+    format: ExportFormat = ExportFormat.ndjson,
+    meetingroom_id: Optional[int] = None,
+    from_reserve: Optional[dt.datetime] = None,
+    to_reserve: Optional[dt.datetime] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Только для суперюзеров.
+
+    Выгружает бронирования в формате NDJSON или CSV. Строки передаются
+    клиенту по мере чтения из базы данных, поэтому потребление памяти
+    не зависит от объема выгрузки. Серии выгружаются одной строкой
+    с правилом повторения.
+    """
+    if from_reserve is not None and to_reserve is not None:
+        check_period(from_reserve, to_reserve)
+    if meetingroom_id is not None:
+        await check_meeting_room_exists(meetingroom_id, session)
+
+    async def read_chunks():
+        async with async_read_session() as export_session:
+            async for chunk in reservation_crud.stream_export(
+                export_session, meetingroom_id, from_reserve, to_reserve
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        ENCODERS[format](read_chunks()),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            'Content-Disposition':
+                f'attachment; filename="reservations.{format.value}"'
+        }
+    )
 
 
 @router.delete(
@@ -69,11 +276,15 @@ async def delete_reservation(
 
     Удаляет бронирование по его идентификатору.
     """
-    reservation = await check_reservation_before_edit(
-        reservation_id, session, user
-    )
-    reservation = await reservation_crud.remove(reservation, session)
-    return reservation
+    meetingroom_id = await check_reservation_room_id(reservation_id, session)
+
+    async def write(session: AsyncSession):
+        reservation = await check_reservation_before_edit(
+            reservation_id, session, user, for_update=True
+        )
+        return await reservation_crud.remove(reservation, session)
+
+    return await write_pipeline.run(write, session, meetingroom_id)
 
 
 @router.patch(
@@ -88,19 +299,31 @@ async def update_reservation(
     user: User = Depends(current_user)
 ):
     """Для суперюзеров или создателей объекта бронирования."""
-    reservation = await check_reservation_before_edit(
-        reservation_id, session, user
-    )
-    await check_reservation_intersections(
-        **reservation_in.model_dump(),
-        reservation_id=reservation_id,
-        meetingroom_id=reservation.meetingroom_id,
-        session=session
-    )
-    reservation = await reservation_crud.update(
-        reservation, reservation_in, session
-    )
-    return reservation
+    meetingroom_id = await check_reservation_room_id(reservation_id, session)
+
+    async def write(session: AsyncSession):
+        reservation = await check_reservation_before_edit(
+            reservation_id, session, user, for_update=True
+        )
+        check_series_step(
+            reservation_in.from_reserve, reservation_in.to_reserve,
+            reservation.repeat_step
+        )
+        await check_meeting_room_exists(
+            reservation.meetingroom_id, session, for_update=True
+        )
+        await check_reservation_intersections(
+            **reservation_in.model_dump(),
+            reservation_id=reservation_id,
+            meetingroom_id=reservation.meetingroom_id,
+            recurrence=reservation.recurrence,
+            session=session
+        )
+        return await reservation_crud.update(
+            reservation, reservation_in, session
+        )
+
+    return await write_pipeline.run(write, session, meetingroom_id)
 
 
 @router.get(
@@ -110,11 +333,44 @@ async def update_reservation(
     response_model_exclude={'user_id'}
 )
 async def get_my_reservations(
-    session: AsyncSession = Depends(get_async_session),
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(current_user)
 ):
     """
-    Получает список всех бронирований для текущего пользователя.
+    Получает страницу бронирований текущего пользователя в порядке
+    времени начала. Если есть следующая страница, ее курсор передается
+    в заголовке X-Next-Cursor.
     """
-    reservations = await reservation_crud.get_by_user(session, user)
-    return reservations
+    reservations, next_cursor = await reservation_crud.get_page_by_user(
+        session, user, pagination.limit, pagination.cursor, rows=True
+    )
+    return json_response(
+        dump_reservations(reservations, exclude=frozenset({'user_id'})),
+        get_page_headers(next_cursor)
+    )
+
+
+@router.get(
+    '/my_reservations/archive',
+    response_model=list[ReservationDB],
+    response_model_exclude_none=True,
+    response_model_exclude={'user_id'}
+)
+async def get_my_archived_reservations(
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_user)
+):
+    """
+    Получает страницу архивных бронирований текущего пользователя
+    в порядке времени начала. Если есть следующая страница, ее курсор
+    передается в заголовке X-Next-Cursor.
+    """
+    reservations, next_cursor = await reservation_archive_crud.get_page(
+        session, pagination.limit, pagination.cursor, user_id=user.id
+    )
+    return json_response(
+        dump_reservations(reservations, exclude=frozenset({'user_id'})),
+        get_page_headers(next_cursor)
+    )
@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.core.user import auth_backend, fastapi_users
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.core.hashing import password_hasher
+from app.core.user import auth_backend, current_superuser, fastapi_users
+from app.schemas.user import (PasswordHashingStats, UserCreate, UserRead,
+                              UserUpdate)
 
 router = APIRouter()
 
@@ -20,3 +22,27 @@ router.include_router(
     prefix='/users',
     tags=['users']
 )
+
+
+@router.get(
+    '/auth/password-hashing',
+    response_model=PasswordHashingStats,
+    tags=['auth'],
+    dependencies=[Depends(current_superuser)]
+)
+async def get_password_hashing_stats():
+    """
+    Только для суперюзеров.
+
+    Получает длину очереди и счетчики пула хеширования паролей.
+    """
+    return PasswordHashingStats(
+        executor=password_hasher.executor,
+        workers=password_hasher.workers,
+        queued=password_hasher.queued,
+        running=password_hasher.running,
+        completed=password_hasher.completed,
+        rejected=password_hasher.rejected,
+        max_queued=password_hasher.max_queued,
+        wait_seconds=password_hasher.wait_seconds
+    )
@@ -1,10 +1,19 @@
+import datetime as dt
+from collections import Counter, defaultdict
+from typing import Optional, Sequence
+
 from fastapi import HTTPException
 
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.recurrence import (check_series_duration, expand, get_series,
+                                 to_datetimes)
+from app.core.schedule import RoomSchedule
 from app.models import MeetingRoom, User
 from app.crud.meeting_room import meeting_room_crud
 from app.crud.reservation import reservation_crud
+from app.schemas.reservation import ReservationCreate
 
 
 async def check_name_duplicate(
@@ -29,9 +38,83 @@ async def check_name_duplicate(
         )
 
 
+async def check_names_duplicate(
+    room_names: Sequence[str],
+    session: AsyncSession
+) -> None:
+    """
+    Проверяет одним запросом, что имена новых переговорок не повторяются
+    ни в базе данных, ни в самом наборе.
+
+    Parameters:
+        room_names (Sequence[str]): Имена переговорных комнат.
+        session (AsyncSession): Сессия базы данных.
+
+    Raises:
+        HTTPException: Если хотя бы одно имя уже занято или повторяется.
+    """
+    duplicates = await meeting_room_crud.get_existing_names(
+        room_names, session
+    )
+    duplicates.update(
+        name for name, count in Counter(room_names).items() if count > 1
+    )
+    if duplicates:
+        raise HTTPException(
+            status_code=422,
+            detail=f'Переговорки с такими именами уже существуют '
+                   f'или повторяются: {sorted(duplicates)}'
+        )
+
+
+def check_period(from_reserve: dt.datetime, to_reserve: dt.datetime) -> None:
+    """
+    Проверяет, что начало периода раньше его окончания.
+
+    Parameters:
+        from_reserve (dt.datetime): Начало периода.
+        to_reserve (dt.datetime): Окончание периода.
+
+    Raises:
+        HTTPException: Если начало периода не раньше его окончания.
+    """
+    if from_reserve >= to_reserve:
+        raise HTTPException(
+            status_code=422,
+            detail='Начало периода должно быть раньше его окончания'
+        )
+
+
+def check_series_step(
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime,
+        step: Optional[dt.timedelta]
+) -> None:
+    """
+    Проверяет, что измененные повторения серии не пересекаются
+    друг с другом.
+
+    Parameters:
+        from_reserve (dt.datetime): Новое время начала повторения.
+        to_reserve (dt.datetime): Новое время окончания повторения.
+        step (Optional[dt.timedelta]): Шаг серии, None для одиночного
+            бронирования.
+
+    Raises:
+        HTTPException: Если длительность повторения не меньше шага серии.
+    """
+    if step is None:
+        return
+    try:
+        check_series_duration(from_reserve, to_reserve, step)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+
+
 async def check_meeting_room_exists(
     meeting_room_id: int,
-    session: AsyncSession
+    session: AsyncSession,
+    for_update: bool = False
 ) -> MeetingRoom:
     """
     Проверяет существование переговорной комнаты по её идентификатору.
@@ -39,6 +122,7 @@ async def check_meeting_room_exists(
     Parameters:
         meeting_room_id (int): Идентификатор переговорной комнаты.
         session (AsyncSession): Сессия базы данных.
+        for_update (bool): Заблокировать строку комнаты до конца транзакции.
 
     Returns:
         MeetingRoom: Найденная переговорная комната.
@@ -46,7 +130,9 @@ async def check_meeting_room_exists(
     Raises:
         HTTPException: Если переговорная комната не найдена.
     """
-    meeting_room = await meeting_room_crud.get(meeting_room_id, session)
+    meeting_room = await meeting_room_crud.get(
+        meeting_room_id, session, for_update
+    )
     if meeting_room is None:
         raise HTTPException(
             status_code=404,
@@ -55,6 +141,33 @@ async def check_meeting_room_exists(
     return meeting_room
 
 
+async def check_meeting_rooms_exist(
+    meeting_room_ids: Sequence[int],
+    session: AsyncSession,
+    for_update: bool = False
+) -> None:
+    """
+    Проверяет существование всех переговорных комнат одним запросом.
+
+    Parameters:
+        meeting_room_ids (Sequence[int]): Идентификаторы переговорных комнат.
+        session (AsyncSession): Сессия базы данных.
+        for_update (bool): Заблокировать строки комнат до конца транзакции.
+
+    Raises:
+        HTTPException: Если хотя бы одна переговорная комната не найдена.
+    """
+    existing_ids = await meeting_room_crud.get_existing_ids(
+        meeting_room_ids, session, for_update
+    )
+    missing_ids = sorted(set(meeting_room_ids) - existing_ids)
+    if missing_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f'Переговорки не найдены: {missing_ids}'
+        )
+
+
 async def check_reservation_intersections(**kwargs):
     """
     Проверяет пересечения бронирования с другими бронированиями.
@@ -75,10 +188,67 @@ async def check_reservation_intersections(**kwargs):
         )
 
 
+async def check_batch_intersections(
+    reservations: Sequence[ReservationCreate],
+    session: AsyncSession
+) -> None:
+    """
+    Проверяет пересечения набора бронирований с существующими бронированиями
+    и друг с другом.
+
+    Parameters:
+        reservations (Sequence[ReservationCreate]): Новые бронирования.
+        session (AsyncSession): Сессия базы данных.
+
+    Raises:
+        HTTPException: Если есть пересечения, с перечнем конфликтов
+            для каждого элемента набора.
+    """
+    intersections = (
+        await reservation_crud.get_reservations_at_the_same_time_for_batch(
+            reservations, session
+        )
+    )
+    conflicts = {
+        index: [str(reservation) for reservation in found]
+        for index, found in intersections.items()
+    }
+    message = 'Пересекается с элементом {} этого запроса'
+    schedules = defaultdict(RoomSchedule)
+    for index, reservation in enumerate(reservations):
+        schedule = schedules[reservation.meetingroom_id]
+        starts, ends = map(to_datetimes, expand(
+            reservation.from_reserve, reservation.to_reserve,
+            *get_series(
+                reservation.from_reserve,
+                reservation.recurrence and reservation.recurrence.model_dump()
+            )
+        ))
+        others = {
+            other
+            for start, end in zip(starts, ends)
+            for _, other, _, _ in schedule.overlapping(start, end)
+        }
+        for other in sorted(others):
+            conflicts.setdefault(index, []).append(message.format(other))
+            conflicts.setdefault(other, []).append(message.format(index))
+        for start, end in zip(starts, ends):
+            schedule.add(index, start, end, None)
+    if conflicts:
+        raise HTTPException(
+            status_code=422,
+            detail=[
+                {'index': index, 'conflicts': conflicts[index]}
+                for index in sorted(conflicts)
+            ]
+        )
+
+
 async def check_reservation_before_edit(
         reservation_id: int,
         session: AsyncSession,
-        user: User
+        user: User,
+        for_update: bool = False
 ):
     """
     Проверяет возможность редактирования или удаления бронирования.
@@ -87,6 +257,7 @@ async def check_reservation_before_edit(
         reservation_id (int): Идентификатор бронирования.
         session (AsyncSession): Сессия базы данных.
         user (User): Текущий пользователь.
+        for_update (bool): Заблокировать строку бронирования до конца транзакции.
 
     Returns:
         Reservation: Найденное бронирование.
@@ -94,7 +265,9 @@ async def check_reservation_before_edit(
     Raises:
         HTTPException: Если бронирование не найдено или пользователь не имеет прав на редактирование.
     """
-    reservation = await reservation_crud.get(reservation_id, session)
+    reservation = await reservation_crud.get(
+        reservation_id, session, for_update
+    )
     if reservation is None:
         raise HTTPException(
             status_code=404,
@@ -106,3 +279,76 @@ async def check_reservation_before_edit(
             detail='Невозможно редактировать или удалить чужую бронь!'
         )
     return reservation
+
+
+async def check_reservation_room_id(
+    reservation_id: int,
+    session: AsyncSession
+) -> int:
+    """
+    Получает идентификатор переговорки бронирования для блокировки записи.
+    Права на бронирование при этом не проверяются: это делает
+    check_reservation_before_edit внутри записи.
+
+    Parameters:
+        reservation_id (int): Идентификатор бронирования.
+        session (AsyncSession): Сессия базы данных.
+
+    Returns:
+        int: Идентификатор переговорки.
+
+    Raises:
+        HTTPException: Если бронирование не найдено.
+    """
+    meetingroom_id = await reservation_crud.get_room_id(
+        reservation_id, session
+    )
+    if meetingroom_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail='Бронь не найдена!'
+        )
+    return meetingroom_id
+
+
+async def check_user_exists(
+        user_id: int,
+        session: AsyncSession
+) -> User:
+    """
+    Проверяет существование пользователя по его идентификатору.
+
+    Parameters:
+        user_id (int): Идентификатор пользователя.
+        session (AsyncSession): Сессия базы данных.
+
+    Returns:
+        User: Найденный пользователь.
+
+    Raises:
+        HTTPException: Если пользователь не найден.
+    """
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=404,
+            detail='Пользователь не найден!'
+        )
+    return user
+
+
+def check_batch_criteria(criteria: Sequence[ColumnElement[bool]]) -> None:
+    """
+    Проверяет, что для пакетной операции задан хотя бы один фильтр.
+
+    Parameters:
+        criteria (Sequence[ColumnElement[bool]]): Условия отбора объектов.
+
+    Raises:
+        HTTPException: Если фильтры не заданы.
+    """
+    if not criteria:
+        raise HTTPException(
+            status_code=422,
+            detail='Нужно указать хотя бы один фильтр'
+        )
@@ -0,0 +1,118 @@
+import asyncio
+import contextlib
+import datetime as dt
+import logging
+from typing import Awaitable, Callable, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import async_session
+
+logger = logging.getLogger(__name__)
+
+ArchiveBatch = Callable[
+    [AsyncSession, dt.datetime, int, int], Awaitable[Sequence]
+]
+
+
+class ReservationArchiver:
+    """
+    Перенос давно закончившихся бронирований в архив.
+
+    Бронирования, последнее повторение которых закончилось раньше,
+    чем age назад, переносятся порциями по batch_size, и транзакция
+    фиксируется после каждой порции, чтобы перенос не задерживал
+    записи бронирований. Порции выбираются по возрастанию
+    идентификатора, поэтому один запуск проходит таблицу один раз.
+    Запуски не выполняются одновременно.
+
+    Attributes:
+        age (dt.timedelta): Время после окончания бронирования,
+            по истечении которого оно переносится в архив.
+        interval (float): Интервал между фоновыми запусками в секундах.
+        batch_size (int): Число бронирований в одной транзакции.
+        archived (int): Число перенесенных бронирований.
+        runs (int): Число завершенных запусков.
+        last_run_at (Optional[dt.datetime]): Время последнего запуска.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker,
+            age: dt.timedelta,
+            interval: float,
+            batch_size: int
+    ):
+        self.session_factory = session_factory
+        self.age = age
+        self.interval = interval
+        self.batch_size = batch_size
+        self.archived = 0
+        self.runs = 0
+        self.last_run_at: Optional[dt.datetime] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, archive: ArchiveBatch) -> None:
+        self._task = asyncio.create_task(self._run(archive))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run(self, archive: ArchiveBatch) -> int:
+        """
+        Переносит в архив все бронирования, закончившиеся раньше,
+        чем age назад.
+
+        Args:
+            archive (ArchiveBatch): Корутина переноса одной порции,
+                например CRUDReservation.archive.
+
+        Returns:
+            int: Число перенесенных бронирований.
+        """
+        async with self._lock:
+            self.last_run_at = dt.datetime.now()
+            before = self.last_run_at - self.age
+            archived = after_id = 0
+            while True:
+                async with self.session_factory() as session:
+                    reservations = await archive(
+                        session, before, after_id, self.batch_size
+                    )
+                archived += len(reservations)
+                self.archived += len(reservations)
+                if len(reservations) < self.batch_size:
+                    break
+                after_id = reservations[-1].id
+            self.runs += 1
+        return archived
+
+    async def _run(self, archive: ArchiveBatch) -> None:
+        while True:
+            try:
+                archived = await self.run(archive)
+            except Exception:
+                logger.exception('Reservation archiving failed')
+            else:
+                if archived:
+                    logger.info('Archived %d reservations', archived)
+            await asyncio.sleep(self.interval)
+
+
+reservation_archiver = ReservationArchiver(
+    async_session,
+    dt.timedelta(days=settings.reservation_archive_after_days),
+    settings.reservation_archive_interval,
+    settings.reservation_archive_batch_size
+)
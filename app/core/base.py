@@ -1,2 +1,2 @@
 from app.core.db import Base # noqa
-from app.models import MeetingRoom, Reservation, User # noqa
+from app.models import MeetingRoom, Reservation, ReservationArchive, User # noqa
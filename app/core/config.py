@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,17 +12,83 @@ class Settings(BaseSettings):
         app_title (str): Название приложения.
         app_description (str): Описание приложения.
         database_url (str): URL базы данных.
+        database_profile (Literal['dev', 'prod-sqlite', 'prod-server']): Профиль движка базы данных: журналирование запросов, пул соединений и PRAGMA для SQLite.
+        database_pool_size (Optional[int]): Размер пула соединений вместо заданного профилем.
+        database_max_overflow (Optional[int]): Число соединений сверх пула вместо заданного профилем.
+        database_read_url (Optional[str]): URL реплики для чтения, по умолчанию чтение выполняется из основной базы данных.
+        read_your_writes_seconds (float): Время после записи клиента, в течение которого его чтения выполняются из основной базы данных, 0 - без окна.
         secret (str): Секретный ключ приложения.
         first_superuser_email (Optional[EmailStr]): Email первого суперпользователя.
         first_superuser_password (Optional[str]): Пароль первого суперпользователя.
+        reservation_index_enabled (bool): Искать свободные комнаты и занятость комнат по внутрипроцессному индексу бронирований.
+        single_process (bool): Приложение запущено в одном процессе сервера, и индекс бронирований используется для проверок пересечений при записи.
+        timeline_cache_enabled (bool): Хранить битовые карты занятости комнат по дням в памяти процесса.
+        timeline_cache_size (int): Максимальное число хранимых битовых карт занятости.
+        timeline_cache_ttl (float): Время жизни битовой карты занятости в секундах.
+        meeting_room_cache_enabled (bool): Хранить переговорные комнаты в памяти процесса.
+        meeting_room_cache_ttl (float): Время жизни кэша переговорных комнат в секундах.
+        user_cache_enabled (bool): Хранить проверенные JWT-токены и записи пользователей в памяти процесса.
+        user_cache_size (int): Максимальное число хранимых токенов и пользователей.
+        user_cache_ttl (float): Максимальное время хранения токена и пользователя в секундах.
+        password_hash_executor (Literal['thread', 'process']): Пул для хеширования паролей: потоки или процессы.
+        password_hash_workers (Optional[int]): Размер пула и число одновременных операций хеширования, по умолчанию число процессоров.
+        password_hash_max_queue (int): Максимальная длина очереди на хеширование, 0 - без ограничения.
+        write_pipeline_enabled (bool): Выполнять записи бронирований через конвейер с групповой фиксацией транзакций.
+        write_pipeline_max_delay_ms (float): Максимальное время накопления группы записей в миллисекундах.
+        write_pipeline_max_batch (int): Максимальное число записей в одной транзакции конвейера.
+        metrics_enabled (bool): Собирать метрики запросов и базы данных и отдавать их по /metrics.
+        query_budget_enabled (bool): Считать запросы к базе данных в каждом HTTP-запросе и журналировать превышения бюджета и повторяющиеся запросы.
+        query_budget_default (int): Бюджет запросов к базе данных для маршрутов, не указанных в query_budget_routes.
+        query_budget_routes (dict[str, int]): Бюджеты запросов по маршрутам вида "POST /reservations/".
+        query_budget_repeat_threshold (int): Число одинаковых запросов в одном HTTP-запросе, начиная с которого они считаются признаком N+1.
+        profiling_enabled (bool): Разрешить суперпользователям профилировать отдельные запросы.
+        profile_dir (str): Каталог для сохранения профилей запросов.
+        profile_interval_ms (float): Интервал между сэмплами профилировщика в миллисекундах.
+        reservation_archive_enabled (bool): Периодически переносить давно закончившиеся бронирования в архив.
+        reservation_archive_after_days (float): Через сколько дней после окончания последнего повторения бронирование переносится в архив.
+        reservation_archive_interval (float): Интервал между запусками переноса в архив в секундах.
+        reservation_archive_batch_size (int): Число бронирований, переносимых в одной транзакции.
         model_config (SettingsConfigDict): Конфигурация модели.
     """
     app_title: str = 'Title'
     app_description: str = 'Description'
     database_url: str = 'sqlite:///sqlite.db'
+    database_profile: Literal['dev', 'prod-sqlite', 'prod-server'] = 'dev'
+    database_pool_size: Optional[int] = None
+    database_max_overflow: Optional[int] = None
+    database_read_url: Optional[str] = None
+    read_your_writes_seconds: float = 0
     secret: str = 'SECRET'
     first_superuser_email: Optional[EmailStr] = None
     first_superuser_password: Optional[str] = None
+    reservation_index_enabled: bool = False
+    single_process: bool = False
+    timeline_cache_enabled: bool = False
+    timeline_cache_size: int = 100_000
+    timeline_cache_ttl: float = 60
+    meeting_room_cache_enabled: bool = False
+    meeting_room_cache_ttl: float = 60
+    user_cache_enabled: bool = False
+    user_cache_size: int = 10_000
+    user_cache_ttl: float = 60
+    password_hash_executor: Literal['thread', 'process'] = 'thread'
+    password_hash_workers: Optional[int] = None
+    password_hash_max_queue: int = 0
+    write_pipeline_enabled: bool = False
+    write_pipeline_max_delay_ms: float = 2
+    write_pipeline_max_batch: int = 100
+    metrics_enabled: bool = False
+    query_budget_enabled: bool = False
+    query_budget_default: int = 10
+    query_budget_routes: dict[str, int] = {}
+    query_budget_repeat_threshold: int = 3
+    profiling_enabled: bool = False
+    profile_dir: str = 'profiles'
+    profile_interval_ms: float = 1
+    reservation_archive_enabled: bool = False
+    reservation_archive_after_days: float = 90
+    reservation_archive_interval: float = 3600
+    reservation_archive_batch_size: int = 1000
     model_config = SettingsConfigDict(env_file='.env',
                                       env_file_encoding='utf-8')
 
@@ -1,8 +1,17 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from typing import Optional, Union
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (AsyncEngine, create_async_engine,
+                                    async_sessionmaker)
 from sqlalchemy.orm import (DeclarativeBase, declared_attr, Mapped,
                             mapped_column)
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.query_budget import instrument_engine
+from app.core.read_your_writes import recent_writers
 
 
 class Base(DeclarativeBase):
@@ -21,9 +30,131 @@ class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True)
 
 
-engine = create_async_engine(settings.database_url, echo=True)
+ENGINE_PROFILES: dict[str, dict] = {
+    'dev': {
+        'echo': True,
+    },
+    'prod-sqlite': {
+        'echo': False,
+        'pool_size': 8,
+        'max_overflow': 8,
+        'pool_timeout': 30,
+        'query_cache_size': 1200,
+    },
+    'prod-server': {
+        'echo': False,
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+        'query_cache_size': 1200,
+    },
+}
+
+SQLITE_PRAGMAS: dict[str, dict[str, Union[str, int]]] = {
+    'dev': {},
+    'prod-sqlite': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'prod-server': {},
+}
+
+SQLITE_READ_ONLY_PRAGMAS: dict[str, Union[str, int]] = {
+    'query_only': 'ON',
+}
+
+SQLITE_CACHED_STATEMENTS = 512
+
+POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def create_engine(
+        database_url: str,
+        profile: str = 'dev',
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        read_only: bool = False
+) -> AsyncEngine:
+    """
+    Создает асинхронный движок базы данных по профилю настроек.
+
+    Профиль задает параметры пула соединений и кэша скомпилированных
+    запросов, а для SQLite еще и PRAGMA, которые выполняются
+    при открытии каждого соединения.
+
+    Args:
+        database_url (str): URL базы данных.
+        profile (str, optional): Профиль: dev, prod-sqlite или prod-server.
+        pool_size (Optional[int], optional): Размер пула вместо заданного профилем.
+        max_overflow (Optional[int], optional): Число соединений сверх пула вместо заданного профилем.
+        read_only (bool, optional): Запретить запись через соединения движка (PRAGMA query_only для SQLite).
+
+    Returns:
+        AsyncEngine: Асинхронный движок SQLAlchemy.
+    """
+    options = dict(ENGINE_PROFILES[profile])
+    if pool_size is not None:
+        options['pool_size'] = pool_size
+    if max_overflow is not None:
+        options['max_overflow'] = max_overflow
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    if is_sqlite:
+        options['connect_args'] = {
+            'cached_statements': SQLITE_CACHED_STATEMENTS
+        }
+        if url.database in (None, '', ':memory:'):
+            for option in POOL_OPTIONS:
+                options.pop(option, None)
+    new_engine = create_async_engine(url, **options)
+    pragmas = dict(SQLITE_PRAGMAS[profile])
+    if read_only:
+        pragmas.update(SQLITE_READ_ONLY_PRAGMAS)
+    if is_sqlite and pragmas:
+        @event.listens_for(new_engine.sync_engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+            cursor.close()
+    return new_engine
+
+
+engine = create_engine(
+    settings.database_url,
+    settings.database_profile,
+    settings.database_pool_size,
+    settings.database_max_overflow
+)
 
-async_session = async_sessionmaker(engine)
+read_engine = engine
+if settings.database_read_url is not None:
+    read_engine = create_engine(
+        settings.database_read_url,
+        settings.database_profile,
+        settings.database_pool_size,
+        settings.database_max_overflow,
+        read_only=True
+    )
+
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+
+if metrics.enabled:
+    metrics.instrument_engine(engine, 'primary')
+    if read_engine is not engine:
+        metrics.instrument_engine(read_engine, 'read')
+
+async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+async_read_session = async_sessionmaker(read_engine, expire_on_commit=False)
 
 
 async def get_async_session():
@@ -35,3 +166,23 @@ async def get_async_session():
     """
     async with async_session() as session:
         yield session
+
+
+async def get_read_session(request: Request):
+    """
+    Создает асинхронную сессию для чтения.
+
+    Сессия открывается на реплике для чтения, а в течение окна
+    read-your-writes после записи клиента - на основной базе данных.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        AsyncSession: Асинхронная сессия SQLAlchemy.
+    """
+    session_factory = async_read_session
+    if recent_writers.is_recent(request.headers.get('Authorization')):
+        session_factory = async_session
+    async with session_factory() as session:
+        yield session
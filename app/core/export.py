@@ -0,0 +1,87 @@
+import csv
+import datetime as dt
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = (
+    'id',
+    'meetingroom_id',
+    'user_id',
+    'from_reserve',
+    'to_reserve',
+    'repeat_frequency',
+    'repeat_interval',
+    'repeat_count',
+)
+
+
+class ExportFormat(str, Enum):
+    """
+    Формат выгрузки.
+    """
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: 'application/x-ndjson',
+    ExportFormat.csv: 'text/csv',
+}
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, dt.datetime) else value
+
+
+async def to_ndjson(
+        chunks: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[str]:
+    """
+    Преобразует порции строк в NDJSON: по одному объекту на строку.
+
+    Args:
+        chunks (AsyncIterator[Sequence[Sequence]]): Порции строк со значениями столбцов EXPORT_COLUMNS.
+
+    Yields:
+        str: Фрагмент выгрузки для одной порции строк.
+    """
+    async for chunk in chunks:
+        yield ''.join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(_encode, row))),
+                       ensure_ascii=False) + '\n'
+            for row in chunk
+        )
+
+
+async def to_csv(
+        chunks: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[str]:
+    """
+    Преобразует порции строк в CSV с заголовком.
+
+    Args:
+        chunks (AsyncIterator[Sequence[Sequence]]): Порции строк со значениями столбцов EXPORT_COLUMNS.
+
+    Yields:
+        str: Фрагмент выгрузки для одной порции строк.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_encode(value) for value in row] for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    ExportFormat.ndjson: to_ndjson,
+    ExportFormat.csv: to_csv,
+}
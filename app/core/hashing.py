@@ -0,0 +1,139 @@
+import asyncio
+import concurrent.futures
+import os
+from typing import Callable, Optional, TypeVar
+
+from fastapi_users.password import PasswordHelper
+
+from app.core.config import settings
+
+ResultType = TypeVar('ResultType')
+
+_password_helper: Optional[PasswordHelper] = None
+
+
+def _get_password_helper() -> PasswordHelper:
+    global _password_helper
+    if _password_helper is None:
+        _password_helper = PasswordHelper()
+    return _password_helper
+
+
+def hash_password(password: str) -> str:
+    return _get_password_helper().hash(password)
+
+
+def verify_and_update_password(
+        plain_password: str,
+        hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    return _get_password_helper().verify_and_update(
+        plain_password, hashed_password
+    )
+
+
+class PasswordHashQueueFull(Exception):
+    """
+    Очередь на хеширование паролей переполнена.
+    """
+
+
+class PasswordHasher:
+    """
+    Хеширование и проверка паролей в пуле потоков или процессов.
+
+    Хеширование занимает до сотен миллисекунд процессорного времени,
+    поэтому выполняется вне цикла событий, чтобы всплеск входов
+    не задерживал остальные запросы. Число одновременных операций
+    ограничено размером пула, остальные ожидают в очереди.
+
+    Attributes:
+        executor (str): Тип пула: thread или process.
+        workers (int): Размер пула и число одновременных операций,
+            по умолчанию число процессоров: больший пул отнимает
+            процессорное время у цикла событий.
+        max_queue (int): Максимальная длина очереди, 0 - без ограничения.
+        queued (int): Число операций, ожидающих в очереди.
+        running (int): Число выполняемых операций.
+        completed (int): Число завершенных операций.
+        rejected (int): Число операций, отклоненных из-за переполнения очереди.
+        max_queued (int): Максимальная наблюдавшаяся длина очереди.
+        wait_seconds (float): Суммарное время ожидания в очереди.
+    """
+
+    def __init__(
+            self,
+            executor: str = 'thread',
+            workers: Optional[int] = None,
+            max_queue: int = 0
+    ):
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queued = 0
+        self.wait_seconds = 0.0
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify_and_update(
+            self,
+            plain_password: str,
+            hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        return await self._run(
+            verify_and_update_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._semaphore = None
+
+    async def _run(
+            self,
+            function: Callable[..., ResultType],
+            *args
+    ) -> ResultType:
+        if self.max_queue and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashQueueFull()
+        if self._pool is None:
+            self._pool = (
+                concurrent.futures.ProcessPoolExecutor(self.workers)
+                if self.executor == 'process'
+                else concurrent.futures.ThreadPoolExecutor(
+                    self.workers, thread_name_prefix='password-hash'
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds += loop.time() - queued_at
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._pool, function, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_executor,
+    settings.password_hash_workers,
+    settings.password_hash_max_queue
+)
@@ -6,6 +6,7 @@ from pydantic import EmailStr
 
 from app.core.config import settings
 from app.core.db import get_async_session
+from app.core.schedule import reservation_index
 from app.core.user import get_user_db, get_user_manager
 from app.schemas.user import UserCreate
 
@@ -54,3 +55,12 @@ async def create_first_superuser():
             password=settings.first_superuser_password,
             is_superuser=True
         )
+
+
+async def load_reservation_index():
+    """
+    Загружает индекс бронирований, если он включен в настройках.
+    """
+    if settings.reservation_index_enabled:
+        async with get_async_session_context() as session:
+            await reservation_index.load(session)
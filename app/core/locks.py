@@ -0,0 +1,59 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator, Hashable
+
+
+class KeyedLock:
+    """
+    Набор asyncio-блокировок по ключам.
+
+    Блокировка для ключа создается при первом обращении и удаляется,
+    когда ее больше никто не ожидает, поэтому число хранимых блокировок
+    не превышает числа одновременно обрабатываемых ключей.
+    """
+
+    def __init__(self):
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    @contextlib.asynccontextmanager
+    async def __call__(self, *keys: Hashable) -> AsyncIterator[None]:
+        """
+        Захватывает блокировки всех ключей.
+
+        Ключи захватываются в отсортированном порядке, чтобы одновременные
+        захваты пересекающихся наборов ключей не приводили к взаимной
+        блокировке.
+
+        Args:
+            *keys (Hashable): Ключи, например идентификаторы комнат.
+        """
+        acquired = []
+        try:
+            for key in sorted(set(keys)):
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                self._waiters[key] = self._waiters.get(key, 0) + 1
+                try:
+                    await lock.acquire()
+                except BaseException:
+                    self._forget(key)
+                    raise
+                acquired.append(key)
+            yield
+        finally:
+            for key in reversed(acquired):
+                self._locks[key].release()
+                self._forget(key)
+
+    def locked(self, key: Hashable) -> bool:
+        lock = self._locks.get(key)
+        return lock is not None and lock.locked()
+
+    def _forget(self, key: Hashable) -> None:
+        self._waiters[key] -= 1
+        if not self._waiters[key]:
+            del self._waiters[key]
+            del self._locks[key]
+
+
+room_locks = KeyedLock()
@@ -0,0 +1,318 @@
+import bisect
+import re
+import time
+from collections import defaultdict
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+HTTP_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+DB_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+FINGERPRINT_MAX_LENGTH = 200
+FINGERPRINTS_MAX = 500
+OTHER_FINGERPRINT = 'other'
+
+_SPACES = re.compile(r'\s+')
+_PLACEHOLDER_LISTS = re.compile(
+    r'\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))+\s*\)'
+)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class Histogram:
+    """
+    Гистограмма значений с набором меток в формате Prometheus.
+
+    Attributes:
+        name (str): Имя метрики.
+        description (str): Описание метрики.
+        label_names (tuple[str, ...]): Имена меток.
+        buckets (tuple[float, ...]): Верхние границы корзин по возрастанию.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            label_names: tuple[str, ...],
+            buckets: tuple[float, ...]
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [
+                [0] * (len(self.buckets) + 1), 0.0
+            ]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.description}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, (counts, total) in sorted(self._series.items()):
+            label_text = format_labels(self.label_names, labels)
+            separator = ',' if label_text else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield (f'{self.name}_bucket{{{label_text}{separator}'
+                       f'le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            yield (f'{self.name}_bucket{{{label_text}{separator}'
+                   f'le="+Inf"}} {cumulative}')
+            yield f'{self.name}_sum{{{label_text}}} {total}'
+            yield f'{self.name}_count{{{label_text}}} {cumulative}'
+
+
+def format_labels(names: tuple[str, ...], values: tuple) -> str:
+    return ','.join(
+        f'{name}="{escape(str(value))}"' for name, value in zip(names, values)
+    )
+
+
+def escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Получает отпечаток SQL-запроса: без литералов, с одним
+    заполнителем вместо списков IN и не длиннее FINGERPRINT_MAX_LENGTH.
+    """
+    statement = _SPACES.sub(' ', statement).strip()
+    statement = _LITERALS.sub('?', statement)
+    statement = _PLACEHOLDER_LISTS.sub('(?)', statement)
+    return statement[:FINGERPRINT_MAX_LENGTH]
+
+
+class Metrics:
+    """
+    Метрики HTTP-запросов, запросов к базе данных и пулов соединений
+    в текстовом формате Prometheus.
+
+    Запись метрики на горячем пути - это поиск в словаре и увеличение
+    счетчика. Отпечаток вычисляется один раз для каждого текста запроса,
+    а число различных отпечатков ограничено FINGERPRINTS_MAX, остальные
+    запросы учитываются как other.
+
+    Attributes:
+        enabled (bool): Собирать ли метрики.
+        http_requests (Histogram): Длительность HTTP-запросов
+            по методу, шаблону маршрута и коду статуса.
+        db_queries (Histogram): Длительность запросов к базе данных
+            по движку и отпечатку запроса.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.http_requests = Histogram(
+            'http_request_duration_seconds',
+            'Длительность HTTP-запросов.',
+            ('method', 'route', 'status'),
+            HTTP_BUCKETS
+        )
+        self.db_queries = Histogram(
+            'db_query_duration_seconds',
+            'Длительность запросов к базе данных.',
+            ('engine', 'statement'),
+            DB_BUCKETS
+        )
+        self._fingerprints: dict[str, str] = {}
+        self._distinct_fingerprints: set[str] = set()
+        self._engines: dict[str, AsyncEngine] = {}
+        self._checked_out: dict[str, int] = defaultdict(int)
+        self._checkouts: dict[str, int] = defaultdict(int)
+        self._collectors: list[Callable[[], Iterable[tuple]]] = []
+
+    def observe_request(
+            self,
+            method: str,
+            route: str,
+            status: int,
+            seconds: float
+    ) -> None:
+        self.http_requests.observe((method, route, status), seconds)
+
+    def observe_query(
+            self,
+            engine_name: str,
+            statement: str,
+            seconds: float
+    ) -> None:
+        statement_fingerprint = self._fingerprints.get(statement)
+        if statement_fingerprint is None:
+            statement_fingerprint = fingerprint(statement)
+            if statement_fingerprint not in self._distinct_fingerprints:
+                if len(self._distinct_fingerprints) >= FINGERPRINTS_MAX:
+                    statement_fingerprint = OTHER_FINGERPRINT
+                else:
+                    self._distinct_fingerprints.add(statement_fingerprint)
+            if len(self._fingerprints) < FINGERPRINTS_MAX * 10:
+                self._fingerprints[statement] = statement_fingerprint
+        self.db_queries.observe((engine_name, statement_fingerprint), seconds)
+
+    def instrument_engine(self, engine: AsyncEngine, name: str) -> None:
+        """
+        Подписывается на события выполнения запросов и пула
+        соединений движка.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+            name (str): Имя движка в метке engine.
+        """
+        if name in self._engines:
+            return
+        self._engines[name] = engine
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters,
+                                  context, executemany):
+            context._metrics_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters,
+                                 context, executemany):
+            started = getattr(context, '_metrics_started', None)
+            if started is not None:
+                self.observe_query(
+                    name, statement, time.perf_counter() - started
+                )
+
+        @event.listens_for(sync_engine.pool, 'checkout')
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self._checked_out[name] += 1
+            self._checkouts[name] += 1
+
+        @event.listens_for(sync_engine.pool, 'checkin')
+        def checkin(dbapi_connection, connection_record):
+            self._checked_out[name] -= 1
+
+    def add_collector(self, collect: Callable[[], Iterable[tuple]]) -> None:
+        """
+        Добавляет функцию, которая при каждом запросе метрик возвращает
+        показатели других модулей в виде кортежей
+        (имя, тип counter или gauge, описание, значение).
+        """
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = [*self.http_requests.render(), *self.db_queries.render()]
+        lines += [
+            '# HELP db_pool_checked_out Число выданных соединений пула.',
+            '# TYPE db_pool_checked_out gauge',
+        ]
+        lines += [
+            f'db_pool_checked_out{{engine="{name}"}} '
+            f'{self._checked_out[name]}'
+            for name in self._engines
+        ]
+        lines += [
+            '# HELP db_pool_checkouts_total Число выдач соединений пула.',
+            '# TYPE db_pool_checkouts_total counter',
+        ]
+        lines += [
+            f'db_pool_checkouts_total{{engine="{name}"}} '
+            f'{self._checkouts[name]}'
+            for name in self._engines
+        ]
+        pools = {
+            name: engine.sync_engine.pool
+            for name, engine in self._engines.items()
+        }
+        for gauge, description in (
+                ('size', 'Размер пула соединений.'),
+                ('overflow', 'Число соединений сверх размера пула.')
+        ):
+            values = [
+                (name, getattr(pool, gauge)())
+                for name, pool in pools.items() if hasattr(pool, gauge)
+            ]
+            if values:
+                lines += [
+                    f'# HELP db_pool_{gauge} {description}',
+                    f'# TYPE db_pool_{gauge} gauge',
+                ]
+                lines += [
+                    f'db_pool_{gauge}{{engine="{name}"}} {value}'
+                    for name, value in values
+                ]
+        for collect in self._collectors:
+            for name, metric_type, description, value in collect():
+                lines += [
+                    f'# HELP {name} {description}',
+                    f'# TYPE {name} {metric_type}',
+                    f'{name} {value}',
+                ]
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware, измеряющее длительность HTTP-запросов.
+
+    Маршрут учитывается по шаблону пути (/reservations/{reservation_id}),
+    чтобы число рядов не зависело от идентификаторов в запросах.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.observe_request(
+                scope['method'],
+                route_template(scope),
+                status,
+                time.perf_counter() - started
+            )
+
+
+def route_template(scope: dict) -> str:
+    """
+    Получает шаблон пути маршрута запроса, например
+    /reservations/{reservation_id}. Запросы, не подошедшие
+    ни к одному маршруту, учитываются как <unmatched>.
+    """
+    route = scope.get('route')
+    if route is None:
+        return '<unmatched>'
+    return route.path
+
+
+metrics = Metrics(settings.metrics_enabled)
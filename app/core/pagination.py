@@ -0,0 +1,116 @@
+import base64
+import datetime as dt
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import Query
+from sqlalchemy.orm import InstrumentedAttribute
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE_MAX = 1000
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+class InvalidCursorError(ValueError):
+    """
+    Курсор страницы поврежден или получен от другого списка.
+    """
+
+
+class Pagination:
+    """
+    Параметры запроса страницы списка.
+
+    Attributes:
+        limit (int): Максимальное число элементов на странице.
+        cursor (Optional[str]): Курсор из заголовка X-Next-Cursor
+            предыдущей страницы, None для первой страницы.
+    """
+
+    def __init__(
+            self,
+            limit: int = Query(
+                PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX,
+                description='Максимальное число элементов на странице.'
+            ),
+            cursor: Optional[str] = Query(
+                None,
+                description='Курсор из заголовка X-Next-Cursor '
+                            'предыдущей страницы.'
+            )
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Кодирует значения ключа сортировки последнего элемента страницы.
+
+    Args:
+        values (Sequence[Any]): Значения столбцов ключа сортировки.
+
+    Returns:
+        str: Непрозрачный курсор.
+    """
+    data = json.dumps([
+        value.isoformat() if isinstance(value, dt.datetime) else value
+        for value in values
+    ], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def get_page_headers(next_cursor: Optional[str]) -> dict[str, str]:
+    """
+    Получает заголовки ответа со страницей: курсор следующей страницы,
+    если она есть.
+    """
+    return {} if next_cursor is None else {NEXT_CURSOR_HEADER: next_cursor}
+
+
+def _decode_value(python_type: type, value: Any) -> Any:
+    """
+    Приводит значение из курсора к типу столбца. Целые значения должны
+    быть целыми числами JSON в пределах 64-битного BIGINT, чтобы их можно
+    было передать в запрос.
+    """
+    if python_type is dt.datetime:
+        return dt.datetime.fromisoformat(value)
+    if python_type is int:
+        if type(value) is not int or not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError(value)
+        return value
+    return python_type(value)
+
+
+def decode_cursor(
+        cursor: str,
+        columns: Sequence[InstrumentedAttribute]
+) -> list[Any]:
+    """
+    Декодирует курсор в значения ключа сортировки.
+
+    Args:
+        cursor (str): Курсор.
+        columns (Sequence[InstrumentedAttribute]): Столбцы ключа сортировки.
+
+    Returns:
+        list[Any]: Значения столбцов в типах Python.
+
+    Raises:
+        InvalidCursorError: Если курсор не соответствует ключу сортировки.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        ))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            _decode_value(column.type.python_type, value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, OverflowError) as error:
+        raise InvalidCursorError('Некорректный курсор!') from error
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.locks import room_locks
+
+AFTER_COMMIT = 'after_commit'
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar('ResultType')
+Write = Callable[[AsyncSession], Awaitable[ResultType]]
+
+
+async def commit_or_defer(session: AsyncSession) -> None:
+    """
+    Фиксирует транзакцию сессии.
+
+    В сессии конвейера записи изменения только отправляются в базу данных,
+    а транзакцию для всей группы записей фиксирует конвейер.
+    """
+    if AFTER_COMMIT in session.info:
+        await session.flush()
+    else:
+        await session.commit()
+
+
+def call_after_commit(session: AsyncSession, callback: Callable[[], None]):
+    """
+    Вызывает callback после фиксации транзакции сессии.
+
+    В обычной сессии транзакция к этому моменту уже зафиксирована,
+    и callback вызывается сразу.
+    """
+    if AFTER_COMMIT in session.info:
+        session.info[AFTER_COMMIT].append(callback)
+    else:
+        callback()
+
+
+class WritePipeline:
+    """
+    Конвейер записи с групповой фиксацией транзакций.
+
+    Записи из разных запросов ставятся в очередь, выполняются по очереди
+    одним обработчиком в общей сессии и фиксируются одним коммитом
+    раз в max_delay секунд или по накоплении max_batch записей.
+    Каждый запрос получает свой результат или свою ошибку.
+
+    Записи должны выполнять все проверки до изменения данных: HTTPException
+    считается отказом без изменений и не влияет на остальные записи группы.
+    При любой другой ошибке транзакция группы откатывается, запись
+    с ошибкой получает исключение, а остальные выполняются заново.
+    Callback-функции, отложенные через call_after_commit, вызываются
+    только после успешной фиксации группы.
+
+    Attributes:
+        max_delay (float): Максимальное время накопления группы в секундах.
+        max_batch (int): Максимальное число записей в группе.
+        on_rollback (Optional[Callable[[], Awaitable[None]]]): Вызывается
+            после отката группы, например для перезагрузки
+            внутрипроцессных индексов, обновленных до фиксации.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker,
+            max_delay: float,
+            max_batch: int
+    ):
+        self.session_factory = session_factory
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.on_rollback: Optional[Callable[[], Awaitable[None]]] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(
+            self,
+            on_rollback: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        self.on_rollback = on_rollback
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._queue = self._task = None
+
+    async def run(
+            self,
+            write: Write,
+            session: AsyncSession,
+            *room_ids: Hashable
+    ) -> ResultType:
+        """
+        Выполняет запись через конвейер, если он запущен, иначе сразу
+        в сессии запроса под блокировкой комнат.
+
+        Перед постановкой в очередь или ожиданием блокировки транзакция
+        сессии запроса завершается, чтобы ожидающие запросы не удерживали
+        соединения с базой данных.
+
+        Args:
+            write (Write): Корутина записи, принимающая сессию.
+            session (AsyncSession): Сессия запроса.
+            *room_ids (Hashable): Идентификаторы затрагиваемых комнат.
+
+        Returns:
+            ResultType: Результат записи.
+        """
+        await session.commit()
+        if self.running:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait((write, future))
+            return await future
+        async with room_locks(*room_ids):
+            return await write(session)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._execute(batch)
+
+    async def _execute(self, batch: list) -> None:
+        pending = [item for item in batch if not item[1].done()]
+        while pending:
+            results = []
+            failed = None
+            async with self.session_factory() as session:
+                session.info[AFTER_COMMIT] = []
+                for write, future in pending:
+                    try:
+                        results.append((future, await write(session), None))
+                    except HTTPException as error:
+                        results.append((future, None, error))
+                    except Exception as error:
+                        failed = (write, future, error)
+                        break
+                if failed is not None:
+                    await session.rollback()
+                    await self._rolled_back()
+                    failed[1].set_exception(failed[2])
+                    pending = [item for item in pending
+                               if item[1] is not failed[1]]
+                    continue
+                try:
+                    await session.commit()
+                except Exception as error:
+                    logger.exception('Group commit failed')
+                    await self._rolled_back()
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_exception(error)
+                    return
+                for callback in session.info[AFTER_COMMIT]:
+                    callback()
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            pending = []
+
+    async def _rolled_back(self) -> None:
+        if self.on_rollback is not None:
+            await self.on_rollback()
+
+
+write_pipeline = WritePipeline(
+    async_session,
+    settings.write_pipeline_max_delay_ms / 1000,
+    settings.write_pipeline_max_batch
+)
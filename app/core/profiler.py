@@ -0,0 +1,210 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.user import get_superuser_by_token
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY = 'profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+PROFILE_SUFFIX = '.collapsed'
+
+
+def describe_frame(frame) -> str:
+    """
+    Получает подпись функции кадра для свернутого стека: имя функции,
+    модуль и первую строку функции, чтобы все строки одной функции
+    попадали в один узел флеймграфа.
+    """
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', code.co_filename)
+    return f'{code.co_name} ({module}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профилировщик одного потока.
+
+    Отдельный поток раз в interval секунд снимает стек профилируемого
+    потока через sys._current_frames и считает одинаковые стеки.
+    Профилируемый код не изменяется и не замедляется трассировкой,
+    накладные расходы - только снятие стека на каждом сэмпле.
+
+    Attributes:
+        thread_id (int): Идентификатор профилируемого потока.
+        interval (float): Интервал между сэмплами в секундах.
+        stacks (Counter[str]): Число сэмплов каждого стека в свернутом
+            формате: подписи кадров от корня через точку с запятой.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name='sampling-profiler', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """
+        Получает профиль в формате свернутых стеков, который открывают
+        speedscope и flamegraph.pl.
+        """
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self.stacks.most_common()
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                frames.append(describe_frame(frame))
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+
+class RequestProfiler:
+    """
+    Профилирование отдельных запросов по запросу суперпользователя.
+
+    Запрос профилируется, если в нем передан заголовок X-Profile: 1
+    или параметр ?profile=1 и токен принадлежит активному
+    суперпользователю. Профиль сохраняется в directory, а его
+    идентификатор возвращается в заголовке X-Profile-Id.
+
+    Сэмплируется поток цикла событий, поэтому в профиль попадают
+    и другие запросы, выполнявшиеся одновременно, а ожидание базы
+    данных и сети выглядит как ожидание в селекторе цикла событий.
+    Синхронная часть SQLAlchemy выполняется в greenlet, поэтому
+    ее стеки начинаются с вызова сессии, а не с эндпоинта.
+    Одновременно профилируется только один запрос.
+
+    Attributes:
+        enabled (bool): Разрешено ли профилирование.
+        directory (str): Каталог для сохранения профилей.
+        interval (float): Интервал между сэмплами в секундах.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = False,
+            directory: str = 'profiles',
+            interval: float = 0.001
+    ):
+        self.enabled = enabled
+        self.directory = directory
+        self.interval = interval
+        self._active = False
+
+    async def is_requested(self, request: Request) -> bool:
+        """
+        Проверяет, запросил ли суперпользователь профилирование запроса.
+
+        Если проверка прошла, профилировщик остается занят этим
+        запросом до вызова finish. Он занимается до обращения к базе
+        данных, чтобы одновременные запросы не прошли проверку оба.
+        """
+        if not self.enabled or self._active:
+            return False
+        if (request.headers.get(PROFILE_HEADER) != '1' and
+                request.query_params.get(PROFILE_QUERY) != '1'):
+            return False
+        scheme, _, token = request.headers.get(
+            'Authorization', ''
+        ).partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return False
+        self._active = True
+        requested = False
+        try:
+            requested = await get_superuser_by_token(token) is not None
+        finally:
+            if not requested:
+                self._active = False
+        return requested
+
+    def start(self) -> SamplingProfiler:
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profiler.start()
+        return profiler
+
+    async def finish(self, profiler: SamplingProfiler, profile_id: str):
+        """
+        Останавливает профилировщик и сохраняет профиль в файл
+        <directory>/<profile_id>.collapsed.
+        """
+        profiler.stop()
+        self._active = False
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._save, profile_id, profiler.collapsed()
+        )
+
+    def _save(self, profile_id: str, collapsed: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, profile_id + PROFILE_SUFFIX)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(collapsed)
+
+
+def new_profile_id() -> str:
+    return f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}'
+
+
+class ProfilerMiddleware:
+    """
+    ASGI-middleware, профилирующее запросы, для которых суперпользователь
+    запросил профилирование.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or
+                not await self.profiler.is_requested(Request(scope))):
+            await self.app(scope, receive, send)
+            return
+        profile_id = new_profile_id()
+
+        async def send_with_profile_id(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (PROFILE_ID_HEADER.lower().encode(), profile_id.encode()),
+                ]
+            await send(message)
+
+        sampler = self.profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await self.profiler.finish(sampler, profile_id)
+
+
+request_profiler = RequestProfiler(
+    settings.profiling_enabled,
+    settings.profile_dir,
+    settings.profile_interval_ms / 1000
+)
@@ -0,0 +1,193 @@
+import contextlib
+import functools
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import fingerprint, route_template
+
+logger = logging.getLogger(__name__)
+
+_counters: ContextVar[tuple['QueryCounter', ...]] = ContextVar(
+    'query_counters', default=()
+)
+_shape = functools.lru_cache(maxsize=1024)(fingerprint)
+
+
+class QueryCounter:
+    """
+    Запросы к базе данных, выполненные в одном HTTP-запросе
+    или в блоке count_queries.
+
+    Запросы группируются по отпечатку: одинаковые запросы с разными
+    параметрами или литералами считаются одним видом запроса.
+
+    Attributes:
+        statements (Counter[str]): Число запросов каждого вида.
+    """
+
+    def __init__(self):
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Получает виды запросов, выполненные не меньше threshold раз.
+        """
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def report(self) -> str:
+        return '\n'.join(
+            f'{count:>4} x {statement}'
+            for statement, count in self.statements.most_common()
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Подписывается на выполнение запросов движка.
+
+    Пока нет активного счетчика, обработчик только читает
+    контекстную переменную, поэтому движки подписываются всегда,
+    и count_queries работает без включения настроек.
+    """
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def count_statement(conn, cursor, statement, parameters,
+                        context, executemany):
+        counters = _counters.get()
+        if counters:
+            shape = _shape(statement)
+            for counter in counters:
+                counter.statements[shape] += 1
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Считает запросы к базе данных, выполненные внутри блока.
+
+    Учитываются запросы текущей задачи и задач, созданных из нее.
+    Записи, которые выполняет конвейер записи в своей задаче,
+    не учитываются.
+
+    Yields:
+        QueryCounter: Счетчик запросов блока.
+    """
+    counter = QueryCounter()
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+
+@contextlib.contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryCounter]:
+    """
+    Проверяет, что внутри блока выполнено не больше limit запросов
+    к базе данных.
+
+    Пример:
+        with assert_max_queries(5):
+            client.post('/reservations/', json=..., headers=...)
+
+    Raises:
+        AssertionError: Если выполнено больше limit запросов.
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(
+            f'Выполнено запросов: {counter.count}, '
+            f'допустимо: {limit}\n{counter.report()}'
+        )
+
+
+class QueryBudget:
+    """
+    Бюджеты запросов к базе данных по маршрутам.
+
+    Attributes:
+        enabled (bool): Проверять ли бюджеты.
+        default (int): Бюджет маршрутов, не указанных в routes.
+        routes (dict[str, int]): Бюджеты по маршрутам вида
+            "POST /reservations/".
+        repeat_threshold (int): Число одинаковых запросов, начиная
+            с которого они журналируются как вероятный N+1.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = False,
+            default: int = 10,
+            routes: Optional[dict[str, int]] = None,
+            repeat_threshold: int = 3
+    ):
+        self.enabled = enabled
+        self.default = default
+        self.routes = routes or {}
+        self.repeat_threshold = repeat_threshold
+
+    def check(self, route: str, counter: QueryCounter) -> None:
+        """
+        Журналирует превышение бюджета маршрута и повторяющиеся запросы.
+
+        Args:
+            route (str): Метод и шаблон маршрута, например
+                "POST /reservations/".
+            counter (QueryCounter): Запросы, выполненные в HTTP-запросе.
+        """
+        budget = self.routes.get(route, self.default)
+        if counter.count > budget:
+            logger.warning(
+                '%s: %d database queries, budget %d\n%s',
+                route, counter.count, budget, counter.report()
+            )
+        for statement, count in counter.repeated(self.repeat_threshold):
+            logger.warning(
+                '%s: statement executed %d times, possible N+1: %s',
+                route, count, statement
+            )
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI-middleware, считающее запросы к базе данных в каждом
+    HTTP-запросе и проверяющее бюджет его маршрута.
+    """
+
+    def __init__(self, app, budget: QueryBudget):
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        with count_queries() as counter:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.budget.check(
+                    f'{scope["method"]} {route_template(scope)}', counter
+                )
+
+
+query_budget = QueryBudget(
+    settings.query_budget_enabled,
+    settings.query_budget_default,
+    settings.query_budget_routes,
+    settings.query_budget_repeat_threshold
+)
@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class RecentWriters:
+    """
+    Клиенты, недавно изменившие данные.
+
+    Реплика для чтения может отставать от основной базы данных, поэтому
+    в течение window секунд после собственной записи клиент читает
+    из основной базы и сразу видит свои изменения. Клиент определяется
+    по заголовку Authorization, поэтому проверка не требует обращения
+    к базе данных. Хранится не больше max_size клиентов, самые давние
+    записи вытесняются первыми.
+
+    Attributes:
+        window (float): Длительность окна в секундах, 0 - окно отключено.
+        max_size (int): Максимальное число хранимых клиентов.
+    """
+
+    def __init__(self, window: float = 0, max_size: int = 100_000):
+        self.window = window
+        self.max_size = max_size
+        self._deadlines: OrderedDict[str, float] = OrderedDict()
+
+    def mark(self, client: Optional[str]) -> None:
+        if not self.window or not client:
+            return
+        self._deadlines[client] = time.monotonic() + self.window
+        self._deadlines.move_to_end(client)
+        while len(self._deadlines) > self.max_size:
+            self._deadlines.popitem(last=False)
+
+    def is_recent(self, client: Optional[str]) -> bool:
+        if not self.window or not client:
+            return False
+        now = time.monotonic()
+        while self._deadlines:
+            oldest, deadline = next(iter(self._deadlines.items()))
+            if deadline > now:
+                break
+            del self._deadlines[oldest]
+        return client in self._deadlines
+
+    def clear(self) -> None:
+        self._deadlines.clear()
+
+
+recent_writers = RecentWriters(settings.read_your_writes_seconds)
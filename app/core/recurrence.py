@@ -0,0 +1,170 @@
+import datetime as dt
+from typing import Optional
+
+import numpy as np
+
+FREQUENCY_DAYS = {'daily': 1, 'weekly': 7}
+RECURRENCE_MAX_COUNT = 1000
+SERIES_OVERLAP_MESSAGE = (
+    'Повторения бронирования не могут пересекаться друг с другом'
+)
+
+
+def get_step(frequency: str, interval: int) -> dt.timedelta:
+    """
+    Получает шаг между повторениями серии.
+
+    Args:
+        frequency (str): Частота повторения: daily или weekly.
+        interval (int): Повторять каждые interval дней или недель.
+
+    Returns:
+        dt.timedelta: Шаг между началами соседних повторений.
+    """
+    return dt.timedelta(days=FREQUENCY_DAYS[frequency] * interval)
+
+
+def check_series_duration(
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime,
+        step: dt.timedelta
+) -> None:
+    """
+    Проверяет, что повторения серии не пересекаются друг с другом.
+
+    Args:
+        from_reserve (dt.datetime): Время начала повторения.
+        to_reserve (dt.datetime): Время окончания повторения.
+        step (dt.timedelta): Шаг между повторениями.
+
+    Raises:
+        ValueError: Если длительность повторения не меньше шага серии.
+    """
+    if to_reserve - from_reserve >= step:
+        raise ValueError(SERIES_OVERLAP_MESSAGE)
+
+
+def get_count(
+        from_reserve: dt.datetime,
+        step: dt.timedelta,
+        count: Optional[int] = None,
+        until: Optional[dt.datetime] = None
+) -> int:
+    """
+    Получает число повторений серии по count или по дате окончания until.
+
+    Args:
+        from_reserve (dt.datetime): Время начала первого повторения.
+        step (dt.timedelta): Шаг между повторениями.
+        count (Optional[int], optional): Число повторений.
+        until (Optional[dt.datetime], optional): Последнее допустимое время начала.
+
+    Returns:
+        int: Число повторений.
+    """
+    if count is not None:
+        return count
+    return (until - from_reserve) // step + 1
+
+
+def get_series(
+        from_reserve: dt.datetime,
+        recurrence: Optional[dict] = None
+) -> tuple[Optional[dt.timedelta], int]:
+    """
+    Получает шаг и число повторений серии по правилу повторения.
+
+    Args:
+        from_reserve (dt.datetime): Время начала первого повторения.
+        recurrence (Optional[dict], optional): Правило повторения с ключами frequency, interval, count и until.
+
+    Returns:
+        tuple[Optional[dt.timedelta], int]: Шаг (None для одиночного бронирования) и число повторений.
+    """
+    if recurrence is None:
+        return None, 1
+    step = get_step(recurrence['frequency'], recurrence['interval'])
+    return step, get_count(
+        from_reserve, step, recurrence.get('count'), recurrence.get('until')
+    )
+
+
+def expand(
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime,
+        step: Optional[dt.timedelta] = None,
+        count: int = 1,
+        window_from: Optional[dt.datetime] = None,
+        window_to: Optional[dt.datetime] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Разворачивает серию в массивы времен начала и окончания повторений.
+
+    Разворачиваются только повторения, пересекающиеся с окном
+    [window_from, window_to], номера первого и последнего из них
+    вычисляются без перебора.
+
+    Args:
+        from_reserve (dt.datetime): Время начала первого повторения.
+        to_reserve (dt.datetime): Время окончания первого повторения.
+        step (Optional[dt.timedelta], optional): Шаг между повторениями, None для одиночного бронирования.
+        count (int, optional): Число повторений.
+        window_from (Optional[dt.datetime], optional): Начало окна.
+        window_to (Optional[dt.datetime], optional): Окончание окна.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Массивы datetime64 начал и окончаний.
+    """
+    first, last = 0, count - 1
+    if step is not None:
+        if window_from is not None and window_from > to_reserve:
+            first = max(first, -((to_reserve - window_from) // step))
+        if window_to is not None:
+            last = min(last, (window_to - from_reserve) // step)
+    else:
+        last = 0
+    if first > last:
+        empty = np.array([], dtype='datetime64[us]')
+        return empty, empty
+    starts = np.datetime64(from_reserve, 'us') + (
+        np.arange(first, last + 1) * np.timedelta64(step or dt.timedelta(0))
+    )
+    return starts, starts + np.timedelta64(to_reserve - from_reserve)
+
+
+def find_overlaps(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        other_starts: np.ndarray,
+        other_ends: np.ndarray
+) -> np.ndarray:
+    """
+    Отмечает отрезки other, пересекающиеся хотя бы с одним отрезком серии.
+
+    Отрезки серии не пересекаются друг с другом и отсортированы, поэтому
+    для каждого отрезка other достаточно одного двоичного поиска
+    первого отрезка серии, заканчивающегося не раньше его начала.
+
+    Args:
+        starts (np.ndarray): Начала повторений серии.
+        ends (np.ndarray): Окончания повторений серии.
+        other_starts (np.ndarray): Начала проверяемых отрезков.
+        other_ends (np.ndarray): Окончания проверяемых отрезков.
+
+    Returns:
+        np.ndarray: Булева маска по проверяемым отрезкам.
+    """
+    if not len(starts) or not len(other_starts):
+        return np.zeros(len(other_starts), dtype=bool)
+    positions = np.searchsorted(ends, other_starts, side='left')
+    found = positions < len(starts)
+    mask = np.zeros(len(other_starts), dtype=bool)
+    mask[found] = starts[positions[found]] <= other_ends[found]
+    return mask
+
+
+def to_datetimes(values: np.ndarray) -> list[dt.datetime]:
+    """
+    Преобразует массив datetime64 в список datetime.
+    """
+    return values.astype('datetime64[us]').astype(dt.datetime).tolist()
@@ -0,0 +1,147 @@
+import bisect
+import time
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+
+class MeetingRoomSnapshot:
+    """
+    Снимок всех переговорных комнат.
+
+    Attributes:
+        ids (list[int]): Отсортированные идентификаторы комнат.
+        by_id (dict[int, dict]): Значения столбцов комнат по идентификатору.
+        id_by_name (dict[str, int]): Идентификаторы комнат по названию.
+    """
+
+    __slots__ = ('ids', 'by_id', 'id_by_name')
+
+    def __init__(self, rooms: Iterable[dict] = ()):
+        self.ids: list[int] = []
+        self.by_id: dict[int, dict] = {}
+        self.id_by_name: dict[str, int] = {}
+        for room in rooms:
+            self.put(room)
+
+    def put(self, room: dict) -> None:
+        previous = self.by_id.get(room['id'])
+        if previous is None:
+            bisect.insort(self.ids, room['id'])
+        else:
+            self.id_by_name.pop(previous['name'], None)
+        self.by_id[room['id']] = room
+        self.id_by_name[room['name']] = room['id']
+
+    def discard(self, room_id: int) -> None:
+        room = self.by_id.pop(room_id, None)
+        if room is not None:
+            self.ids.remove(room_id)
+            self.id_by_name.pop(room['name'], None)
+
+    def get_page(
+            self,
+            limit: int,
+            after: Optional[int] = None
+    ) -> tuple[list[dict], bool]:
+        """
+        Получает комнаты страницы в порядке идентификаторов.
+
+        Args:
+            limit (int): Максимальное число комнат на странице.
+            after (Optional[int], optional): Идентификатор последней комнаты предыдущей страницы.
+
+        Returns:
+            tuple[list[dict], bool]: Комнаты страницы и признак
+                наличия следующей страницы.
+        """
+        start = 0 if after is None else bisect.bisect_right(self.ids, after)
+        ids = self.ids[start:start + limit + 1]
+        return [self.by_id[room_id] for room_id in ids[:limit]], (
+            len(ids) > limit
+        )
+
+
+class MeetingRoomCache:
+    """
+    Внутрипроцессный кэш переговорных комнат по идентификатору и названию.
+
+    Комнаты меняются редко, поэтому кэш хранит снимок всех комнат
+    и загружает его одним запросом. CRUDMeetingRoom обновляет снимок
+    после фиксации каждой записи, а через ttl секунд снимок загружается
+    заново на случай изменений из других процессов.
+
+    Attributes:
+        enabled (bool): Использовать ли кэш.
+        ttl (float): Время жизни снимка в секундах.
+        hits (int): Число обращений, обслуженных снимком.
+        misses (int): Число обращений, потребовавших загрузки снимка.
+        generation (int): Счетчик изменений, позволяет не сохранять снимок,
+            загруженный одновременно с записью комнаты.
+    """
+
+    def __init__(self, enabled: bool = False, ttl: float = 60):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._snapshot: Optional[MeetingRoomSnapshot] = None
+        self._loaded_at = 0.0
+
+    @property
+    def size(self) -> int:
+        return 0 if self._snapshot is None else len(self._snapshot.ids)
+
+    def get(self) -> Optional[MeetingRoomSnapshot]:
+        """
+        Получает снимок, если он загружен и не устарел, и учитывает
+        попадание или промах.
+        """
+        if (self._snapshot is not None and
+                time.monotonic() - self._loaded_at < self.ttl):
+            self.hits += 1
+            return self._snapshot
+        self.misses += 1
+        return None
+
+    def store(
+            self,
+            rooms: Iterable[dict],
+            generation: int
+    ) -> MeetingRoomSnapshot:
+        """
+        Сохраняет загруженный снимок, если с начала загрузки
+        комнаты не менялись.
+
+        Args:
+            rooms (Iterable[dict]): Значения столбцов всех комнат.
+            generation (int): Значение generation на момент начала загрузки.
+
+        Returns:
+            MeetingRoomSnapshot: Снимок загруженных комнат.
+        """
+        snapshot = MeetingRoomSnapshot(rooms)
+        if generation == self.generation:
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+        return snapshot
+
+    def put(self, room: dict) -> None:
+        self.generation += 1
+        if self._snapshot is not None:
+            self._snapshot.put(room)
+
+    def discard(self, room_id: int) -> None:
+        self.generation += 1
+        if self._snapshot is not None:
+            self._snapshot.discard(room_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._snapshot = None
+
+
+meeting_room_cache = MeetingRoomCache(
+    settings.meeting_room_cache_enabled, settings.meeting_room_cache_ttl
+)
@@ -0,0 +1,249 @@
+import bisect
+import datetime as dt
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.recurrence import expand, get_step, to_datetimes
+from app.models.reservation import Reservation
+
+
+class RoomSchedule:
+    """
+    Отсортированное по времени начала расписание одной переговорной комнаты.
+
+    Attributes:
+        starts (list[dt.datetime]): Времена начала бронирований.
+        entries (list[tuple]): Кортежи (from_reserve, id, to_reserve, user_id).
+        max_duration (dt.timedelta): Максимальная длительность бронирования,
+            ограничивает область поиска пересечений слева.
+    """
+
+    __slots__ = ('starts', 'entries', 'max_duration')
+
+    def __init__(self):
+        self.starts: list[dt.datetime] = []
+        self.entries: list[tuple] = []
+        self.max_duration = dt.timedelta(0)
+
+    def add(
+            self,
+            reservation_id: int,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            user_id: Optional[int]
+    ) -> None:
+        entry = (from_reserve, reservation_id, to_reserve, user_id)
+        position = bisect.bisect_left(self.entries, entry)
+        self.entries.insert(position, entry)
+        self.starts.insert(position, from_reserve)
+        self.max_duration = max(self.max_duration, to_reserve - from_reserve)
+
+    def discard(self, reservation_id: int, from_reserve: dt.datetime) -> None:
+        position = bisect.bisect_left(self.starts, from_reserve)
+        while (position < len(self.entries) and
+               self.starts[position] == from_reserve):
+            if self.entries[position][1] == reservation_id:
+                del self.entries[position]
+                del self.starts[position]
+                return
+            position += 1
+
+    def overlapping(
+            self,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime
+    ) -> list[tuple]:
+        """
+        Возвращает записи, пересекающиеся с отрезком [from_reserve, to_reserve].
+        """
+        low = bisect.bisect_left(self.starts, from_reserve - self.max_duration)
+        high = bisect.bisect_right(self.starts, to_reserve)
+        return [
+            entry for entry in self.entries[low:high]
+            if entry[2] >= from_reserve
+        ]
+
+
+class ReservationIndex:
+    """
+    Внутрипроцессный индекс бронирований по переговорным комнатам.
+
+    Загружается при старте приложения и обновляется из CRUDReservation.
+    Бронирования, созданные другими процессами сервера, в него
+    не попадают, поэтому проверки пересечений при записи выполняются
+    по индексу только при запуске в одном процессе, а иначе запросом
+    к базе данных. Серии бронирований хранятся развернутыми
+    по повторениям.
+
+    Attributes:
+        ready (bool): Загружен ли индекс.
+        single_process (bool): Запущено ли приложение в одном процессе.
+    """
+
+    def __init__(self, single_process: bool = False):
+        self.ready = False
+        self.single_process = single_process
+        self._rooms: dict[int, RoomSchedule] = {}
+        self._by_id: dict[int, tuple[int, list[dt.datetime]]] = {}
+
+    @classmethod
+    def from_reservations(
+            cls,
+            reservations: Iterable[Reservation]
+    ) -> 'ReservationIndex':
+        """
+        Строит загруженный индекс по набору бронирований.
+
+        Args:
+            reservations (Iterable[Reservation]): Бронирования.
+
+        Returns:
+            ReservationIndex: Готовый к использованию индекс.
+        """
+        index = cls()
+        for reservation in reservations:
+            index._add(reservation.id, reservation.from_reserve,
+                       reservation.to_reserve, reservation.meetingroom_id,
+                       reservation.user_id, reservation.repeat_step,
+                       reservation.repeat_count)
+        index.ready = True
+        return index
+
+    @property
+    def checks_writes(self) -> bool:
+        """
+        Проверяются ли пересечения при записи по индексу.
+        """
+        return self.ready and self.single_process
+
+    async def load(self, session: AsyncSession) -> None:
+        """
+        Загружает все бронирования из базы данных.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        """
+        self.clear()
+        rows = await session.execute(select(
+            Reservation.id,
+            Reservation.from_reserve,
+            Reservation.to_reserve,
+            Reservation.meetingroom_id,
+            Reservation.user_id,
+            Reservation.repeat_frequency,
+            Reservation.repeat_interval,
+            Reservation.repeat_count
+        ))
+        for (reservation_id, from_reserve, to_reserve, room_id, user_id,
+             frequency, interval, count) in rows:
+            step = get_step(frequency, interval) if frequency else None
+            self._add(reservation_id, from_reserve, to_reserve,
+                      room_id, user_id, step, count)
+        self.ready = True
+
+    def clear(self) -> None:
+        self.ready = False
+        self._rooms.clear()
+        self._by_id.clear()
+
+    def add(self, reservation: Reservation) -> None:
+        if not self.ready:
+            return
+        self.discard(reservation.id)
+        self._add(reservation.id, reservation.from_reserve,
+                  reservation.to_reserve, reservation.meetingroom_id,
+                  reservation.user_id, reservation.repeat_step,
+                  reservation.repeat_count)
+
+    def discard(self, reservation_id: int) -> None:
+        position = self._by_id.pop(reservation_id, None)
+        if position is not None:
+            room_id, starts = position
+            for from_reserve in starts:
+                self._rooms[room_id].discard(reservation_id, from_reserve)
+
+    def discard_room(self, meetingroom_id: int) -> None:
+        schedule = self._rooms.pop(meetingroom_id, None)
+        if schedule is not None:
+            for entry in schedule.entries:
+                self._by_id.pop(entry[1], None)
+
+    def find_overlapping(
+            self,
+            *,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            meetingroom_id: int,
+            reservation_id: Optional[int] = None
+    ) -> Sequence[Reservation]:
+        """
+        Находит бронирования комнаты, пересекающиеся с указанным периодом.
+
+        Args:
+            from_reserve (dt.datetime): Время начала бронирования.
+            to_reserve (dt.datetime): Время окончания бронирования.
+            meetingroom_id (int): Идентификатор переговорной комнаты.
+            reservation_id (Optional[int], optional): Идентификатор бронирования (для исключения при поиске).
+
+        Returns:
+            Sequence[Reservation]: Несвязанные с сессией объекты бронирований.
+        """
+        schedule = self._rooms.get(meetingroom_id)
+        if schedule is None:
+            return []
+        return [
+            Reservation(id=entry_id, from_reserve=start, to_reserve=end,
+                        meetingroom_id=meetingroom_id, user_id=user_id)
+            for start, entry_id, end, user_id
+            in schedule.overlapping(from_reserve, to_reserve)
+            if entry_id != reservation_id
+        ]
+
+    def get_busy_room_ids(
+            self,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime
+    ) -> set[int]:
+        """
+        Получает идентификаторы комнат, занятых в указанный период.
+
+        Args:
+            from_reserve (dt.datetime): Начало периода.
+            to_reserve (dt.datetime): Окончание периода.
+
+        Returns:
+            set[int]: Идентификаторы занятых комнат.
+        """
+        return {
+            room_id for room_id, schedule in self._rooms.items()
+            if schedule.overlapping(from_reserve, to_reserve)
+        }
+
+    def _add(
+            self,
+            reservation_id: int,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            meetingroom_id: int,
+            user_id: int,
+            step: Optional[dt.timedelta] = None,
+            count: Optional[int] = None
+    ) -> None:
+        schedule = self._rooms.setdefault(meetingroom_id, RoomSchedule())
+        if step is None:
+            starts, ends = [from_reserve], [to_reserve]
+        else:
+            starts, ends = map(
+                to_datetimes, expand(from_reserve, to_reserve, step, count)
+            )
+        for start, end in zip(starts, ends):
+            schedule.add(reservation_id, start, end, user_id)
+        self._by_id[reservation_id] = (meetingroom_id, starts)
+
+
+reservation_index = ReservationIndex(
+    settings.single_process or settings.write_pipeline_enabled
+)
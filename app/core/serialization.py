@@ -0,0 +1,121 @@
+from typing import Any, Mapping, Optional, Sequence
+
+import orjson
+from fastapi import Response
+
+JSON_MEDIA_TYPE = 'application/json'
+
+RESERVATION_FIELDS = (
+    'from_reserve',
+    'to_reserve',
+    'id',
+    'meetingroom_id',
+    'user_id',
+)
+MEETING_ROOM_FIELDS = (
+    'name',
+    'description',
+    'id',
+)
+RECURRENCE_FIELDS = (
+    ('frequency', 'repeat_frequency'),
+    ('interval', 'repeat_interval'),
+    ('count', 'repeat_count'),
+)
+
+
+def _get_values(
+        row: Any,
+        attributes: Sequence[str]
+) -> Mapping[str, Any]:
+    """
+    Получает значения столбцов строки.
+
+    ORM-объект хранит загруженные значения в __dict__, и чтение из него
+    в несколько раз быстрее, чем через инструментированные атрибуты.
+    Незагруженные атрибуты читаются обычным образом.
+    """
+    values = row.__dict__
+    for attribute in attributes:
+        if attribute not in values:
+            return {attribute: getattr(row, attribute)
+                    for attribute in attributes}
+    return values
+
+
+def _iter_values(
+        rows: Sequence[Any],
+        attributes: Sequence[str]
+):
+    if rows and hasattr(rows[0], '_fields'):
+        # Строки результата и row_type - кортежи: позиционный доступ
+        # к ним быстрее, чем по имени столбца.
+        names = rows[0]._fields
+        return (dict(zip(names, row)) for row in rows)
+    return (_get_values(row, attributes) for row in rows)
+
+
+def dump_reservations(
+        reservations: Sequence[Any],
+        exclude: frozenset[str] = frozenset()
+) -> bytes:
+    """
+    Сериализует бронирования в JSON-массив так же, как
+    response_model=list[ReservationDB] с response_model_exclude_none,
+    но без повторной валидации каждой строки Pydantic.
+
+    Args:
+        reservations (Sequence[Any]): Объекты Reservation или строки
+            результата запроса со столбцами бронирования.
+        exclude (frozenset[str], optional): Исключаемые поля,
+            как в response_model_exclude.
+
+    Returns:
+        bytes: Тело ответа.
+    """
+    fields = [field for field in RESERVATION_FIELDS if field not in exclude]
+    attributes = (
+        *RESERVATION_FIELDS,
+        *(attribute for _, attribute in RECURRENCE_FIELDS)
+    )
+    items = []
+    for values in _iter_values(reservations, attributes):
+        data = {field: values[field] for field in fields}
+        if values['repeat_frequency'] is not None:
+            data['recurrence'] = {
+                field: values[attribute]
+                for field, attribute in RECURRENCE_FIELDS
+                if values[attribute] is not None
+            }
+        items.append(data)
+    return orjson.dumps(items, option=orjson.OPT_UTC_Z)
+
+
+def dump_meeting_rooms(rooms: Sequence[Any]) -> bytes:
+    """
+    Сериализует переговорные комнаты в JSON-массив так же, как
+    response_model=list[MeetingRoomDB] с response_model_exclude_none.
+    """
+    items = []
+    for values in _iter_values(rooms, MEETING_ROOM_FIELDS):
+        data = {'name': values['name']}
+        if values['description'] is not None:
+            data['description'] = values['description']
+        data['id'] = values['id']
+        items.append(data)
+    return orjson.dumps(items)
+
+
+def json_response(
+        content: bytes,
+        headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Создает ответ с уже сериализованным JSON.
+
+    FastAPI не валидирует возвращенный Response по response_model,
+    поэтому response_model эндпоинта остается только для схемы OpenAPI.
+    Заголовки, установленные через параметр Response эндпоинта,
+    к такому ответу не добавляются и передаются в headers.
+    """
+    return Response(content, media_type=JSON_MEDIA_TYPE, headers=headers)
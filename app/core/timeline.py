@@ -0,0 +1,245 @@
+import datetime as dt
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+BITMAP_SIZE = SLOTS_PER_DAY // 8
+
+SLOT = dt.timedelta(minutes=SLOT_MINUTES)
+DAY = dt.timedelta(days=1)
+
+
+def get_day_slots(
+        day: dt.date,
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime
+) -> Optional[tuple[int, int]]:
+    """
+    Получает полуинтервал слотов дня, занятых отрезком времени.
+
+    Args:
+        day (dt.date): День.
+        from_reserve (dt.datetime): Начало отрезка.
+        to_reserve (dt.datetime): Окончание отрезка.
+
+    Returns:
+        Optional[tuple[int, int]]: Номера первого и следующего за последним
+            занятых слотов или None, если отрезок не попадает в день.
+    """
+    day_start = dt.datetime.combine(day, dt.time())
+    first = max(0, (from_reserve - day_start) // SLOT)
+    last = min(SLOTS_PER_DAY, -((day_start - to_reserve) // SLOT))
+    if first >= last:
+        return None
+    return first, last
+
+
+def get_days(
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime
+) -> Iterable[dt.date]:
+    """
+    Перечисляет дни, которые затрагивает отрезок времени.
+    """
+    day = from_reserve.date()
+    while dt.datetime.combine(day, dt.time()) < to_reserve:
+        yield day
+        day += DAY
+
+
+def mark(
+        bitmap: bytes,
+        day: dt.date,
+        periods: Iterable[tuple[dt.datetime, dt.datetime]]
+) -> bytes:
+    """
+    Отмечает в битовой карте дня слоты, занятые отрезками времени.
+
+    Args:
+        bitmap (bytes): Битовая карта дня.
+        day (dt.date): День.
+        periods (Iterable[tuple[dt.datetime, dt.datetime]]): Занятые отрезки.
+
+    Returns:
+        bytes: Новая битовая карта.
+    """
+    value = int.from_bytes(bitmap, 'little')
+    for from_reserve, to_reserve in periods:
+        slots = get_day_slots(day, from_reserve, to_reserve)
+        if slots is not None:
+            first, last = slots
+            value |= ((1 << (last - first)) - 1) << first
+    return value.to_bytes(BITMAP_SIZE, 'little')
+
+
+def get_window_slots(
+        from_reserve: dt.datetime,
+        to_reserve: dt.datetime
+) -> Optional[tuple[int, int]]:
+    """
+    Получает полуинтервал слотов, которые должны быть свободны,
+    чтобы период не пересекался с бронированиями.
+
+    Бронирования пересекаются и при касании границами, поэтому
+    проверяются и слоты, которые заканчиваются в начале периода
+    или начинаются в его конце. Если все слоты свободны, период
+    свободен. Обратное неверно: слот отмечается занятым, даже если
+    бронирование занимает лишь его часть.
+
+    Args:
+        from_reserve (dt.datetime): Начало периода.
+        to_reserve (dt.datetime): Окончание периода.
+
+    Returns:
+        Optional[tuple[int, int]]: Номера первого и следующего
+            за последним слотов дня from_reserve или None, если период
+            касается полуночи или выходит за пределы одного дня.
+    """
+    day_start = dt.datetime.combine(from_reserve.date(), dt.time())
+    if from_reserve <= day_start or to_reserve >= day_start + DAY:
+        return None
+    return (
+        -((day_start - from_reserve) // SLOT) - 1,
+        (to_reserve - day_start) // SLOT + 1
+    )
+
+
+def is_free(bitmap: bytes, first: int, last: int) -> bool:
+    """
+    Проверяет, что слоты с first по last (не включительно) свободны.
+    """
+    mask = ((1 << (last - first)) - 1) << first
+    return not int.from_bytes(bitmap, 'little') & mask
+
+
+def get_busy_periods(
+        bitmap: bytes,
+        day: dt.date
+) -> list[tuple[dt.datetime, dt.datetime]]:
+    """
+    Преобразует битовую карту дня в список занятых отрезков времени.
+    """
+    value = int.from_bytes(bitmap, 'little')
+    day_start = dt.datetime.combine(day, dt.time())
+    periods = []
+    slot = 0
+    while value:
+        shift = (value & -value).bit_length() - 1
+        value >>= shift
+        slot += shift
+        length = (~value & (value + 1)).bit_length() - 1
+        periods.append((day_start + slot * SLOT,
+                        day_start + (slot + length) * SLOT))
+        value >>= length
+        slot += length
+    return periods
+
+
+class OccupancyTimeline:
+    """
+    Кэш битовых карт занятости переговорных комнат по дням.
+
+    Каждая карта занимает BITMAP_SIZE байт: по биту на слот длиной
+    SLOT_MINUTES минут. Новые бронирования отмечаются в уже построенных
+    картах, при изменении и удалении бронирований затронутые дни
+    удаляются из кэша и строятся заново при следующем запросе.
+    Через ttl секунд после построения карта строится заново на случай
+    изменений из других процессов.
+
+    Attributes:
+        enabled (bool): Сохранять ли построенные карты.
+        max_size (int): Максимальное число хранимых карт.
+        ttl (float): Время жизни карты в секундах.
+        generation (int): Счетчик изменений, позволяет не сохранять карту,
+            построенную одновременно с записью бронирования.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = False,
+            max_size: int = 100_000,
+            ttl: float = 60
+    ):
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._bitmaps: OrderedDict[
+            tuple[int, dt.date], tuple[bytes, float]
+        ] = OrderedDict()
+
+    def get(self, meetingroom_id: int, day: dt.date) -> Optional[bytes]:
+        entry = self._bitmaps.get((meetingroom_id, day))
+        if entry is None:
+            return None
+        bitmap, loaded_at = entry
+        if time.monotonic() - loaded_at >= self.ttl:
+            del self._bitmaps[(meetingroom_id, day)]
+            return None
+        self._bitmaps.move_to_end((meetingroom_id, day))
+        return bitmap
+
+    def store(
+            self,
+            meetingroom_id: int,
+            day: dt.date,
+            bitmap: bytes,
+            generation: int
+    ) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+        self._bitmaps[(meetingroom_id, day)] = (bitmap, time.monotonic())
+        self._bitmaps.move_to_end((meetingroom_id, day))
+        while len(self._bitmaps) > self.max_size:
+            self._bitmaps.popitem(last=False)
+
+    def add(
+            self,
+            meetingroom_id: int,
+            periods: Iterable[tuple[dt.datetime, dt.datetime]]
+    ) -> None:
+        """
+        Отмечает новые занятые отрезки в уже построенных картах.
+        """
+        self.generation += 1
+        for from_reserve, to_reserve in periods:
+            for day in get_days(from_reserve, to_reserve):
+                entry = self._bitmaps.get((meetingroom_id, day))
+                if entry is not None:
+                    bitmap, loaded_at = entry
+                    self._bitmaps[(meetingroom_id, day)] = (mark(
+                        bitmap, day, [(from_reserve, to_reserve)]
+                    ), loaded_at)
+
+    def discard(
+            self,
+            meetingroom_id: int,
+            periods: Iterable[tuple[dt.datetime, dt.datetime]]
+    ) -> None:
+        """
+        Удаляет из кэша карты дней, затронутых освобожденными отрезками.
+        """
+        self.generation += 1
+        for from_reserve, to_reserve in periods:
+            for day in get_days(from_reserve, to_reserve):
+                self._bitmaps.pop((meetingroom_id, day), None)
+
+    def discard_room(self, meetingroom_id: int) -> None:
+        self.generation += 1
+        for key in [key for key in self._bitmaps if key[0] == meetingroom_id]:
+            del self._bitmaps[key]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._bitmaps.clear()
+
+
+occupancy_timeline = OccupancyTimeline(
+    settings.timeline_cache_enabled,
+    settings.timeline_cache_size,
+    settings.timeline_cache_ttl
+)
@@ -1,9 +1,12 @@
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
+import jwt
 from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
 
 from fastapi_users import (
-    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException
+    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException,
+    exceptions
 )
 from fastapi_users.authentication import (
     AuthenticationBackend, BearerTransport, JWTStrategy
@@ -11,10 +14,15 @@ from fastapi_users.authentication import (
 
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
-from app.core.db import get_async_session
+from app.core.db import async_session, get_async_session
+from app.core.hashing import password_hasher
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -35,6 +43,53 @@ async def get_user_db(session: AsyncSession = Depends(get_async_session)):
 bearer_transport = BearerTransport(tokenUrl='auth/jwt/login')
 
 
+class CachedJWTStrategy(JWTStrategy):
+    """
+    Стратегия JWT, запоминающая проверенные токены в user_cache.
+
+    Для закэшированного токена пользователь восстанавливается из кэша
+    и присоединяется к сессии без запроса к базе данных.
+    """
+
+    async def read_token(
+            self,
+            token: Optional[str],
+            user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None or not user_cache.enabled:
+            return await super().read_token(token, user_manager)
+        cached = user_cache.get(token)
+        if cached is not None:
+            user = User(**cached)
+            make_transient_to_detached(user)
+            return await user_manager.user_db.session.merge(user, load=False)
+        generation = user_cache.generation
+        user = await super().read_token(token, user_manager)
+        if user is not None:
+            user_cache.store(
+                token, self.get_expiration(token), get_user_data(user),
+                generation
+            )
+        return user
+
+    def get_expiration(self, token: str) -> float:
+        """
+        Получает время истечения токена, подпись которого уже проверена.
+        """
+        data = jwt.decode(token, options={'verify_signature': False})
+        return data.get('exp', float('inf'))
+
+
+def get_user_data(user: User) -> dict[str, Any]:
+    """
+    Получает значения столбцов пользователя.
+    """
+    return {
+        attr.key: getattr(user, attr.key)
+        for attr in inspect(User).column_attrs
+    }
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """
     Получает стратегию JWT для аутентификации.
@@ -42,7 +97,7 @@ def get_jwt_strategy() -> JWTStrategy:
     Returns:
         JWTStrategy: Стратегия JWT.
     """
-    return JWTStrategy(secret=settings.secret, lifetime_seconds=3600)
+    return CachedJWTStrategy(secret=settings.secret, lifetime_seconds=3600)
 
 
 auth_backend = AuthenticationBackend(
@@ -67,6 +122,15 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
 
         on_after_register(user: User, request: Optional[Request] = None):
             Вызывается после регистрации пользователя.
+
+        on_after_update, on_after_verify, on_after_reset_password, on_after_delete:
+            Удаляют пользователя из кэша проверенных токенов.
+
+        create, authenticate, _update:
+            Хешируют и проверяют пароли в пуле password_hasher,
+            а не в цикле событий. На время хеширования транзакция
+            завершается, чтобы ожидающие в очереди запросы
+            не удерживали соединения с базой данных.
     """
 
     async def validate_password(
@@ -93,6 +157,105 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
                 reason='Password should not contain email'
             )
 
+    async def create(
+            self,
+            user_create: UserCreate,
+            safe: bool = False,
+            request: Optional[Request] = None
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop('password')
+        await self.user_db.session.commit()
+        user_dict['hashed_password'] = await password_hasher.hash(password)
+        # Пока пароль хешировался, пользователя с тем же email мог
+        # создать параллельный запрос: его отсекает уникальный индекс.
+        try:
+            created_user = await self.user_db.create(user_dict)
+        except IntegrityError:
+            await self.user_db.session.rollback()
+            raise exceptions.UserAlreadyExists()
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+            self,
+            credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            await self.user_db.session.commit()
+            # Хеширование выравнивает время ответа для несуществующих email
+            await password_hasher.hash(credentials.password)
+            return None
+        await self.user_db.session.commit()
+        verified, updated_password_hash = (
+            await password_hasher.verify_and_update(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(
+                user, {'hashed_password': updated_password_hash}
+            )
+        return user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        password = update_dict.get('password')
+        if password is None:
+            return await super()._update(user, update_dict)
+        await self.validate_password(password, user)
+        update_dict = {
+            field: value for field, value in update_dict.items()
+            if field != 'password'
+        }
+        await self.user_db.session.commit()
+        update_dict['hashed_password'] = await password_hasher.hash(password)
+        return await super()._update(user, update_dict)
+
+    async def on_after_update(
+            self,
+            user: User,
+            update_dict: dict[str, Any],
+            request: Optional[Request] = None
+    ) -> None:
+        """
+        Удаляет измененного пользователя из кэша, чтобы новые значения
+        is_active и is_superuser действовали сразу для всех его токенов.
+        """
+        user_cache.discard_user(user.id)
+
+    async def on_after_verify(
+            self,
+            user: User,
+            request: Optional[Request] = None
+    ) -> None:
+        user_cache.discard_user(user.id)
+
+    async def on_after_reset_password(
+            self,
+            user: User,
+            request: Optional[Request] = None
+    ) -> None:
+        user_cache.discard_user(user.id)
+
+    async def on_after_delete(
+            self,
+            user: User,
+            request: Optional[Request] = None
+    ) -> None:
+        user_cache.discard_user(user.id)
+
     # async def on_after_register(
     #         self, user: User, request: Optional[Request] = None
     # ):
@@ -124,5 +287,27 @@ fastapi_users = FastAPIUsers(
     [auth_backend]
 )
 
+
+async def get_superuser_by_token(token: str) -> Optional[User]:
+    """
+    Получает активного суперпользователя по JWT-токену вне зависимостей
+    FastAPI, например в middleware.
+
+    Args:
+        token (str): JWT-токен.
+
+    Returns:
+        Optional[User]: Суперпользователь или None, если токен
+            недействителен или пользователь не активный суперпользователь.
+    """
+    async with async_session() as session:
+        user = await get_jwt_strategy().read_token(
+            token, UserManager(SQLAlchemyUserDatabase(session, User))
+        )
+    if user is None or not user.is_active or not user.is_superuser:
+        return None
+    return user
+
+
 current_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
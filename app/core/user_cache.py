@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class UserCache:
+    """
+    Кэш проверенных JWT-токенов и записей пользователей.
+
+    Токен хранится вместе с идентификатором пользователя и временем,
+    до которого ему можно доверять без повторной проверки: не позже
+    истечения токена и не дольше ttl секунд. Запись пользователя
+    хранится отдельно и удаляется при любом его изменении, поэтому
+    все токены пользователя сразу видят новые is_active и is_superuser.
+    Оба словаря ограничены max_size элементами и вытесняют
+    давно не использованные элементы.
+
+    Attributes:
+        enabled (bool): Использовать ли кэш.
+        max_size (int): Максимальное число токенов и пользователей.
+        ttl (float): Максимальное время жизни элемента в секундах.
+        hits (int): Число токенов, принятых без обращения к базе данных.
+        misses (int): Число токенов, потребовавших проверки.
+        generation (int): Счетчик изменений пользователей, позволяет
+            не сохранять запись, прочитанную одновременно с ее изменением.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = False,
+            max_size: int = 10_000,
+            ttl: float = 60
+    ):
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._tokens: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._users: OrderedDict[int, tuple[dict, float]] = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Получает значения столбцов пользователя по токену.
+
+        Args:
+            token (str): JWT-токен.
+
+        Returns:
+            Optional[dict]: Значения столбцов пользователя или None,
+                если токен или пользователь не закэшированы или устарели.
+        """
+        now = time.time()
+        entry = self._tokens.get(token)
+        if entry is None or entry[1] <= now:
+            self._tokens.pop(token, None)
+            self.misses += 1
+            return None
+        user = self._users.get(entry[0])
+        if user is None or user[1] <= now:
+            self._users.pop(entry[0], None)
+            self.misses += 1
+            return None
+        self._tokens.move_to_end(token)
+        self._users.move_to_end(entry[0])
+        self.hits += 1
+        return user[0]
+
+    def store(
+            self,
+            token: str,
+            expires_at: float,
+            user: dict,
+            generation: int
+    ) -> None:
+        """
+        Сохраняет проверенный токен и запись пользователя.
+
+        Args:
+            token (str): JWT-токен.
+            expires_at (float): Время истечения токена (Unix time).
+            user (dict): Значения столбцов пользователя.
+            generation (int): Значение generation на момент чтения пользователя.
+        """
+        if not self.enabled or generation != self.generation:
+            return
+        deadline = time.time() + self.ttl
+        self._tokens[token] = (user['id'], min(expires_at, deadline))
+        self._tokens.move_to_end(token)
+        self._users[user['id']] = (user, deadline)
+        self._users.move_to_end(user['id'])
+        for entries in (self._tokens, self._users):
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def discard_user(self, user_id: int) -> None:
+        self.generation += 1
+        self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._tokens.clear()
+        self._users.clear()
+
+
+user_cache = UserCache(
+    settings.user_cache_enabled,
+    settings.user_cache_size,
+    settings.user_cache_ttl
+)
@@ -1,13 +1,16 @@
-from typing import Generic, Sequence, Optional, Type, TypeVar
+from collections import namedtuple
+from typing import Any, Generic, Sequence, Optional, Type, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
-
-from sqlalchemy import select
+from sqlalchemy import (ColumnElement, Select, delete, insert, select,
+                        tuple_, update)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from pydantic import BaseModel
 
 from app.core.db import Base
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.pipeline import commit_or_defer
 from app.models import User
 
 ModelType = TypeVar('ModelType', bound=Base)
@@ -19,8 +22,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Базовый класс для операций CRUD.
 
+    Методы чтения с rows=True выбирают только столбцы таблицы
+    и возвращают легкие строки вместо объектов модели: без карты
+    идентичности, инструментирования атрибутов и связи с сессией.
+    Строки поддерживают доступ к столбцам по имени атрибута
+    и предназначены только для ответа клиенту.
+
     Attributes:
         model (Type[ModelType]): Модель базы данных.
+        row_type (type): Именованный кортеж со столбцами таблицы модели
+            в том же порядке, что и строки запросов с rows=True.
     """
 
     def __init__(
@@ -28,11 +39,41 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: Type[ModelType]
     ):
         self.model = model
+        self.row_type = namedtuple(
+            f'{model.__name__}Row',
+            [column.key for column in model.__table__.columns]
+        )
+
+    def select_rows(self) -> Select:
+        """
+        Получает запрос столбцов таблицы модели без загрузки объектов.
+        """
+        return select(*self.model.__table__.columns)
+
+    def select_read(self, rows: bool = False) -> Select:
+        """
+        Получает запрос объектов модели или, при rows=True, ее столбцов.
+        """
+        return self.select_rows() if rows else select(self.model)
+
+    @staticmethod
+    async def fetch_all(
+            stmt: Select,
+            session: AsyncSession,
+            rows: bool = False
+    ) -> Sequence[Union[ModelType, Any]]:
+        """
+        Выполняет запрос select_read и получает объекты модели или строки.
+        """
+        if rows:
+            return (await session.execute(stmt)).all()
+        return (await session.scalars(stmt)).all()
 
     async def get(
             self,
             obj_id: int,
-            session: AsyncSession
+            session: AsyncSession,
+            for_update: bool = False
     ) -> Optional[ModelType]:
         """
         Получает объект по его идентификатору.
@@ -40,28 +81,132 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Args:
             obj_id (int): Идентификатор объекта.
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            for_update (bool, optional): Заблокировать строку до конца транзакции (SELECT ... FOR UPDATE) и перечитать ее, даже если объект уже загружен в сессию.
 
         Returns:
             Optional[ModelType]: Найденный объект или None, если не найден.
         """
-        db_obj = await session.get(self.model, obj_id)
+        db_obj = await session.get(
+            self.model, obj_id,
+            with_for_update=for_update, populate_existing=for_update
+        )
         return db_obj
 
     async def get_multi(
             self,
-            session: AsyncSession
-    ) -> Sequence[ModelType]:
+            session: AsyncSession,
+            rows: bool = False
+    ) -> Sequence[Union[ModelType, Any]]:
         """
         Получает список всех объектов модели.
 
         Args:
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
+
+        Returns:
+            Sequence[Union[ModelType, Any]]: Список всех объектов модели
+                или строк.
+        """
+        return await self.fetch_all(self.select_read(rows), session, rows)
+
+    async def get_page(
+            self,
+            session: AsyncSession,
+            limit: int,
+            cursor: Optional[str] = None,
+            rows: bool = False
+    ) -> tuple[Sequence[Union[ModelType, Any]], Optional[str]]:
+        """
+        Получает страницу объектов модели в порядке идентификаторов.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            limit (int): Максимальное число объектов на странице.
+            cursor (Optional[str], optional): Курсор предыдущей страницы.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
 
         Returns:
-            Sequence[ModelType]: Список всех объектов модели.
+            tuple[Sequence[Union[ModelType, Any]], Optional[str]]: Объекты
+                или строки страницы и курсор следующей страницы или None,
+                если она последняя.
         """
-        db_objs = await session.scalars(select(self.model))
-        return db_objs.all()
+        return await self.paginate(
+            self.select_read(rows), session, limit, cursor, rows=rows
+        )
+
+    async def paginate(
+            self,
+            stmt: Select,
+            session: AsyncSession,
+            limit: int,
+            cursor: Optional[str] = None,
+            order_by: Optional[Sequence[InstrumentedAttribute]] = None,
+            rows: bool = False
+    ) -> tuple[Sequence[Union[ModelType, Any]], Optional[str]]:
+        """
+        Выполняет запрос постранично по ключу сортировки (keyset).
+
+        Страница начинается сразу после ключа из курсора, поэтому запрос
+        читает только строки самой страницы по индексу ключа независимо
+        от того, насколько далеко пролистан список. Ключ должен быть
+        уникальным, поэтому последним столбцом в нем идет id.
+
+        Args:
+            stmt (Select): Запрос объектов модели или столбцов при rows=True.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            limit (int): Максимальное число объектов на странице.
+            cursor (Optional[str], optional): Курсор предыдущей страницы.
+            order_by (Optional[Sequence[InstrumentedAttribute]], optional): Столбцы ключа сортировки, по умолчанию id.
+            rows (bool, optional): Вернуть строки результата
+                вместо объектов модели.
+
+        Returns:
+            tuple[Sequence[Union[ModelType, Any]], Optional[str]]:
+                Объекты или строки страницы
+                и курсор следующей страницы или None, если она последняя.
+
+        Raises:
+            InvalidCursorError: Если курсор не соответствует ключу сортировки.
+        """
+        columns = order_by or (self.model.id,)
+        if cursor is not None:
+            after = decode_cursor(cursor, columns)
+            stmt = stmt.where(
+                tuple_(*columns) > tuple_(*after)
+                if len(columns) > 1 else columns[0] > after[0]
+            )
+        db_objs = await self.fetch_all(
+            stmt.order_by(*columns).limit(limit + 1), session, rows
+        )
+        if len(db_objs) <= limit:
+            return db_objs, None
+        db_objs = db_objs[:limit]
+        return db_objs, encode_cursor(
+            [getattr(db_objs[-1], column.key) for column in columns]
+        )
+
+    def _prepare_create_data(
+            self,
+            obj_in: CreateSchemaType,
+            user: Optional[User] = None
+    ) -> dict:
+        """
+        Подготавливает значения столбцов для создания объекта модели.
+
+        Args:
+            obj_in (CreateSchemaType): Данные для создания объекта.
+            user (Optional[User], optional): Пользователь, создающий объект.
+
+        Returns:
+            dict: Значения столбцов новой строки.
+        """
+        obj_in_data = obj_in.model_dump()
+        if user is not None:
+            obj_in_data['user_id'] = user.id
+        return obj_in_data
 
     async def create(
             self,
@@ -72,6 +217,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Создает новый объект модели в базе данных.
 
+        Строка вставляется запросом INSERT ... RETURNING, поэтому
+        объект заполняется значениями, сгенерированными базой данных,
+        без повторного чтения.
+
         Args:
             obj_in (CreateSchemaType): Данные для создания объекта.
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
@@ -80,15 +229,75 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             ModelType: Созданный объект модели.
         """
-        obj_in_data = obj_in.model_dump()
-        if user is not None:
-            obj_in_data['user_id'] = user.id
-        db_obj = self.model(**obj_in_data)
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        db_obj = await session.scalar(
+            insert(self.model)
+            .values(self._prepare_create_data(obj_in, user))
+            .returning(self.model)
+        )
+        await commit_or_defer(session)
         return db_obj
 
+    async def create_many(
+            self,
+            objs_in: Sequence[CreateSchemaType],
+            session: AsyncSession,
+            user: Optional[User] = None
+    ) -> Sequence[ModelType]:
+        """
+        Создает несколько объектов модели одним запросом INSERT ... RETURNING
+        в одной транзакции.
+
+        Args:
+            objs_in (Sequence[CreateSchemaType]): Данные для создания объектов.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            user (Optional[User], optional): Пользователь, создающий объекты.
+
+        Returns:
+            Sequence[ModelType]: Созданные объекты модели в порядке входных данных.
+        """
+        objs_in_data = [
+            self._prepare_create_data(obj_in, user) for obj_in in objs_in
+        ]
+        db_objs = await session.scalars(
+            insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            ),
+            objs_in_data
+        )
+        db_objs = db_objs.all()
+        for db_obj in db_objs:
+            session.expunge(db_obj)
+        await commit_or_defer(session)
+        return db_objs
+
+    def _prepare_update_data(
+            self,
+            db_obj: ModelType,
+            obj_in: UpdateSchemaType
+    ) -> dict:
+        """
+        Подготавливает значения столбцов для обновления объекта модели.
+
+        Args:
+            db_obj (ModelType): Существующий объект модели.
+            obj_in (UpdateSchemaType): Новые данные для обновления.
+
+        Returns:
+            dict: Значения изменяемых столбцов.
+        """
+        return self._get_column_values(obj_in)
+
+    def _get_column_values(self, obj_in: BaseModel) -> dict:
+        """
+        Получает заданные поля схемы, соответствующие столбцам модели.
+        """
+        columns = self.model.__table__.columns
+        return {
+            field: value
+            for field, value in obj_in.model_dump(exclude_unset=True).items()
+            if field in columns
+        }
+
     async def update(
             self,
             db_obj: ModelType,
@@ -98,6 +307,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Обновляет существующий объект модели в базе данных.
 
+        Строка обновляется запросом UPDATE ... RETURNING, который
+        сразу обновляет и загруженный в сессию объект.
+
         Args:
             db_obj (ModelType): Существующий объект модели.
             obj_in (UpdateSchemaType): Новые данные для обновления.
@@ -106,16 +318,79 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             ModelType: Обновленный объект модели.
         """
-        db_obj_data = jsonable_encoder(obj_in)
-        obj_in_data = obj_in.model_dump(exclude_unset=True)
-        for field in db_obj_data:
-            if field in obj_in_data:
-                setattr(db_obj, field, obj_in_data[field])
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        obj_in_data = self._prepare_update_data(db_obj, obj_in)
+        if obj_in_data:
+            db_obj = await session.scalar(
+                update(self.model)
+                .where(self.model.id == db_obj.id)
+                .values(obj_in_data)
+                .returning(self.model)
+            )
+        await commit_or_defer(session)
         return db_obj
 
+    async def update_many(
+            self,
+            obj_in: BaseModel,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[ModelType], int]:
+        """
+        Обновляет все объекты модели, подходящие под условия,
+        одним запросом UPDATE в одной транзакции.
+
+        Args:
+            obj_in (BaseModel): Новые значения столбцов, одинаковые
+                для всех объектов, учитываются только заданные поля.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            *where (ColumnElement[bool]): Условия отбора объектов.
+            returning (bool, optional): Вернуть обновленные объекты (UPDATE ... RETURNING) вместо их числа.
+
+        Returns:
+            Union[Sequence[ModelType], int]: Обновленные объекты
+                или их число, если returning=False.
+        """
+        obj_in_data = self._get_column_values(obj_in)
+        stmt = update(self.model).where(*where).values(obj_in_data)
+        if returning:
+            db_objs = (await session.scalars(
+                stmt.returning(self.model)
+            )).all()
+        else:
+            db_objs = (await session.execute(stmt)).rowcount
+        await commit_or_defer(session)
+        return db_objs
+
+    async def remove_many(
+            self,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[ModelType], int]:
+        """
+        Удаляет все объекты модели, подходящие под условия,
+        одним запросом DELETE в одной транзакции.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            *where (ColumnElement[bool]): Условия отбора объектов.
+            returning (bool, optional): Вернуть удаленные объекты (DELETE ... RETURNING) вместо их числа.
+
+        Returns:
+            Union[Sequence[ModelType], int]: Удаленные объекты
+                или их число, если returning=False.
+        """
+        stmt = delete(self.model).where(*where)
+        if returning:
+            db_objs = (await session.scalars(
+                stmt.returning(self.model)
+            )).all()
+        else:
+            db_objs = (await session.execute(stmt)).rowcount
+        await commit_or_defer(session)
+        return db_objs
+
     async def remove(
             self,
             db_obj: ModelType,
@@ -132,5 +407,5 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             ModelType: Удаленный объект модели.
         """
         await session.delete(db_obj)
-        await session.commit()
+        await commit_or_defer(session)
         return db_obj
@@ -1,10 +1,22 @@
-from typing import Optional
+import datetime as dt
+from functools import partial
+from typing import Iterable, Optional, Sequence, Union
 
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.pipeline import call_after_commit
+from app.core.room_cache import MeetingRoomSnapshot, meeting_room_cache
+from app.core.schedule import reservation_index
+from app.core.timeline import get_window_slots, is_free, occupancy_timeline
 from app.crud.base import CRUDBase
+from app.crud.reservation import reservation_crud
 from app.models.meeting_room import MeetingRoom
+from app.models.reservation import Reservation
+from app.models import User
 from app.schemas.meeting_room import MeetingRoomCreate, MeetingRoomUpdate
 
 
@@ -15,8 +27,187 @@ class CRUDMeetingRoom(CRUDBase[
 ]):
     """
     Класс для операций CRUD с моделью MeetingRoom.
+
+    Если кэш переговорных комнат включен, чтения без блокировки строк
+    обслуживаются снимком из meeting_room_cache, а записи обновляют
+    его после фиксации транзакции.
     """
 
+    async def get(
+            self,
+            obj_id: int,
+            session: AsyncSession,
+            for_update: bool = False
+    ) -> Optional[MeetingRoom]:
+        if for_update or not meeting_room_cache.enabled:
+            return await super().get(obj_id, session, for_update)
+        room = (await self.get_snapshot(session)).by_id.get(obj_id)
+        if room is None:
+            return None
+        db_obj = MeetingRoom(**room)
+        make_transient_to_detached(db_obj)
+        return await session.merge(db_obj, load=False)
+
+    async def get_multi(
+            self,
+            session: AsyncSession,
+            rows: bool = False
+    ) -> Sequence[Union[MeetingRoom, tuple]]:
+        if not meeting_room_cache.enabled:
+            return await super().get_multi(session, rows)
+        snapshot = await self.get_snapshot(session)
+        room_type = self.row_type if rows else MeetingRoom
+        return [
+            room_type(**snapshot.by_id[room_id]) for room_id in snapshot.ids
+        ]
+
+    async def get_page(
+            self,
+            session: AsyncSession,
+            limit: int,
+            cursor: Optional[str] = None,
+            rows: bool = False
+    ) -> tuple[Sequence[Union[MeetingRoom, tuple]], Optional[str]]:
+        if not meeting_room_cache.enabled:
+            return await super().get_page(session, limit, cursor, rows)
+        after = None
+        if cursor is not None:
+            after, = decode_cursor(cursor, (MeetingRoom.id,))
+        rooms, has_next = (await self.get_snapshot(session)).get_page(
+            limit, after
+        )
+        next_cursor = encode_cursor([rooms[-1]['id']]) if has_next else None
+        room_type = self.row_type if rows else MeetingRoom
+        return [room_type(**room) for room in rooms], next_cursor
+
+    async def create(
+            self,
+            obj_in: MeetingRoomCreate,
+            session: AsyncSession,
+            user: Optional[User] = None
+    ) -> MeetingRoom:
+        db_obj = await super().create(obj_in, session, user)
+        call_after_commit(
+            session, partial(meeting_room_cache.put, self.to_dict(db_obj))
+        )
+        return db_obj
+
+    async def create_many(
+            self,
+            objs_in: Sequence[MeetingRoomCreate],
+            session: AsyncSession,
+            user: Optional[User] = None
+    ) -> Sequence[MeetingRoom]:
+        db_objs = await super().create_many(objs_in, session, user)
+        for db_obj in db_objs:
+            call_after_commit(
+                session, partial(meeting_room_cache.put, self.to_dict(db_obj))
+            )
+        return db_objs
+
+    async def update(
+            self,
+            db_obj: MeetingRoom,
+            obj_in: MeetingRoomUpdate,
+            session: AsyncSession
+    ) -> MeetingRoom:
+        db_obj = await super().update(db_obj, obj_in, session)
+        call_after_commit(
+            session, partial(meeting_room_cache.put, self.to_dict(db_obj))
+        )
+        return db_obj
+
+    async def update_many(
+            self,
+            obj_in: BaseModel,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[MeetingRoom], int]:
+        db_objs = await super().update_many(obj_in, session, *where)
+        for db_obj in db_objs:
+            call_after_commit(
+                session, partial(meeting_room_cache.put, self.to_dict(db_obj))
+            )
+        return db_objs if returning else len(db_objs)
+
+    async def remove_many(
+            self,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[MeetingRoom], int]:
+        """
+        Удаляет комнаты, подходящие под условия, вместе с их
+        бронированиями в одной транзакции.
+
+        Запрос DELETE не выполняет каскадное удаление связи reservations,
+        поэтому бронирования удаляются отдельным запросом перед комнатами.
+        """
+        await session.execute(delete(Reservation).where(
+            Reservation.meetingroom_id.in_(
+                select(MeetingRoom.id).where(*where)
+            )
+        ))
+        db_objs = await super().remove_many(session, *where)
+        for db_obj in db_objs:
+            reservation_index.discard_room(db_obj.id)
+            occupancy_timeline.discard_room(db_obj.id)
+            call_after_commit(
+                session, partial(meeting_room_cache.discard, db_obj.id)
+            )
+        return db_objs if returning else len(db_objs)
+
+    async def remove(
+            self,
+            db_obj: MeetingRoom,
+            session: AsyncSession
+    ) -> MeetingRoom:
+        room_id = db_obj.id
+        db_obj = await super().remove(db_obj, session)
+        reservation_index.discard_room(room_id)
+        occupancy_timeline.discard_room(room_id)
+        call_after_commit(
+            session, partial(meeting_room_cache.discard, room_id)
+        )
+        return db_obj
+
+    async def get_snapshot(
+            self,
+            session: AsyncSession
+    ) -> MeetingRoomSnapshot:
+        """
+        Получает снимок всех комнат из кэша или загружает его
+        одним запросом.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            MeetingRoomSnapshot: Снимок переговорных комнат.
+        """
+        snapshot = meeting_room_cache.get()
+        if snapshot is None:
+            generation = meeting_room_cache.generation
+            rooms = await session.execute(select(
+                MeetingRoom.id, MeetingRoom.name, MeetingRoom.description
+            ))
+            snapshot = meeting_room_cache.store(
+                rooms.mappings().all(), generation
+            )
+        return snapshot
+
+    @staticmethod
+    def to_dict(db_obj: MeetingRoom) -> dict:
+        """
+        Получает значения столбцов комнаты для кэша.
+        """
+        return {
+            'id': db_obj.id,
+            'name': db_obj.name,
+            'description': db_obj.description,
+        }
+
     async def get_room_id_by_name(
             self,
             room_name: str,
@@ -32,10 +223,127 @@ class CRUDMeetingRoom(CRUDBase[
         Returns:
             Optional[int]: Идентификатор найденной комнаты или None, если комната не найдена.
         """
+        if meeting_room_cache.enabled:
+            snapshot = await self.get_snapshot(session)
+            return snapshot.id_by_name.get(room_name)
         db_room_id = await session.scalar(
             select(MeetingRoom.id).where(MeetingRoom.name == room_name)
         )
         return db_room_id
 
+    async def get_existing_names(
+            self,
+            room_names: Iterable[str],
+            session: AsyncSession
+    ) -> set[str]:
+        """
+        Получает названия существующих комнат из заданного набора.
+
+        Args:
+            room_names (Iterable[str]): Названия комнат.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            set[str]: Названия комнат, которые есть в базе данных.
+        """
+        if meeting_room_cache.enabled:
+            snapshot = await self.get_snapshot(session)
+            return set(room_names) & snapshot.id_by_name.keys()
+        db_room_names = await session.scalars(
+            select(MeetingRoom.name).where(MeetingRoom.name.in_(
+                set(room_names)
+            ))
+        )
+        return set(db_room_names.all())
+
+    async def get_existing_ids(
+            self,
+            room_ids: Iterable[int],
+            session: AsyncSession,
+            for_update: bool = False
+    ) -> set[int]:
+        """
+        Получает идентификаторы существующих комнат из заданного набора.
+
+        Args:
+            room_ids (Iterable[int]): Идентификаторы комнат.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            for_update (bool, optional): Заблокировать строки комнат до конца транзакции.
+
+        Returns:
+            set[int]: Идентификаторы комнат, которые есть в базе данных.
+        """
+        if meeting_room_cache.enabled and not for_update:
+            snapshot = await self.get_snapshot(session)
+            return set(room_ids) & snapshot.by_id.keys()
+        stmt = select(MeetingRoom.id).where(MeetingRoom.id.in_(set(room_ids)))
+        if for_update:
+            stmt = stmt.order_by(MeetingRoom.id).with_for_update()
+        db_room_ids = await session.scalars(stmt)
+        return set(db_room_ids.all())
+
+    async def get_available(
+            self,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            session: AsyncSession,
+            rows: bool = False
+    ) -> Sequence[Union[MeetingRoom, tuple]]:
+        """
+        Получает комнаты, свободные в указанный период.
+
+        Если кэш битовых карт занятости включен и период укладывается
+        в один день, комнаты, у которых свободны все слоты периода
+        в картах за этот день, считаются свободными без проверки
+        бронирований. Карта отмечает слот целиком, даже если он занят
+        лишь частично, поэтому остальные комнаты проверяются точно,
+        как и без кэша. Если загружен индекс бронирований,
+        занятость проверяется по нему. Иначе одиночные бронирования
+        отсекаются одним запросом с NOT EXISTS, а серии, пересекающие
+        период, разворачиваются в его пределах.
+
+        Args:
+            from_reserve (dt.datetime): Начало периода.
+            to_reserve (dt.datetime): Окончание периода.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
+
+        Returns:
+            Sequence[Union[MeetingRoom, tuple]]: Список свободных комнат.
+        """
+        slots = get_window_slots(from_reserve, to_reserve)
+        if occupancy_timeline.enabled and slots is not None:
+            rooms = await self.get_multi(session, rows)
+            bitmaps = await reservation_crud.get_timelines(
+                [room.id for room in rooms], from_reserve.date(), session
+            )
+            free_ids = {
+                room.id for room in rooms if is_free(bitmaps[room.id], *slots)
+            }
+            busy_ids = await reservation_crud.get_busy_room_ids(
+                [room.id for room in rooms if room.id not in free_ids],
+                from_reserve, to_reserve, session
+            ) if len(free_ids) < len(rooms) else set()
+            return [room for room in rooms if room.id not in busy_ids]
+        if reservation_index.ready:
+            busy_ids = reservation_index.get_busy_room_ids(
+                from_reserve, to_reserve
+            )
+            rooms = await self.get_multi(session, rows)
+            return [room for room in rooms if room.id not in busy_ids]
+        rooms = await self.fetch_all(self.select_read(rows).where(
+            ~select(Reservation.id).where(
+                Reservation.meetingroom_id == MeetingRoom.id,
+                Reservation.repeat_frequency.is_(None),
+                Reservation.from_reserve <= to_reserve,
+                Reservation.to_reserve >= from_reserve
+            ).exists()
+        ), session, rows)
+        busy_ids = await reservation_crud.get_rooms_busy_with_series(
+            from_reserve, to_reserve, session
+        )
+        return [room for room in rooms if room.id not in busy_ids]
+
 
 meeting_room_crud = CRUDMeetingRoom(MeetingRoom)
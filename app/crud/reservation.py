@@ -1,11 +1,21 @@
 import datetime as dt
-from typing import Sequence, Optional
+from functools import partial
+from typing import AsyncIterator, Sequence, Optional, Union
 
-from sqlalchemy import select, and_
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, delete, insert, select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.export import EXPORT_CHUNK_SIZE, EXPORT_COLUMNS
+from app.core.pipeline import call_after_commit, commit_or_defer
+from app.core.recurrence import (expand, find_overlaps, get_series,
+                                 get_step, to_datetimes)
+from app.core.schedule import ReservationIndex, reservation_index
+from app.core.timeline import BITMAP_SIZE, DAY, mark, occupancy_timeline
 from app.crud.base import CRUDBase
 from app.models.reservation import Reservation
+from app.models.reservation_archive import ReservationArchive
 from app.schemas.reservation import ReservationCreate, ReservationUpdate
 from app.models import User
 
@@ -19,6 +29,246 @@ class CRUDReservation(CRUDBase[
     Класс для операций CRUD с моделью Reservation.
     """
 
+    def _prepare_create_data(
+            self,
+            obj_in: ReservationCreate,
+            user: Optional[User] = None
+    ) -> dict:
+        obj_in_data = super()._prepare_create_data(obj_in, user)
+        step, count = get_series(
+            obj_in.from_reserve, obj_in_data.pop('recurrence')
+        )
+        obj_in_data.update(
+            repeat_frequency=None,
+            repeat_interval=None,
+            repeat_count=None,
+            last_to_reserve=obj_in.to_reserve
+        )
+        if step is not None:
+            obj_in_data.update(
+                repeat_frequency=obj_in.recurrence.frequency,
+                repeat_interval=obj_in.recurrence.interval,
+                repeat_count=count,
+                last_to_reserve=obj_in.to_reserve + (count - 1) * step
+            )
+        return obj_in_data
+
+    def _prepare_update_data(
+            self,
+            db_obj: Reservation,
+            obj_in: ReservationUpdate
+    ) -> dict:
+        obj_in_data = super()._prepare_update_data(db_obj, obj_in)
+        obj_in_data['last_to_reserve'] = obj_in.to_reserve
+        if db_obj.repeat_step is not None:
+            obj_in_data['last_to_reserve'] += (
+                (db_obj.repeat_count - 1) * db_obj.repeat_step
+            )
+        return obj_in_data
+
+    async def create(
+            self,
+            obj_in: ReservationCreate,
+            session: AsyncSession,
+            user: Optional[User] = None
+    ) -> Reservation:
+        db_obj = await super().create(obj_in, session, user)
+        reservation_index.add(db_obj)
+        call_after_commit(session, partial(
+            occupancy_timeline.add,
+            db_obj.meetingroom_id, self.get_periods(db_obj)
+        ))
+        return db_obj
+
+    async def create_many(
+            self,
+            objs_in: Sequence[ReservationCreate],
+            session: AsyncSession,
+            user: Optional[User] = None
+    ) -> Sequence[Reservation]:
+        db_objs = await super().create_many(objs_in, session, user)
+        for db_obj in db_objs:
+            reservation_index.add(db_obj)
+            call_after_commit(session, partial(
+                occupancy_timeline.add,
+                db_obj.meetingroom_id, self.get_periods(db_obj)
+            ))
+        return db_objs
+
+    async def update(
+            self,
+            db_obj: Reservation,
+            obj_in: ReservationUpdate,
+            session: AsyncSession
+    ) -> Reservation:
+        meetingroom_id = db_obj.meetingroom_id
+        periods = self.get_periods(db_obj)
+        db_obj = await super().update(db_obj, obj_in, session)
+        reservation_index.add(db_obj)
+        call_after_commit(session, partial(
+            occupancy_timeline.discard, meetingroom_id, periods
+        ))
+        call_after_commit(session, partial(
+            occupancy_timeline.add,
+            db_obj.meetingroom_id, self.get_periods(db_obj)
+        ))
+        return db_obj
+
+    async def update_many(
+            self,
+            obj_in: BaseModel,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[Reservation], int]:
+        """
+        Переназначает бронирования, подходящие под условия, другому
+        пользователю одним запросом UPDATE.
+
+        Изменять можно только user_id: время бронирований определяет
+        last_to_reserve, повторения и занятость комнат, которые
+        пакетное обновление не пересчитывает.
+
+        Raises:
+            ValueError: Если obj_in изменяет другие столбцы.
+        """
+        columns = self._get_column_values(obj_in).keys() - {'user_id'}
+        if columns:
+            raise ValueError(
+                f'Пакетно можно изменить только user_id: {sorted(columns)}'
+            )
+        # Строки нужны индексу бронирований, даже если вызывающему
+        # достаточно их числа.
+        fetch = returning or reservation_index.ready
+        result = await super().update_many(
+            obj_in, session, *where, returning=fetch
+        )
+        if not fetch:
+            return result
+        for db_obj in result:
+            reservation_index.add(db_obj)
+        return result if returning else len(result)
+
+    async def remove_many(
+            self,
+            session: AsyncSession,
+            *where: ColumnElement[bool],
+            returning: bool = True
+    ) -> Union[Sequence[Reservation], int]:
+        db_objs = await super().remove_many(session, *where)
+        for db_obj in db_objs:
+            reservation_index.discard(db_obj.id)
+            call_after_commit(session, partial(
+                occupancy_timeline.discard,
+                db_obj.meetingroom_id, self.get_periods(db_obj)
+            ))
+        return db_objs if returning else len(db_objs)
+
+    async def remove(
+            self,
+            db_obj: Reservation,
+            session: AsyncSession
+    ) -> Reservation:
+        reservation_id, meetingroom_id = db_obj.id, db_obj.meetingroom_id
+        periods = self.get_periods(db_obj)
+        db_obj = await super().remove(db_obj, session)
+        reservation_index.discard(reservation_id)
+        call_after_commit(session, partial(
+            occupancy_timeline.discard, meetingroom_id, periods
+        ))
+        return db_obj
+
+    async def archive(
+            self,
+            session: AsyncSession,
+            before: dt.datetime,
+            after_id: int = 0,
+            limit: int = 1000
+    ) -> Sequence[tuple]:
+        """
+        Переносит в архив порцию бронирований, закончившихся до before.
+
+        Бронирования выбираются по возрастанию идентификатора после
+        after_id, удаляются из reservation и копируются
+        в reservation_archive в одной транзакции. Для серии учитывается
+        окончание последнего повторения. Условие на окончание повторяется
+        в самом DELETE, а в архив попадают строки из его RETURNING:
+        бронирование, которое параллельно перенесли в будущее, не будет
+        удалено, а в архиве не окажутся устаревшие значения.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            before (dt.datetime): Граница окончания переносимых бронирований.
+            after_id (int, optional): Идентификатор, после которого
+                начинается порция.
+            limit (int, optional): Максимальное число бронирований в порции.
+
+        Returns:
+            Sequence[tuple]: Перенесенные бронирования в порядке
+                возрастания идентификатора.
+        """
+        ids = select(Reservation.id).where(
+            Reservation.last_to_reserve < before,
+            Reservation.id > after_id
+        ).order_by(Reservation.id).limit(limit)
+        reservations = sorted(
+            (await session.execute(
+                delete(Reservation).where(
+                    Reservation.id.in_(ids.scalar_subquery()),
+                    Reservation.last_to_reserve < before
+                ).returning(*Reservation.__table__.columns)
+            )).all(),
+            key=lambda reservation: reservation.id
+        )
+        if not reservations:
+            return reservations
+        archived_at = dt.datetime.now()
+        await session.execute(insert(ReservationArchive), [
+            {
+                **{
+                    'reservation_id' if column == 'id' else column: value
+                    for column, value in reservation._asdict().items()
+                },
+                'archived_at': archived_at,
+            }
+            for reservation in reservations
+        ])
+        await commit_or_defer(session)
+        for reservation in reservations:
+            reservation_index.discard(reservation.id)
+            call_after_commit(session, partial(
+                occupancy_timeline.discard, reservation.meetingroom_id,
+                [(reservation.from_reserve, reservation.last_to_reserve)]
+            ))
+        return reservations
+
+    @staticmethod
+    def get_criteria(
+            ids: Optional[Sequence[int]] = None,
+            user_id: Optional[int] = None,
+            meetingroom_id: Optional[int] = None
+    ) -> list[ColumnElement[bool]]:
+        """
+        Получает условия отбора бронирований для пакетных операций.
+
+        Args:
+            ids (Optional[Sequence[int]], optional): Идентификаторы бронирований.
+            user_id (Optional[int], optional): Идентификатор владельца бронирований.
+            meetingroom_id (Optional[int], optional): Идентификатор переговорной комнаты.
+
+        Returns:
+            list[ColumnElement[bool]]: Условия для заданных фильтров,
+                пустой список, если фильтры не заданы.
+        """
+        criteria = []
+        if ids is not None:
+            criteria.append(Reservation.id.in_(set(ids)))
+        if user_id is not None:
+            criteria.append(Reservation.user_id == user_id)
+        if meetingroom_id is not None:
+            criteria.append(Reservation.meetingroom_id == meetingroom_id)
+        return criteria
+
     async def get_reservations_at_the_same_time(
             self,
             *,
@@ -26,79 +276,516 @@ class CRUDReservation(CRUDBase[
             to_reserve: dt.datetime,
             meetingroom_id: int,
             reservation_id: Optional[int] = None,
+            recurrence: Optional[dict] = None,
             session:  AsyncSession
     ) -> Sequence[Reservation]:
         """
         Получает бронирования, происходящие в указанный период времени.
 
+        Если приложение запущено в одном процессе и индекс бронирований
+        загружен, проверка выполняется по нему без обращения к базе
+        данных, иначе запросом к базе данных: индекс не видит
+        бронирований, созданных другими процессами сервера. Для серии
+        все повторения проверяются против бронирований комнаты за один
+        векторизованный проход.
+
         Args:
             from_reserve (dt.datetime): Время начала бронирования.
             to_reserve (dt.datetime): Время окончания бронирования.
             meetingroom_id (int): Идентификатор переговорной комнаты.
             reservation_id (Optional[int], optional): Идентификатор бронирования (для исключения при поиске).
+            recurrence (Optional[dict], optional): Правило повторения бронирования.
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
         Returns:
             Sequence[Reservation]: Список бронирований, происходящих в указанный период.
         """
-        stmt = select(Reservation).where(
-            and_(
-                Reservation.meetingroom_id == meetingroom_id,
-                Reservation.from_reserve <= to_reserve,
-                Reservation.to_reserve >= from_reserve
+        step, count = get_series(from_reserve, recurrence)
+        last_to_reserve = to_reserve
+        if step is not None:
+            last_to_reserve += (count - 1) * step
+        if reservation_index.checks_writes:
+            reservations = reservation_index.find_overlapping(
+                from_reserve=from_reserve,
+                to_reserve=last_to_reserve,
+                meetingroom_id=meetingroom_id,
+                reservation_id=reservation_id
             )
-        )
-        if reservation_id is not None:
+        else:
             stmt = select(Reservation).where(
                 and_(
-                    Reservation.id == reservation_id,
-                    Reservation.from_reserve <= to_reserve,
-                    Reservation.to_reserve >= from_reserve
+                    Reservation.meetingroom_id == meetingroom_id,
+                    Reservation.from_reserve <= last_to_reserve,
+                    Reservation.last_to_reserve >= from_reserve
                 )
             )
-        reservations = await session.scalars(stmt)
-        return reservations.all()
+            if reservation_id is not None:
+                stmt = stmt.where(Reservation.id != reservation_id)
+            reservations = (await session.scalars(stmt)).all()
+        if step is None and all(
+            reservation.repeat_step is None for reservation in reservations
+        ):
+            return reservations
+        starts, ends = expand(from_reserve, to_reserve, step, count)
+        occurrences = self.expand_series(
+            reservations, from_reserve, last_to_reserve
+        )
+        if not occurrences:
+            return []
+        mask = find_overlaps(
+            starts, ends,
+            np.array([occurrence.from_reserve for occurrence in occurrences],
+                     dtype='datetime64[us]'),
+            np.array([occurrence.to_reserve for occurrence in occurrences],
+                     dtype='datetime64[us]')
+        )
+        return [
+            occurrence for occurrence, overlaps in zip(occurrences, mask)
+            if overlaps
+        ]
+
+    async def get_reservations_at_the_same_time_for_batch(
+            self,
+            objs_in: Sequence[ReservationCreate],
+            session: AsyncSession
+    ) -> dict[int, Sequence[Reservation]]:
+        """
+        Получает пересекающиеся бронирования для набора новых бронирований.
+
+        Если индекс бронирований проверяет записи, как
+        в get_reservations_at_the_same_time, каждый элемент проверяется
+        по нему. Иначе выполняется один запрос к базе данных,
+        выбирающий для каждой комнаты бронирования в границах периода,
+        покрытого набором, а точное сопоставление с каждым элементом
+        делается в памяти.
+
+        Args:
+            objs_in (Sequence[ReservationCreate]): Новые бронирования.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            dict[int, Sequence[Reservation]]: Пересекающиеся бронирования
+                по индексам элементов набора, у которых есть пересечения.
+        """
+        series = [
+            (obj_in,) + get_series(
+                obj_in.from_reserve,
+                obj_in.recurrence and obj_in.recurrence.model_dump()
+            )
+            for obj_in in objs_in
+        ]
+        if reservation_index.checks_writes:
+            schedules = reservation_index
+        else:
+            bounds = {}
+            for obj_in, step, count in series:
+                last_to_reserve = obj_in.to_reserve + (count - 1) * (
+                    step or dt.timedelta(0)
+                )
+                low, high = bounds.get(
+                    obj_in.meetingroom_id,
+                    (obj_in.from_reserve, last_to_reserve)
+                )
+                bounds[obj_in.meetingroom_id] = (
+                    min(low, obj_in.from_reserve),
+                    max(high, last_to_reserve)
+                )
+            reservations = await session.scalars(select(Reservation).where(
+                or_(*(
+                    and_(
+                        Reservation.meetingroom_id == room_id,
+                        Reservation.from_reserve <= high,
+                        Reservation.last_to_reserve >= low
+                    )
+                    for room_id, (low, high) in bounds.items()
+                ))
+            ))
+            schedules = ReservationIndex.from_reservations(reservations)
+        intersections = {}
+        for index, (obj_in, step, count) in enumerate(series):
+            starts, ends = map(to_datetimes, expand(
+                obj_in.from_reserve, obj_in.to_reserve, step, count
+            ))
+            found = [
+                reservation
+                for start, end in zip(starts, ends)
+                for reservation in schedules.find_overlapping(
+                    from_reserve=start,
+                    to_reserve=end,
+                    meetingroom_id=obj_in.meetingroom_id
+                )
+            ]
+            if found:
+                intersections[index] = found
+        return intersections
 
     async def get_future_reservations_for_room(
         self,
         meetingroom_id: int,
-        session: AsyncSession
-    ) -> Sequence[Reservation]:
+        session: AsyncSession,
+        from_reserve: Optional[dt.datetime] = None,
+        to_reserve: Optional[dt.datetime] = None,
+        rows: bool = False
+    ) -> Sequence[Union[Reservation, tuple]]:
         """
         Получает будущие бронирования для комнаты.
 
+        Серии разворачиваются в отдельные повторения только в пределах
+        запрошенного периода.
+
         Args:
             meetingroom_id (int): Идентификатор переговорной комнаты.
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            from_reserve (Optional[dt.datetime], optional): Начало периода, по умолчанию текущее время.
+            to_reserve (Optional[dt.datetime], optional): Окончание периода.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
 
         Returns:
-            Sequence[Reservation]: Список будущих бронирований для указанной комнаты.
+            Sequence[Union[Reservation, tuple]]: Список будущих
+                бронирований для указанной комнаты.
         """
-        reservations = await session.scalars(select(Reservation).where(
+        if from_reserve is None:
+            from_reserve = dt.datetime.now()
+        stmt = self.select_read(rows).where(
             Reservation.meetingroom_id == meetingroom_id,
-            Reservation.to_reserve > dt.datetime.now()
+            Reservation.last_to_reserve > from_reserve
+        )
+        if to_reserve is not None:
+            stmt = stmt.where(Reservation.from_reserve <= to_reserve)
+        return self.expand_series(
+            await self.fetch_all(stmt, session, rows), from_reserve, to_reserve
+        )
+
+    async def stream_export(
+            self,
+            session: AsyncSession,
+            meetingroom_id: Optional[int] = None,
+            from_reserve: Optional[dt.datetime] = None,
+            to_reserve: Optional[dt.datetime] = None
+    ) -> AsyncIterator[Sequence[Sequence]]:
+        """
+        Читает бронирования для выгрузки порциями через серверный курсор.
+
+        Объекты модели не создаются, а в памяти одновременно находится
+        не больше EXPORT_CHUNK_SIZE строк. Серии выгружаются одной строкой
+        с правилом повторения.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            meetingroom_id (Optional[int], optional): Идентификатор переговорной комнаты.
+            from_reserve (Optional[dt.datetime], optional): Начало периода.
+            to_reserve (Optional[dt.datetime], optional): Окончание периода.
+
+        Yields:
+            Sequence[Sequence]: Порция строк со значениями столбцов EXPORT_COLUMNS.
+        """
+        stmt = select(
+            *(getattr(Reservation, column) for column in EXPORT_COLUMNS)
+        ).order_by(Reservation.id)
+        if meetingroom_id is not None:
+            stmt = stmt.where(Reservation.meetingroom_id == meetingroom_id)
+        if from_reserve is not None:
+            stmt = stmt.where(Reservation.last_to_reserve >= from_reserve)
+        if to_reserve is not None:
+            stmt = stmt.where(Reservation.from_reserve <= to_reserve)
+        result = await session.stream(
+            stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for chunk in result.partitions():
+            yield chunk
+
+    async def get_rooms_busy_with_series(
+            self,
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            session: AsyncSession
+    ) -> set[int]:
+        """
+        Получает идентификаторы комнат, у которых есть повторение серии
+        в указанный период.
+
+        Args:
+            from_reserve (dt.datetime): Начало периода.
+            to_reserve (dt.datetime): Окончание периода.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            set[int]: Идентификаторы занятых комнат.
+        """
+        series = await session.execute(self.select_rows().where(
+            Reservation.repeat_frequency.is_not(None),
+            Reservation.last_to_reserve >= from_reserve,
+            Reservation.from_reserve <= to_reserve
         ))
-        return reservations.all()
+        return {
+            occurrence.meetingroom_id
+            for occurrence in self.expand_series(
+                series.all(), from_reserve, to_reserve
+            )
+        }
+
+    async def get_busy_room_ids(
+            self,
+            meetingroom_ids: Sequence[int],
+            from_reserve: dt.datetime,
+            to_reserve: dt.datetime,
+            session: AsyncSession
+    ) -> set[int]:
+        """
+        Получает идентификаторы комнат из meetingroom_ids, занятых
+        в указанный период, по индексу бронирований, если он загружен,
+        или по базе данных.
+
+        Args:
+            meetingroom_ids (Sequence[int]): Идентификаторы проверяемых комнат.
+            from_reserve (dt.datetime): Начало периода.
+            to_reserve (dt.datetime): Окончание периода.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            set[int]: Идентификаторы занятых комнат.
+        """
+        if reservation_index.ready:
+            busy_ids = reservation_index.get_busy_room_ids(
+                from_reserve, to_reserve
+            )
+        else:
+            busy_ids = set((await session.scalars(
+                select(Reservation.meetingroom_id).where(
+                    Reservation.meetingroom_id.in_(meetingroom_ids),
+                    Reservation.repeat_frequency.is_(None),
+                    Reservation.from_reserve <= to_reserve,
+                    Reservation.to_reserve >= from_reserve
+                ).distinct()
+            )).all())
+            busy_ids |= await self.get_rooms_busy_with_series(
+                from_reserve, to_reserve, session
+            )
+        return busy_ids.intersection(meetingroom_ids)
+
+    async def get_timeline(
+            self,
+            meetingroom_id: int,
+            day: dt.date,
+            session: AsyncSession
+    ) -> bytes:
+        """
+        Получает битовую карту занятости комнаты за день.
+
+        Args:
+            meetingroom_id (int): Идентификатор переговорной комнаты.
+            day (dt.date): День.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            bytes: Битовая карта занятости по слотам дня.
+        """
+        bitmaps = await self.get_timelines([meetingroom_id], day, session)
+        return bitmaps[meetingroom_id]
+
+    async def get_timelines(
+            self,
+            meetingroom_ids: Sequence[int],
+            day: dt.date,
+            session: AsyncSession
+    ) -> dict[int, bytes]:
+        """
+        Получает битовые карты занятости комнат за день.
+
+        Карты берутся из кэша, а отсутствующие строятся по индексу
+        бронирований или по бронированиям этих комнат за день,
+        выбранным из базы данных одним запросом.
+
+        Args:
+            meetingroom_ids (Sequence[int]): Идентификаторы комнат.
+            day (dt.date): День.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            dict[int, bytes]: Битовые карты занятости по идентификаторам
+                комнат.
+        """
+        bitmaps = {}
+        periods = {}
+        for meetingroom_id in meetingroom_ids:
+            bitmap = occupancy_timeline.get(meetingroom_id, day)
+            if bitmap is None:
+                periods[meetingroom_id] = []
+            else:
+                bitmaps[meetingroom_id] = bitmap
+        if not periods:
+            return bitmaps
+        generation = occupancy_timeline.generation
+        day_start = dt.datetime.combine(day, dt.time())
+        if reservation_index.ready:
+            reservations = [
+                reservation
+                for meetingroom_id in periods
+                for reservation in reservation_index.find_overlapping(
+                    from_reserve=day_start,
+                    to_reserve=day_start + DAY,
+                    meetingroom_id=meetingroom_id
+                )
+            ]
+        else:
+            reservations = self.expand_series(
+                await self.fetch_all(self.select_rows().where(
+                    Reservation.meetingroom_id.in_(list(periods)),
+                    Reservation.last_to_reserve > day_start,
+                    Reservation.from_reserve <= day_start + DAY
+                ), session, rows=True),
+                day_start, day_start + DAY
+            )
+        for reservation in reservations:
+            periods[reservation.meetingroom_id].append(
+                (reservation.from_reserve, reservation.to_reserve)
+            )
+        for meetingroom_id, room_periods in periods.items():
+            bitmap = mark(bytes(BITMAP_SIZE), day, room_periods)
+            occupancy_timeline.store(meetingroom_id, day, bitmap, generation)
+            bitmaps[meetingroom_id] = bitmap
+        return bitmaps
+
+    async def get_room_id(
+            self,
+            reservation_id: int,
+            session: AsyncSession
+    ) -> Optional[int]:
+        """
+        Получает идентификатор переговорки бронирования, не загружая
+        само бронирование.
+
+        Args:
+            reservation_id (int): Идентификатор бронирования.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            Optional[int]: Идентификатор переговорки или None,
+                если бронирование не найдено.
+        """
+        return await session.scalar(
+            select(Reservation.meetingroom_id).where(
+                Reservation.id == reservation_id
+            )
+        )
 
     async def get_by_user(
             self,
             session: AsyncSession,
-            user: User
-    ) -> Sequence[Reservation]:
+            user: User,
+            rows: bool = False
+    ) -> Sequence[Union[Reservation, tuple]]:
         """
         Получает бронирования, сделанные пользователем.
 
         Args:
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
             user (User): Пользователь, чьи бронирования необходимо получить.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
+
+        Returns:
+            Sequence[Union[Reservation, tuple]]: Список бронирований,
+                сделанных указанным пользователем.
+        """
+        return await self.fetch_all(
+            self.select_read(rows).where(Reservation.user_id == user.id),
+            session, rows
+        )
+
+    async def get_page_by_user(
+            self,
+            session: AsyncSession,
+            user: User,
+            limit: int,
+            cursor: Optional[str] = None,
+            rows: bool = False
+    ) -> tuple[Sequence[Union[Reservation, tuple]], Optional[str]]:
+        """
+        Получает страницу бронирований пользователя в порядке времени начала.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            user (User): Пользователь, чьи бронирования необходимо получить.
+            limit (int): Максимальное число бронирований на странице.
+            cursor (Optional[str], optional): Курсор предыдущей страницы.
+            rows (bool, optional): Вернуть строки со столбцами
+                вместо объектов модели.
 
         Returns:
-            Sequence[Reservation]: Список бронирований, сделанных указанным пользователем.
+            tuple[Sequence[Union[Reservation, tuple]], Optional[str]]:
+                Бронирования страницы и курсор следующей страницы.
         """
-        reservations = await session.scalars(
-            select(Reservation).where(Reservation.user_id == user.id)
+        return await self.paginate(
+            self.select_read(rows).where(Reservation.user_id == user.id),
+            session, limit, cursor,
+            order_by=(Reservation.from_reserve, Reservation.id),
+            rows=rows
         )
-        return reservations.all()
+
+    @staticmethod
+    def get_periods(
+            reservation: Reservation
+    ) -> list[tuple[dt.datetime, dt.datetime]]:
+        """
+        Получает отрезки времени всех повторений бронирования.
+        """
+        if reservation.repeat_step is None:
+            return [(reservation.from_reserve, reservation.to_reserve)]
+        starts, ends = map(to_datetimes, expand(
+            reservation.from_reserve, reservation.to_reserve,
+            reservation.repeat_step, reservation.repeat_count
+        ))
+        return list(zip(starts, ends))
+
+    def expand_series(
+            self,
+            reservations: Sequence[Union[Reservation, tuple]],
+            window_from: Optional[dt.datetime] = None,
+            window_to: Optional[dt.datetime] = None
+    ) -> list[Union[Reservation, tuple]]:
+        """
+        Заменяет серии их повторениями, попадающими в указанный период.
+
+        Повторения возвращаются несвязанными с сессией объектами
+        с идентификатором и правилом повторения исходной серии,
+        а для строк, прочитанных с rows=True, - строками row_type.
+        """
+        expanded = []
+        for reservation in reservations:
+            if reservation.repeat_frequency is None:
+                expanded.append(reservation)
+                continue
+            step = get_step(
+                reservation.repeat_frequency, reservation.repeat_interval
+            )
+            starts, ends = map(to_datetimes, expand(
+                reservation.from_reserve, reservation.to_reserve, step,
+                reservation.repeat_count, window_from, window_to
+            ))
+            if not isinstance(reservation, Reservation):
+                row = self.row_type._make(reservation)
+                expanded.extend(
+                    row._replace(from_reserve=start, to_reserve=end)
+                    for start, end in zip(starts, ends)
+                )
+                continue
+            expanded.extend(
+                Reservation(
+                    id=reservation.id,
+                    from_reserve=start,
+                    to_reserve=end,
+                    meetingroom_id=reservation.meetingroom_id,
+                    user_id=reservation.user_id,
+                    repeat_frequency=reservation.repeat_frequency,
+                    repeat_interval=reservation.repeat_interval,
+                    repeat_count=reservation.repeat_count,
+                    last_to_reserve=reservation.last_to_reserve
+                )
+                for start, end in zip(starts, ends)
+            )
+        return expanded
 
 
 reservation_crud = CRUDReservation(Reservation)
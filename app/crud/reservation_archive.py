@@ -0,0 +1,78 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.reservation_archive import ReservationArchive
+from app.schemas.reservation import ReservationCreate, ReservationUpdate
+
+ARCHIVE_ID = ReservationArchive.id.label('archive_id')
+
+
+class CRUDReservationArchive(CRUDBase[
+    ReservationArchive,
+    ReservationCreate,
+    ReservationUpdate
+]):
+    """
+    Класс для чтения архива бронирований.
+
+    Бронирования попадают в архив только через
+    CRUDReservation.archive, поэтому используются лишь методы чтения.
+    """
+
+    def select_rows(self) -> Select:
+        """
+        Получает запрос столбцов архива в виде строк бронирования:
+        id в них - идентификатор исходного бронирования, а идентификатор
+        записи архива передается в archive_id для ключа сортировки.
+        """
+        return select(
+            ReservationArchive.reservation_id.label('id'),
+            *(
+                column for column in ReservationArchive.__table__.columns
+                if column.key not in ('id', 'reservation_id')
+            ),
+            ARCHIVE_ID
+        )
+
+    async def get_page(
+            self,
+            session: AsyncSession,
+            limit: int,
+            cursor: Optional[str] = None,
+            meetingroom_id: Optional[int] = None,
+            user_id: Optional[int] = None
+    ) -> tuple[Sequence[tuple], Optional[str]]:
+        """
+        Получает страницу архивных бронирований в порядке времени начала.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            limit (int): Максимальное число бронирований на странице.
+            cursor (Optional[str], optional): Курсор предыдущей страницы.
+            meetingroom_id (Optional[int], optional): Только бронирования
+                этой комнаты.
+            user_id (Optional[int], optional): Только бронирования
+                этого пользователя.
+
+        Returns:
+            tuple[Sequence[tuple], Optional[str]]: Строки бронирований
+                страницы из select_rows и курсор следующей страницы.
+        """
+        stmt = self.select_rows()
+        if meetingroom_id is not None:
+            stmt = stmt.where(
+                ReservationArchive.meetingroom_id == meetingroom_id
+            )
+        if user_id is not None:
+            stmt = stmt.where(ReservationArchive.user_id == user_id)
+        return await self.paginate(
+            stmt, session, limit, cursor,
+            order_by=(ReservationArchive.from_reserve, ARCHIVE_ID),
+            rows=True
+        )
+
+
+reservation_archive_crud = CRUDReservationArchive(ReservationArchive)
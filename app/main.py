@@ -1,10 +1,24 @@
 import contextlib
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
+from app.api.endpoints import metrics_router
 from app.api.routers import main_router
-from app.core.init_db import create_first_superuser
+from app.core.archive import reservation_archiver
+from app.core.hashing import PasswordHashQueueFull, password_hasher
+from app.core.init_db import create_first_superuser, load_reservation_index
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.pagination import InvalidCursorError
+from app.core.pipeline import write_pipeline
+from app.core.profiler import ProfilerMiddleware, request_profiler
+from app.core.query_budget import QueryBudgetMiddleware, query_budget
+from app.core.read_your_writes import recent_writers
+from app.core.room_cache import meeting_room_cache
+from app.core.schedule import reservation_index
+from app.core.user_cache import user_cache
+from app.crud.reservation import reservation_crud
 
 
 @contextlib.asynccontextmanager
@@ -12,7 +26,10 @@ async def lifespan(app: FastAPI):
     """
     Контекстный менеджер для жизненного цикла приложения.
 
-    Перед стартом приложения создает первого суперпользователя.
+    Перед стартом приложения создает первого суперпользователя,
+    загружает индекс бронирований и запускает конвейер записи
+    и перенос бронирований в архив, если они включены в настройках.
+    После остановки приложения завершает их и пул хеширования паролей.
 
     Parameters:
         app (FastAPI): Экземпляр FastAPI приложения.
@@ -21,7 +38,16 @@ async def lifespan(app: FastAPI):
         None
     """
     await create_first_superuser()
+    await load_reservation_index()
+    if settings.write_pipeline_enabled:
+        write_pipeline.start(on_rollback=load_reservation_index)
+    if settings.reservation_archive_enabled:
+        reservation_archiver.start(reservation_crud.archive)
     yield
+    await reservation_archiver.stop()
+    await write_pipeline.stop()
+    password_hasher.shutdown()
+    reservation_index.clear()
 
 
 app = FastAPI(
@@ -31,3 +57,82 @@ app = FastAPI(
 )
 
 app.include_router(main_router)
+
+
+def collect_metrics():
+    """
+    Получает показатели кэшей, пула хеширования паролей и архива
+    бронирований для /metrics.
+    """
+    return [
+        ('meeting_room_cache_hits_total', 'counter',
+         'Обращения, обслуженные кэшем комнат.', meeting_room_cache.hits),
+        ('meeting_room_cache_misses_total', 'counter',
+         'Обращения, потребовавшие загрузки комнат.',
+         meeting_room_cache.misses),
+        ('user_cache_hits_total', 'counter',
+         'Токены, принятые без обращения к базе данных.', user_cache.hits),
+        ('user_cache_misses_total', 'counter',
+         'Токены, потребовавшие проверки.', user_cache.misses),
+        ('password_hash_queued', 'gauge',
+         'Операции хеширования в очереди.', password_hasher.queued),
+        ('password_hash_running', 'gauge',
+         'Выполняемые операции хеширования.', password_hasher.running),
+        ('password_hash_rejected_total', 'counter',
+         'Операции хеширования, отклоненные из-за переполнения очереди.',
+         password_hasher.rejected),
+        ('reservation_archived_total', 'counter',
+         'Бронирования, перенесенные в архив.',
+         reservation_archiver.archived),
+    ]
+
+
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    app.include_router(metrics_router)
+    metrics.add_collector(collect_metrics)
+
+if query_budget.enabled:
+    app.add_middleware(QueryBudgetMiddleware, budget=query_budget)
+
+if request_profiler.enabled:
+    app.add_middleware(ProfilerMiddleware, profiler=request_profiler)
+
+
+async def mark_recent_writers(request: Request, call_next):
+    """
+    Открывает окно read-your-writes для клиента после успешного
+    запроса, изменяющего данные.
+    """
+    response = await call_next(request)
+    if (request.method not in ('GET', 'HEAD', 'OPTIONS') and
+            response.status_code < 400):
+        recent_writers.mark(request.headers.get('Authorization'))
+    return response
+
+
+if recent_writers.window:
+    app.middleware('http')(mark_recent_writers)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """
+    Возвращает ошибку 422 для некорректного курсора страницы.
+    """
+    return JSONResponse(status_code=422, content={'detail': str(exc)})
+
+
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(
+    request: Request,
+    exc: PasswordHashQueueFull
+):
+    """
+    Возвращает ошибку 503, если очередь на хеширование паролей переполнена.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={'detail': 'Сервис перегружен, повторите попытку позже'},
+        headers={'Retry-After': '1'}
+    )
@@ -1,3 +1,4 @@
 from .meeting_room import MeetingRoom # noqa
 from .reservation import Reservation # noqa
+from .reservation_archive import ReservationArchive # noqa
 from .user import User # noqa
@@ -1,9 +1,11 @@
 import datetime as dt
+from typing import Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
+from app.core.recurrence import get_step
 
 
 class Reservation(Base):
@@ -15,11 +17,49 @@ class Reservation(Base):
         to_reserve (Mapped[dt.datetime]): Время окончания бронирования.
         meetingroom_id (Mapped[int]): Внешний ключ на переговорную комнату.
         user_id (Mapped[int]): Внешний ключ на пользователя, сделавшего бронирование.
+        repeat_frequency (Mapped[Optional[str]]): Частота повторения серии: daily или weekly.
+        repeat_interval (Mapped[Optional[int]]): Повторять каждые repeat_interval дней или недель.
+        repeat_count (Mapped[Optional[int]]): Число повторений серии.
+        last_to_reserve (Mapped[dt.datetime]): Время окончания последнего повторения, для одиночного бронирования совпадает с to_reserve.
     """
+    __table_args__ = (
+        Index('ix_reservation_meetingroom_id_from_reserve',
+              'meetingroom_id', 'from_reserve', 'to_reserve'),
+        Index('ix_reservation_meetingroom_id_last_to_reserve',
+              'meetingroom_id', 'last_to_reserve'),
+        Index('ix_reservation_user_id_from_reserve',
+              'user_id', 'from_reserve'),
+        Index('ix_reservation_series_last_to_reserve', 'last_to_reserve',
+              postgresql_where=text('repeat_frequency IS NOT NULL'),
+              sqlite_where=text('repeat_frequency IS NOT NULL')),
+    )
+
     from_reserve: Mapped[dt.datetime]
     to_reserve: Mapped[dt.datetime]
     meetingroom_id: Mapped[int] = mapped_column(ForeignKey('meetingroom.id'))
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    repeat_frequency: Mapped[Optional[str]] = mapped_column(String(10))
+    repeat_interval: Mapped[Optional[int]]
+    repeat_count: Mapped[Optional[int]]
+    last_to_reserve: Mapped[dt.datetime] = mapped_column(
+        default=lambda context: context.get_current_parameters()['to_reserve']
+    )
+
+    @property
+    def repeat_step(self) -> Optional[dt.timedelta]:
+        if self.repeat_frequency is None:
+            return None
+        return get_step(self.repeat_frequency, self.repeat_interval)
+
+    @property
+    def recurrence(self) -> Optional[dict]:
+        if self.repeat_frequency is None:
+            return None
+        return {
+            'frequency': self.repeat_frequency,
+            'interval': self.repeat_interval,
+            'count': self.repeat_count,
+        }
 
     def __repr__(self):
         return (
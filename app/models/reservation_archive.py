@@ -0,0 +1,51 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class ReservationArchive(Base):
+    """
+    Модель бронирования, перенесенного в архив.
+
+    Содержит те же столбцы, что и Reservation, и собственный
+    идентификатор. Идентификатор исходного бронирования хранится
+    в reservation_id и не уникален: SQLite может выдать идентификатор
+    удаленного бронирования новому. Внешних ключей нет: архив хранит
+    историю и не мешает удалять комнаты и пользователей.
+
+    Attributes:
+        __tablename__ (str): Имя таблицы архива.
+        id (Mapped[int]): Идентификатор записи архива.
+        reservation_id (Mapped[int]): Идентификатор исходного бронирования.
+        from_reserve (Mapped[dt.datetime]): Время начала бронирования.
+        to_reserve (Mapped[dt.datetime]): Время окончания бронирования.
+        meetingroom_id (Mapped[int]): Идентификатор переговорной комнаты.
+        user_id (Mapped[int]): Идентификатор пользователя, сделавшего бронирование.
+        repeat_frequency (Mapped[Optional[str]]): Частота повторения серии: daily или weekly.
+        repeat_interval (Mapped[Optional[int]]): Повторять каждые repeat_interval дней или недель.
+        repeat_count (Mapped[Optional[int]]): Число повторений серии.
+        last_to_reserve (Mapped[dt.datetime]): Время окончания последнего повторения.
+        archived_at (Mapped[dt.datetime]): Время переноса в архив.
+    """
+    __tablename__ = 'reservation_archive'
+    __table_args__ = (
+        Index('ix_reservation_archive_meetingroom_id_from_reserve',
+              'meetingroom_id', 'from_reserve'),
+        Index('ix_reservation_archive_user_id_from_reserve',
+              'user_id', 'from_reserve'),
+    )
+
+    reservation_id: Mapped[int] = mapped_column(index=True)
+    from_reserve: Mapped[dt.datetime]
+    to_reserve: Mapped[dt.datetime]
+    meetingroom_id: Mapped[int]
+    user_id: Mapped[int]
+    repeat_frequency: Mapped[Optional[str]] = mapped_column(String(10))
+    repeat_interval: Mapped[Optional[int]]
+    repeat_count: Mapped[Optional[int]]
+    last_to_reserve: Mapped[dt.datetime]
+    archived_at: Mapped[dt.datetime]
@@ -1,6 +1,11 @@
+import datetime as dt
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
+from app.schemas.reservation import ReservationBase
+
+MEETING_ROOM_BATCH_MAX_SIZE = 1000
+
 
 class MeetingRoomBase(BaseModel):
     """
@@ -51,3 +56,37 @@ class MeetingRoomDB(MeetingRoomCreate):
         id (int): Идентификатор переговорной комнаты.
     """
     id: int
+
+
+class MeetingRoomTimeline(BaseModel):
+    """
+    Модель занятости переговорной комнаты за день.
+
+    Attributes:
+        meetingroom_id (int): Идентификатор переговорной комнаты.
+        date (dt.date): День.
+        slot_minutes (int): Длительность слота в минутах.
+        bitmap (str): Битовая карта занятости слотов в шестнадцатеричном виде, младший бит - первый слот дня.
+        busy (list[ReservationBase]): Занятые отрезки времени.
+    """
+    meetingroom_id: int
+    date: dt.date
+    slot_minutes: int
+    bitmap: str
+    busy: list[ReservationBase]
+
+
+class MeetingRoomCacheStats(BaseModel):
+    """
+    Модель состояния кэша переговорных комнат.
+
+    Attributes:
+        enabled (bool): Включен ли кэш.
+        size (int): Число комнат в снимке.
+        hits (int): Число обращений, обслуженных снимком.
+        misses (int): Число обращений, потребовавших загрузки снимка.
+    """
+    enabled: bool
+    size: int
+    hits: int
+    misses: int
@@ -1,8 +1,13 @@
 import datetime as dt
+from enum import Enum
+from typing import Optional
 
 from pydantic import (BaseModel, ConfigDict, Field, field_validator,
                       model_validator)
 
+from app.core.recurrence import (RECURRENCE_MAX_COUNT, check_series_duration,
+                                 get_count, get_step)
+
 FROM_TIME = (
     dt.datetime.now() + dt.timedelta(minutes=10)
 ).isoformat(timespec='minutes')
@@ -11,6 +16,42 @@ TO_TIME = (
     dt.datetime.now() + dt.timedelta(hours=1)
 ).isoformat(timespec='minutes')
 
+RESERVATION_BATCH_MAX_SIZE = 1000
+
+
+class Frequency(str, Enum):
+    """
+    Частота повторения серии бронирований.
+    """
+    daily = 'daily'
+    weekly = 'weekly'
+
+
+class Recurrence(BaseModel):
+    """
+    Правило повторения бронирования.
+
+    Attributes:
+        frequency (Frequency): Частота повторения.
+        interval (int): Повторять каждые interval дней или недель.
+        count (Optional[int]): Число повторений.
+        until (Optional[dt.datetime]): Последнее допустимое время начала повторения.
+    """
+    model_config = ConfigDict(use_enum_values=True)
+
+    frequency: Frequency
+    interval: int = Field(1, ge=1, le=52)
+    count: Optional[int] = Field(None, ge=1, le=RECURRENCE_MAX_COUNT)
+    until: Optional[dt.datetime] = None
+
+    @model_validator(mode='after')
+    def check_count_or_until(self):
+        if (self.count is None) == (self.until is None):
+            raise ValueError(
+                'Для повторения нужно указать либо count, либо until'
+            )
+        return self
+
 
 class ReservationBase(BaseModel):
     """
@@ -65,8 +106,46 @@ class ReservationCreate(ReservationUpdate):
 
     Attributes:
         meetingroom_id (int): Идентификатор переговорной комнаты.
+        recurrence (Optional[Recurrence]): Правило повторения бронирования.
     """
     meetingroom_id: int
+    recurrence: Optional[Recurrence] = None
+
+    @model_validator(mode='after')
+    def check_recurrence(self):
+        if self.recurrence is None:
+            return self
+        step = get_step(self.recurrence.frequency, self.recurrence.interval)
+        check_series_duration(self.from_reserve, self.to_reserve, step)
+        if self.recurrence.until is not None:
+            if ((self.recurrence.until.utcoffset() is None) !=
+                    (self.from_reserve.utcoffset() is None)):
+                raise ValueError(
+                    'Окончание повторений и время начала бронирования '
+                    'должны быть указаны одинаково: оба с часовым поясом '
+                    'или оба без него'
+                )
+            count = get_count(
+                self.from_reserve, step, until=self.recurrence.until
+            )
+            if not 1 <= count <= RECURRENCE_MAX_COUNT:
+                raise ValueError(
+                    'Число повторений должно быть '
+                    f'от 1 до {RECURRENCE_MAX_COUNT}'
+                )
+        return self
+
+
+class ReservationReassign(BaseModel):
+    """
+    Модель для переназначения набора бронирований другому пользователю.
+
+    Attributes:
+        user_id (int): Идентификатор нового владельца бронирований.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    user_id: int
 
 
 class ReservationDB(ReservationBase):
@@ -80,7 +159,19 @@ class ReservationDB(ReservationBase):
         id (int): Идентификатор бронирования.
         meetingroom_id (int): Идентификатор переговорной комнаты.
         user_id (int): Идентификатор пользователя, создавшего бронирование.
+        recurrence (Optional[Recurrence]): Правило повторения серии.
     """
     id: int
     meetingroom_id: int
     user_id: int
+    recurrence: Optional[Recurrence] = None
+
+
+class ReservationArchiveResult(BaseModel):
+    """
+    Модель результата переноса бронирований в архив.
+
+    Attributes:
+        archived (int): Число перенесенных бронирований.
+    """
+    archived: int
@@ -1,4 +1,5 @@
 from fastapi_users import schemas
+from pydantic import BaseModel
 
 
 class UserRead(schemas.BaseUser[int]):
@@ -20,3 +21,27 @@ class UserUpdate(schemas.BaseUserUpdate):
     Модель для обновления данных пользователя.
     """
     pass
+
+
+class PasswordHashingStats(BaseModel):
+    """
+    Модель состояния пула хеширования паролей.
+
+    Attributes:
+        executor (str): Тип пула: thread или process.
+        workers (int): Размер пула.
+        queued (int): Число операций, ожидающих в очереди.
+        running (int): Число выполняемых операций.
+        completed (int): Число завершенных операций.
+        rejected (int): Число операций, отклоненных из-за переполнения очереди.
+        max_queued (int): Максимальная наблюдавшаяся длина очереди.
+        wait_seconds (float): Суммарное время ожидания в очереди.
+    """
+    executor: str
+    workers: int
+    queued: int
+    running: int
+    completed: int
+    rejected: int
+    max_queued: int
+    wait_seconds: float
@@ -0,0 +1,114 @@
+"""
+Задержка обычных запросов во время всплеска входов.
+
+Измеряет задержку GET /meeting_rooms/ в тишине и во время
+одновременных запросов /auth/jwt/login. Хеширование паролей выполняется
+в пуле, поэтому задержка обычных запросов не должна заметно вырасти.
+
+Запуск:
+    python -m benchmarks.auth_burst --logins 200 --concurrency 50
+    python -m benchmarks.auth_burst --executor process --workers 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'bench-password'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--probes', type=int, default=200)
+    parser.add_argument('--executor', choices=('thread', 'process'),
+                        default='thread')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_auth_burst.db'
+        )
+    )
+    return parser.parse_args()
+
+
+async def probe(client, count: int, stop: asyncio.Event = None) -> list:
+    """
+    Последовательно запрашивает список комнат и возвращает задержки в мс.
+    """
+    latencies = []
+    for _ in range(count):
+        if stop is not None and stop.is_set():
+            break
+        started = time.perf_counter()
+        response = await client.get('/meeting_rooms/')
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'{name}: {len(latencies)} probes, p50 {quantiles[49]:.1f} ms, '
+          f'p95 {quantiles[94]:.1f} ms, max {max(latencies):.1f} ms')
+
+
+async def main(args: argparse.Namespace) -> int:
+    import httpx
+
+    from app.core.base import Base
+    from app.core.db import engine
+    from app.core.hashing import password_hasher
+    from app.core.init_db import create_user
+    from app.main import app
+
+    engine.echo = False
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    await create_user(EMAIL, PASSWORD)
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        report('idle', await probe(client, args.probes))
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def login():
+            async with semaphore:
+                response = await client.post(
+                    '/auth/jwt/login',
+                    data={'username': EMAIL, 'password': PASSWORD}
+                )
+                response.raise_for_status()
+
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        probes = asyncio.create_task(probe(client, args.probes * 100, stop))
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        report('during logins', await probes)
+        print(f'{args.logins} logins in {elapsed:.2f}s '
+              f'({args.logins / elapsed:.0f}/s), '
+              f'max queue {password_hasher.max_queued}, '
+              f'wait {password_hasher.wait_seconds:.2f}s total')
+    await engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    os.environ['DATABASE_URL'] = arguments.database_url
+    os.environ['PASSWORD_HASH_EXECUTOR'] = arguments.executor
+    if arguments.workers is not None:
+        os.environ['PASSWORD_HASH_WORKERS'] = str(arguments.workers)
+    sys.exit(asyncio.run(main(arguments)))
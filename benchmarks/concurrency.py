@@ -0,0 +1,164 @@
+"""
+Нагрузочная проверка конкурентной записи бронирований.
+
+Отправляет тысячи одновременных запросов на создание пересекающихся
+бронирований одной комнаты и проверяет, что в базе данных не появилось
+ни одного пересечения. Затем измеряет пропускную способность записи
+в разные комнаты, которые не должны блокировать друг друга.
+С флагом --write-pipeline записи выполняются через конвейер
+с групповой фиксацией транзакций.
+
+Запуск:
+    python -m benchmarks.concurrency --requests 2000 --concurrency 100
+    python -m benchmarks.concurrency --write-pipeline
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import sys
+import tempfile
+import time
+
+START = dt.datetime.now().replace(microsecond=0) + dt.timedelta(days=1)
+EMAIL = 'bench@example.com'
+PASSWORD = 'bench-password'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write-pipeline', action='store_true')
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_concurrency.db'
+        )
+    )
+    return parser.parse_args()
+
+
+async def fire(client, headers, payloads, concurrency) -> dict[int, int]:
+    """
+    Отправляет запросы с ограничением числа одновременных запросов.
+
+    Returns:
+        dict[int, int]: Число ответов по кодам статуса.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def post(payload):
+        async with semaphore:
+            response = await client.post(
+                '/reservations/', json=payload, headers=headers
+            )
+        statuses[response.status_code] = (
+            statuses.get(response.status_code, 0) + 1
+        )
+
+    await asyncio.gather(*(post(payload) for payload in payloads))
+    return statuses
+
+
+def find_overlaps(rows) -> list[tuple]:
+    """
+    Находит пересекающиеся пары соседних бронирований одной комнаты.
+    """
+    overlaps = []
+    rows = sorted(rows)
+    for previous, current in zip(rows, rows[1:]):
+        if previous[0] == current[0] and current[1] <= previous[2]:
+            overlaps.append((previous, current))
+    return overlaps
+
+
+async def main(args: argparse.Namespace) -> int:
+    import httpx
+    from sqlalchemy import insert, select
+
+    from app.core.base import Base
+    from app.core.db import async_session, engine
+    from app.core.init_db import create_user
+    from app.main import app
+    from app.models import MeetingRoom, Reservation
+
+    engine.echo = False
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_session() as session:
+        await session.execute(insert(MeetingRoom), [
+            {'id': i, 'name': f'Room {i}'} for i in range(1, args.rooms + 1)
+        ])
+        await session.commit()
+    await create_user(EMAIL, PASSWORD)
+
+    random.seed(args.seed)
+    failed = False
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        response = await client.post(
+            '/auth/jwt/login', data={'username': EMAIL, 'password': PASSWORD}
+        )
+        headers = {
+            'Authorization': f'Bearer {response.json()["access_token"]}'
+        }
+
+        def payload(room_id, minute, length):
+            from_reserve = START + dt.timedelta(minutes=minute)
+            return {
+                'meetingroom_id': room_id,
+                'from_reserve': from_reserve.isoformat(),
+                'to_reserve': (
+                    from_reserve + dt.timedelta(minutes=length)
+                ).isoformat(),
+            }
+
+        scenarios = {
+            'one room, overlapping': [
+                payload(1, random.randrange(0, 600), random.randrange(5, 60))
+                for _ in range(args.requests)
+            ],
+            'many rooms, disjoint': [
+                payload(i % (args.rooms - 1) + 2, i // (args.rooms - 1) * 10, 5)
+                for i in range(args.requests)
+            ],
+        }
+        for name, payloads in scenarios.items():
+            started = time.perf_counter()
+            statuses = await fire(client, headers, payloads, args.concurrency)
+            elapsed = time.perf_counter() - started
+            print(f'{name}: {len(payloads)} requests in {elapsed:.2f}s '
+                  f'({len(payloads) / elapsed:.0f} req/s), '
+                  f'statuses {statuses}')
+
+    async with async_session() as session:
+        rows = (await session.execute(select(
+            Reservation.meetingroom_id,
+            Reservation.from_reserve,
+            Reservation.to_reserve
+        ))).all()
+    overlaps = find_overlaps(rows)
+    if overlaps:
+        failed = True
+        print(f'FAIL: {len(overlaps)} overlapping reservations, '
+              f'e.g. {overlaps[0]}')
+    else:
+        print(f'OK: {len(rows)} reservations, no overlaps')
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    os.environ['DATABASE_URL'] = arguments.database_url
+    if arguments.write_pipeline:
+        os.environ['WRITE_PIPELINE_ENABLED'] = 'true'
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,169 @@
+"""
+Сравнение пропускной способности профилей движка базы данных.
+
+Для каждого профиля запускает отдельный процесс, который создает
+бронирования одновременными транзакциями (по коммиту на бронирование)
+и выполняет одновременные проверки пересечений, и печатает число
+операций в секунду.
+
+Запуск:
+    python -m benchmarks.engine_profiles --writes 2000 --reads 5000
+    python -m benchmarks.engine_profiles --profiles dev prod-sqlite
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = ('dev', 'prod-sqlite', 'prod-server')
+START = dt.datetime(2030, 1, 1)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES,
+                        default=list(PROFILES))
+    parser.add_argument('--writes', type=int, default=2000)
+    parser.add_argument('--reads', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rooms', type=int, default=50)
+    parser.add_argument('--run', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_engine_profiles.db'
+        )
+    )
+    return parser.parse_args()
+
+
+async def run_concurrently(operations, concurrency: int) -> float:
+    """
+    Выполняет корутины с ограничением параллелизма и возвращает
+    число операций в секунду.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation):
+        async with semaphore:
+            await operation()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(operation) for operation in operations))
+    return len(operations) / (time.perf_counter() - started)
+
+
+async def measure(args: argparse.Namespace) -> dict:
+    from sqlalchemy import insert
+
+    from app.core.base import Base
+    from app.core.db import async_session, engine
+    from app.crud.reservation import reservation_crud
+    from app.models import MeetingRoom, User
+    from app.schemas.reservation import ReservationCreate
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_session() as session:
+        await session.execute(insert(User), [{
+            'id': 1, 'email': 'bench@example.com', 'hashed_password': '-',
+            'is_active': True, 'is_superuser': False, 'is_verified': True
+        }])
+        await session.execute(insert(MeetingRoom), [
+            {'id': i, 'name': f'Room {i}'} for i in range(1, args.rooms + 1)
+        ])
+        await session.commit()
+    user = User(id=1)
+
+    def write(i):
+        async def operation():
+            from_reserve = START + dt.timedelta(hours=i // args.rooms)
+            async with async_session() as session:
+                await reservation_crud.create(ReservationCreate(
+                    meetingroom_id=i % args.rooms + 1,
+                    from_reserve=from_reserve,
+                    to_reserve=from_reserve + dt.timedelta(minutes=50)
+                ), session, user)
+        return operation
+
+    def read(i):
+        async def operation():
+            from_reserve = START + dt.timedelta(
+                hours=i % (args.writes // args.rooms + 1)
+            )
+            async with async_session() as session:
+                await reservation_crud.get_reservations_at_the_same_time(
+                    from_reserve=from_reserve,
+                    to_reserve=from_reserve + dt.timedelta(hours=1),
+                    meetingroom_id=i % args.rooms + 1,
+                    session=session
+                )
+        return operation
+
+    result = {
+        'writes/s': await run_concurrently(
+            [write(i) for i in range(args.writes)], args.concurrency
+        ),
+        'reads/s': await run_concurrently(
+            [read(i) for i in range(args.reads)], args.concurrency
+        ),
+    }
+    await engine.dispose()
+    return result
+
+
+def remove_sqlite_files(database_url: str) -> None:
+    """
+    Удаляет файлы базы SQLite, чтобы режим журнала, включенный
+    предыдущим профилем, не влиял на следующий.
+    """
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    if url.get_backend_name() != 'sqlite' or not url.database:
+        return
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(url.database + suffix):
+            os.remove(url.database + suffix)
+
+
+def main(args: argparse.Namespace) -> int:
+    print(f'{"profile":<12} {"writes/s":>10} {"reads/s":>10}')
+    for profile in args.profiles:
+        remove_sqlite_files(args.database_url)
+        command = [
+            sys.executable, '-m', 'benchmarks.engine_profiles',
+            '--run', profile,
+            '--writes', str(args.writes),
+            '--reads', str(args.reads),
+            '--concurrency', str(args.concurrency),
+            '--rooms', str(args.rooms),
+            '--database-url', args.database_url,
+        ]
+        completed = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True
+        )
+        if completed.returncode:
+            print(f'{profile:<12} failed with code {completed.returncode}')
+            return completed.returncode
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f'{profile:<12} {result["writes/s"]:>10.0f} '
+              f'{result["reads/s"]:>10.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    if arguments.run is None:
+        sys.exit(main(arguments))
+    os.environ['DATABASE_URL'] = arguments.database_url
+    os.environ['DATABASE_PROFILE'] = arguments.run
+    result = asyncio.run(measure(arguments))
+    print(json.dumps(result))
@@ -0,0 +1,88 @@
+"""
+Измерение памяти при выгрузке бронирований.
+
+Заполняет базу данных синтетическими бронированиями и сравнивает пиковое
+потребление памяти (tracemalloc) при потоковой выгрузке в NDJSON и CSV
+с загрузкой всех бронирований ORM-объектами. Пик потоковой выгрузки
+не должен зависеть от числа бронирований.
+
+Запуск:
+    python -m benchmarks.export --reservations 200000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rooms', type=int, default=200)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--reservations', type=int, default=200_000)
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_export.db'
+        )
+    )
+    return parser.parse_args()
+
+
+async def measure(name: str, coroutine) -> None:
+    """
+    Выполняет корутину и печатает время и пик выделенной памяти.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await coroutine
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{name}: {size} in {elapsed:.2f}s, '
+          f'peak {peak / 2 ** 20:.1f} MiB')
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import select
+
+    from app.core.base import Base
+    from app.core.db import async_session, engine
+    from app.core.export import ENCODERS
+    from app.crud.reservation import reservation_crud
+    from app.models import Reservation
+    from benchmarks.query_plan import seed
+
+    engine.echo = False
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_session() as session:
+        await seed(session, args.rooms, args.users, args.reservations)
+
+    async def export(encoder) -> str:
+        size = 0
+        async with async_session() as session:
+            async for part in encoder(reservation_crud.stream_export(session)):
+                size += len(part)
+        return f'{size / 2 ** 20:.1f} MiB'
+
+    async def load_all() -> str:
+        async with async_session() as session:
+            reservations = (await session.scalars(select(Reservation))).all()
+        return f'{len(reservations)} objects'
+
+    for export_format, encoder in ENCODERS.items():
+        await measure(f'stream {export_format.value}', export(encoder))
+    await measure('load all', load_all())
+    await engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    os.environ['DATABASE_URL'] = arguments.database_url
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,371 @@
+"""
+Нагрузочный тест HTTP API со смешанной нагрузкой.
+
+Заполняет базу данных комнатами, пользователями и бронированиями,
+запускает приложение в процессе теста (ASGI) или под uvicorn и
+отправляет одновременные запросы от имени нескольких пользователей:
+вход, создание, изменение и удаление своих бронирований, списки
+бронирований комнаты и списки комнат. Печатает JSON с пропускной
+способностью и задержками p50/p95/p99 по каждому маршруту, который
+можно сохранить и сравнить между коммитами.
+
+Запуск:
+    python -m benchmarks.http_load --requests 5000 --concurrency 50
+    python -m benchmarks.http_load --server uvicorn --output before.json
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+START = dt.datetime.now().replace(microsecond=0) + dt.timedelta(days=1)
+PASSWORD = 'bench-password'
+ROUTES = {
+    'login': 'POST /auth/jwt/login',
+    'create': 'POST /reservations/',
+    'update': 'PATCH /reservations/{reservation_id}',
+    'delete': 'DELETE /reservations/{reservation_id}',
+    'room_reservations': 'GET /meeting_rooms/{meetingroom_id}/reservations',
+    'rooms': 'GET /meeting_rooms/',
+}
+DEFAULT_MIX = {
+    'login': 2,
+    'create': 15,
+    'update': 8,
+    'delete': 5,
+    'room_reservations': 40,
+    'rooms': 30,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--users', type=int, default=50,
+                        help='число пользователей, ограничивает параллелизм')
+    parser.add_argument('--rooms', type=int, default=50)
+    parser.add_argument('--reservations', type=int, default=20_000,
+                        help='число бронирований в исходных данных')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--mix', type=json.loads, default=DEFAULT_MIX,
+        help='веса операций в JSON, например {"rooms": 1, "create": 1}'
+    )
+    parser.add_argument('--server', choices=('asgi', 'uvicorn'),
+                        default='asgi')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--profile', default='prod-sqlite',
+                        choices=('dev', 'prod-sqlite', 'prod-server'),
+                        help='профиль движка базы данных (DATABASE_PROFILE)')
+    parser.add_argument('--output', help='файл для сохранения JSON')
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_http_load.db'
+        )
+    )
+    return parser.parse_args()
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """
+    Получает перцентиль отсортированных задержек методом ближайшего ранга.
+    """
+    if not latencies:
+        return 0.0
+    rank = max(math.ceil(fraction * len(latencies)), 1)
+    return latencies[rank - 1]
+
+
+def summarize(latencies: list[float], statuses: dict, elapsed: float) -> dict:
+    """
+    Сводит задержки и коды статуса маршрута в отчет.
+    """
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'throughput': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+async def seed(args: argparse.Namespace) -> list[str]:
+    """
+    Создает схему и исходные данные и возвращает email пользователей.
+    """
+    from sqlalchemy import insert
+
+    from app.core.base import Base
+    from app.core.db import async_session, engine
+    from app.core.init_db import create_user
+    from app.models import MeetingRoom, Reservation
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    emails = [f'bench{i}@example.com' for i in range(args.users)]
+    for email in emails:
+        await create_user(email, PASSWORD)
+    rows = []
+    for i in range(args.reservations):
+        from_reserve = START + dt.timedelta(hours=i // args.rooms)
+        to_reserve = from_reserve + dt.timedelta(minutes=45)
+        rows.append({
+            'meetingroom_id': i % args.rooms + 1,
+            'user_id': i % args.users + 1,
+            'from_reserve': from_reserve,
+            'to_reserve': to_reserve,
+            'last_to_reserve': to_reserve,
+        })
+    async with async_session() as session:
+        await session.execute(insert(MeetingRoom), [
+            {'id': i, 'name': f'Room {i}'} for i in range(1, args.rooms + 1)
+        ])
+        if rows:
+            await session.execute(insert(Reservation), rows)
+        await session.commit()
+    await engine.dispose()
+    return emails
+
+
+class VirtualUser:
+    """
+    Пользователь нагрузочного теста со своим токеном и бронированиями.
+    """
+
+    def __init__(self, client, email: str, rooms: int, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.room_count = rooms
+        self.rng = rng
+        self.headers = {}
+        self.reservation_ids: list[int] = []
+
+    async def login(self):
+        response = await self.client.post(
+            '/auth/jwt/login',
+            data={'username': self.email, 'password': PASSWORD}
+        )
+        if response.status_code == 200:
+            self.headers = {
+                'Authorization': f'Bearer {response.json()["access_token"]}'
+            }
+        return response
+
+    def _period(self) -> dict:
+        # Новые бронирования начинаются позже исходных данных и почти
+        # не пересекаются, чтобы нагрузка состояла в основном из записей.
+        from_reserve = START + dt.timedelta(
+            days=3650, minutes=15 * self.rng.randrange(1_000_000)
+        )
+        return {
+            'from_reserve': from_reserve.isoformat(),
+            'to_reserve': (
+                from_reserve + dt.timedelta(minutes=10)
+            ).isoformat(),
+        }
+
+    async def create(self):
+        response = await self.client.post('/reservations/', json={
+            'meetingroom_id': self.rng.randrange(self.room_count) + 1,
+            **self._period()
+        }, headers=self.headers)
+        if response.status_code == 200:
+            self.reservation_ids.append(response.json()['id'])
+        return response
+
+    async def update(self):
+        reservation_id = self.rng.choice(self.reservation_ids)
+        return await self.client.patch(
+            f'/reservations/{reservation_id}',
+            json=self._period(), headers=self.headers
+        )
+
+    async def delete(self):
+        reservation_id = self.reservation_ids.pop(
+            self.rng.randrange(len(self.reservation_ids))
+        )
+        return await self.client.delete(
+            f'/reservations/{reservation_id}', headers=self.headers
+        )
+
+    async def room_reservations(self):
+        from_reserve = START + dt.timedelta(hours=self.rng.randrange(24 * 7))
+        return await self.client.get(
+            f'/meeting_rooms/{self.rng.randrange(self.room_count) + 1}'
+            f'/reservations',
+            params={
+                'from_reserve': from_reserve.isoformat(),
+                'to_reserve': (
+                    from_reserve + dt.timedelta(days=1)
+                ).isoformat(),
+            }
+        )
+
+    async def rooms(self):
+        return await self.client.get('/meeting_rooms/')
+
+
+async def run_load(args: argparse.Namespace, client, emails) -> dict:
+    """
+    Выполняет смешанную нагрузку и возвращает отчет по маршрутам.
+    """
+    rng = random.Random(args.seed)
+    users = [
+        VirtualUser(client, email, args.rooms, random.Random(args.seed + i))
+        for i, email in enumerate(emails)
+    ]
+    await asyncio.gather(*(user.login() for user in users))
+    operations = [
+        name for name, weight in args.mix.items() if weight > 0
+    ]
+    plan = rng.choices(
+        operations, weights=[args.mix[name] for name in operations],
+        k=args.requests
+    )
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # Операции одного пользователя выполняются последовательно,
+    # чтобы он не изменял бронирование, которое еще создается.
+    user_locks = [asyncio.Lock() for _ in users]
+
+    async def execute(i: int, operation: str):
+        user = users[i % len(users)]
+        async with user_locks[i % len(users)], semaphore:
+            if operation in ('update', 'delete') and not user.reservation_ids:
+                operation = 'create'
+            started = time.perf_counter()
+            try:
+                status = str((await getattr(user, operation)()).status_code)
+            except Exception as error:
+                status = type(error).__name__
+            latencies[operation].append(
+                (time.perf_counter() - started) * 1000
+            )
+            statuses[operation][status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        execute(i, operation) for i, operation in enumerate(plan)
+    ))
+    elapsed = time.perf_counter() - started
+    routes = {
+        ROUTES[name]: summarize(latencies[name], statuses[name], elapsed)
+        for name in operations if latencies[name]
+    }
+    total_statuses = defaultdict(int)
+    for route_statuses in statuses.values():
+        for status, count in route_statuses.items():
+            total_statuses[status] += count
+    return {
+        'total': summarize(
+            [latency for values in latencies.values() for latency in values],
+            total_statuses, elapsed
+        ),
+        'routes': routes,
+        'elapsed_s': round(elapsed, 3),
+    }
+
+
+async def run_asgi(args: argparse.Namespace, emails) -> dict:
+    import httpx
+
+    from app.core.db import engine
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        result = await run_load(args, client, emails)
+    await engine.dispose()
+    return result
+
+
+async def run_uvicorn(args: argparse.Namespace, emails) -> dict:
+    import httpx
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app',
+         '--port', str(args.port), '--log-level', 'warning'],
+    )
+    base_url = f'http://127.0.0.1:{args.port}'
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=60
+        ) as client:
+            for _ in range(100):
+                try:
+                    await client.get('/meeting_rooms/', params={'limit': 1})
+                    break
+                except httpx.TransportError:
+                    if server.poll() is not None:
+                        raise RuntimeError('uvicorn exited on startup')
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError(f'uvicorn did not start on {base_url}')
+            return await run_load(args, client, emails)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main(args: argparse.Namespace) -> int:
+    emails = await seed(args)
+    run = run_uvicorn if args.server == 'uvicorn' else run_asgi
+    result = {
+        'commit': get_commit(),
+        'server': args.server,
+        'parameters': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'users': args.users,
+            'rooms': args.rooms,
+            'reservations': args.reservations,
+            'seed': args.seed,
+            'mix': args.mix,
+            'profile': args.profile,
+        },
+        **await run(args, emails),
+    }
+    report = json.dumps(result, indent=2, ensure_ascii=False)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    unknown = set(arguments.mix) - set(ROUTES)
+    if unknown:
+        sys.exit(f'Неизвестные операции в --mix: {sorted(unknown)}')
+    os.environ['DATABASE_URL'] = arguments.database_url
+    os.environ['DATABASE_PROFILE'] = arguments.profile
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,174 @@
+"""
+Проверка планов запросов CRUDReservation на большой таблице бронирований.
+
+Заполняет базу данных синтетическими бронированиями, выполняет запросы
+CRUDReservation, перехватывает отправленный в базу SQL и проверяет через
+EXPLAIN QUERY PLAN, что каждый запрос использует индекс. Завершается
+с ненулевым кодом, если хотя бы один запрос сканирует таблицу целиком.
+
+Запуск:
+    python -m benchmarks.query_plan --reservations 200000
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import sys
+import tempfile
+import time
+
+BATCH_SIZE = 10_000
+START = dt.datetime(2030, 1, 1)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rooms', type=int, default=200)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--reservations', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--database-url',
+        default='sqlite+aiosqlite:///' + os.path.join(
+            tempfile.gettempdir(), 'room_reservation_query_plan.db'
+        )
+    )
+    return parser.parse_args()
+
+
+async def seed(session, rooms: int, users: int, reservations: int) -> None:
+    """
+    Заполняет таблицы пакетными INSERT без создания ORM-объектов.
+    """
+    from sqlalchemy import insert
+
+    from app.models import MeetingRoom, Reservation, User
+
+    await session.execute(insert(User), [
+        {'id': i, 'email': f'user{i}@example.com', 'hashed_password': '-',
+         'is_active': True, 'is_superuser': False, 'is_verified': True}
+        for i in range(1, users + 1)
+    ])
+    await session.execute(insert(MeetingRoom), [
+        {'id': i, 'name': f'Room {i}'} for i in range(1, rooms + 1)
+    ])
+    batch = []
+    for i in range(reservations):
+        room_id, slot = i % rooms + 1, i // rooms
+        from_reserve = START + dt.timedelta(hours=slot)
+        batch.append({
+            'meetingroom_id': room_id,
+            'user_id': i % users + 1,
+            'from_reserve': from_reserve,
+            'to_reserve': from_reserve + dt.timedelta(minutes=50),
+        })
+        if len(batch) == BATCH_SIZE:
+            await session.execute(insert(Reservation), batch)
+            batch = []
+    if batch:
+        await session.execute(insert(Reservation), batch)
+    await session.commit()
+
+
+def uses_index(plan: list[str]) -> bool:
+    """
+    Проверяет, что в плане нет полного сканирования таблицы reservation
+    и используется индекс или первичный ключ.
+    """
+    return not any(
+        line.startswith('SCAN reservation') and 'INDEX' not in line
+        for line in plan
+    ) and any('INDEX' in line or 'PRIMARY KEY' in line for line in plan)
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import event
+
+    from app.core.base import Base
+    from app.core.db import async_session, engine
+    from app.core.pagination import encode_cursor
+    from app.crud.meeting_room import meeting_room_crud
+    from app.crud.reservation import reservation_crud
+    from app.models import User
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    started = time.perf_counter()
+    async with async_session() as session:
+        await seed(session, args.rooms, args.users, args.reservations)
+    print(f'seeded {args.reservations} reservations '
+          f'in {time.perf_counter() - started:.1f}s')
+
+    middle = START + dt.timedelta(hours=args.reservations // args.rooms // 2)
+    user = User(id=1)
+    queries = {
+        'get_reservations_at_the_same_time':
+            lambda session: reservation_crud.get_reservations_at_the_same_time(
+                from_reserve=middle, to_reserve=middle + dt.timedelta(hours=1),
+                meetingroom_id=1, session=session
+            ),
+        'get_reservations_at_the_same_time(reservation_id)':
+            lambda session: reservation_crud.get_reservations_at_the_same_time(
+                from_reserve=middle, to_reserve=middle + dt.timedelta(hours=1),
+                meetingroom_id=1, reservation_id=1, session=session
+            ),
+        'get_future_reservations_for_room':
+            lambda session: reservation_crud.get_future_reservations_for_room(
+                1, session
+            ),
+        'get_by_user':
+            lambda session: reservation_crud.get_by_user(session, user),
+        'get_page':
+            lambda session: reservation_crud.get_page(
+                session, 100, encode_cursor([args.reservations // 2])
+            ),
+        'get_page_by_user':
+            lambda session: reservation_crud.get_page_by_user(
+                session, user, 100, encode_cursor([middle, 0])
+            ),
+        'get_available':
+            lambda session: meeting_room_crud.get_available(
+                middle, middle + dt.timedelta(hours=1), session
+            ),
+    }
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    failed = False
+    async with async_session() as session:
+        for name, query in queries.items():
+            captured.clear()
+            event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+            try:
+                await query(session)
+            finally:
+                event.remove(
+                    engine.sync_engine, 'before_cursor_execute', capture
+                )
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                await query(session)
+                session.expunge_all()
+            elapsed = (time.perf_counter() - started) / args.repeat * 1000
+            for statement, parameters in captured:
+                connection = await session.connection()
+                rows = await connection.exec_driver_sql(
+                    'EXPLAIN QUERY PLAN ' + statement, parameters
+                )
+                plan = [row[-1] for row in rows]
+                ok = uses_index(plan)
+                failed = failed or not ok
+                print(f'{"OK  " if ok else "FAIL"} {name}: {elapsed:.2f} ms')
+                for line in plan:
+                    print(f'       {line}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    os.environ['DATABASE_URL'] = arguments.database_url
+    sys.exit(asyncio.run(main(arguments)))
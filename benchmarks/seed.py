@@ -0,0 +1,246 @@
+"""
+Генератор синтетических данных для нагрузочного тестирования.
+
+Заполняет схему app.models комнатами, пользователями и бронированиями
+пакетными INSERT без создания ORM-объектов. Бронирования комнаты идут
+друг за другом без пересечений в рабочие часы будних дней, длительность
+и перерывы выбираются случайно, популярность комнат различается.
+У всех пользователей один пароль, который хешируется один раз, поэтому
+медленное хеширование не замедляет генерацию. При одинаковом --seed
+генерируются одинаковые данные с одинаковыми идентификаторами.
+
+Запуск:
+    python -m benchmarks.seed --rooms 10000 --users 100000 \\
+        --reservations 20000000 --database-url sqlite+aiosqlite:///big.db
+    python -m benchmarks.seed --append --reservations 1000000
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import sys
+import time
+from typing import Iterator
+
+PASSWORD = 'seed-password'
+WORKDAY_START = dt.timedelta(hours=8)
+WORKDAY_MINUTES = 12 * 60
+DURATIONS = (30, 45, 60, 60, 90, 120)
+GAPS = (0, 0, 15, 30, 60, 120, 240)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rooms', type=int, default=10_000)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--reservations', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', type=dt.date.fromisoformat,
+                        default=dt.date(2030, 1, 7),
+                        help='первый день бронирований, по умолчанию '
+                             'понедельник 2030-01-07')
+    parser.add_argument('--append', action='store_true',
+                        help='не пересоздавать таблицы, а только добавить '
+                             'бронирования к существующим комнатам '
+                             'и пользователям')
+    parser.add_argument('--profile', default='prod-sqlite',
+                        choices=('dev', 'prod-sqlite', 'prod-server'),
+                        help='профиль движка базы данных (DATABASE_PROFILE)')
+    parser.add_argument(
+        '--database-url',
+        default=os.environ.get(
+            'DATABASE_URL', 'sqlite+aiosqlite:///sqlite.db'
+        )
+    )
+    return parser.parse_args()
+
+
+def batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def split_reservations(
+        total: int,
+        rooms: int,
+        rng: random.Random
+) -> list[int]:
+    """
+    Распределяет бронирования по комнатам пропорционально
+    их популярности с логнормальным распределением.
+    """
+    weights = [rng.lognormvariate(0, 0.75) for _ in range(rooms)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for room in rng.sample(range(rooms), total - sum(counts)):
+        counts[room] += 1
+    return counts
+
+
+def to_datetime(start: dt.date, minute: int) -> dt.datetime:
+    """
+    Переводит номер рабочей минуты от начала генерации во время:
+    рабочие дни идут с понедельника по пятницу по WORKDAY_MINUTES минут.
+    """
+    day, minute = divmod(minute, WORKDAY_MINUTES)
+    week, weekday = divmod(day, 5)
+    return (
+        dt.datetime.combine(start, dt.time())
+        + dt.timedelta(days=week * 7 + weekday)
+        + WORKDAY_START + dt.timedelta(minutes=minute)
+    )
+
+
+def generate_reservations(
+        args: argparse.Namespace,
+        room_ids: list[int],
+        user_ids: list[int],
+        first_id: int
+) -> Iterator[dict]:
+    """
+    Генерирует бронирования комнат по очереди, каждая комната
+    заполняется от args.start без пересечений.
+    """
+    rng = random.Random(args.seed)
+    counts = split_reservations(args.reservations, len(room_ids), rng)
+    reservation_id = first_id
+    for room_id, count in zip(room_ids, counts):
+        room_rng = random.Random(f'{args.seed}:{first_id}:{room_id}')
+        minute = 0
+        for _ in range(count):
+            minute += room_rng.choice(GAPS)
+            duration = room_rng.choice(DURATIONS)
+            if minute % WORKDAY_MINUTES + duration > WORKDAY_MINUTES:
+                minute += WORKDAY_MINUTES - minute % WORKDAY_MINUTES
+            from_reserve = to_datetime(args.start, minute)
+            to_reserve = from_reserve + dt.timedelta(minutes=duration)
+            minute += duration
+            yield {
+                'id': reservation_id,
+                'meetingroom_id': room_id,
+                'user_id': room_rng.choice(user_ids),
+                'from_reserve': from_reserve,
+                'to_reserve': to_reserve,
+                'last_to_reserve': to_reserve,
+                'repeat_frequency': None,
+                'repeat_interval': None,
+                'repeat_count': None,
+            }
+            reservation_id += 1
+
+
+async def insert_batches(
+        connection,
+        table,
+        rows: Iterator[dict],
+        batch_size: int,
+        total: int
+) -> None:
+    """
+    Вставляет строки пакетами, фиксируя транзакцию после каждого пакета,
+    и печатает прогресс в stderr.
+    """
+    from sqlalchemy import insert
+
+    started = time.perf_counter()
+    done = 0
+    for batch in batched(rows, batch_size):
+        await connection.execute(insert(table), batch)
+        await connection.commit()
+        done += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f'\r{table.name}: {done}/{total} '
+              f'({done / elapsed:.0f} rows/s)', end='', file=sys.stderr)
+    print(file=sys.stderr)
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import func, select
+
+    from app.core.base import Base
+    from app.core.db import engine
+    from app.core.hashing import hash_password
+    from app.models import MeetingRoom, Reservation, User
+
+    reservation_table = Reservation.__table__
+    async with engine.connect() as connection:
+        if args.append:
+            room_ids = list(await connection.scalars(
+                select(MeetingRoom.id).order_by(MeetingRoom.id)
+            ))
+            user_ids = list(await connection.scalars(
+                select(User.id).order_by(User.id)
+            ))
+            if not room_ids or not user_ids:
+                print('Нет комнат или пользователей для --append',
+                      file=sys.stderr)
+                return 1
+            first_id = (await connection.scalar(
+                select(func.max(Reservation.id))
+            ) or 0) + 1
+            last_to_reserve = await connection.scalar(
+                select(func.max(Reservation.last_to_reserve))
+            )
+            if last_to_reserve is not None:
+                # Новые бронирования начинаются с понедельника после
+                # последнего существующего и не пересекаются с ними.
+                last_day = last_to_reserve.date()
+                args.start = max(args.start, last_day + dt.timedelta(
+                    days=7 - last_day.weekday()
+                ))
+            args.rooms, args.users = len(room_ids), len(user_ids)
+        else:
+            room_ids = list(range(1, args.rooms + 1))
+            user_ids = list(range(1, args.users + 1))
+            first_id = 1
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+            # Индексы строятся один раз после загрузки, это быстрее,
+            # чем обновлять их при каждой вставке.
+            for index in reservation_table.indexes:
+                await connection.run_sync(index.drop)
+            await connection.commit()
+            hashed_password = hash_password(PASSWORD)
+            await insert_batches(connection, User.__table__, (
+                {'id': i, 'email': f'user{i}@example.com',
+                 'hashed_password': hashed_password, 'is_active': True,
+                 'is_superuser': False, 'is_verified': True}
+                for i in user_ids
+            ), args.batch_size, args.users)
+            await insert_batches(connection, MeetingRoom.__table__, (
+                {'id': i, 'name': f'Room {i}',
+                 'description': f'Синтетическая комната {i}'}
+                for i in room_ids
+            ), args.batch_size, args.rooms)
+        await insert_batches(
+            connection, reservation_table,
+            generate_reservations(args, room_ids, user_ids, first_id),
+            args.batch_size, args.reservations
+        )
+        if not args.append:
+            started = time.perf_counter()
+            for index in reservation_table.indexes:
+                await connection.run_sync(index.create)
+            await connection.commit()
+            print(f'indexes: {time.perf_counter() - started:.1f}s',
+                  file=sys.stderr)
+    await engine.dispose()
+    print(f'{args.rooms} rooms, {args.users} users '
+          f'(password {PASSWORD!r}), {args.reservations} reservations '
+          f'from id {first_id}')
+    return 0
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    os.environ['DATABASE_URL'] = arguments.database_url
+    os.environ['DATABASE_PROFILE'] = arguments.profile
+    sys.exit(asyncio.run(main(arguments)))
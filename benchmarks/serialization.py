@@ -0,0 +1,123 @@
+"""
+Сравнение сериализации списков бронирований.
+
+Отдает одни и те же бронирования двумя эндпоинтами тестового
+приложения: через response_model=list[ReservationDB] (валидация
+каждой строки Pydantic) и через dump_reservations (orjson напрямую
+из атрибутов), проверяет, что тела ответов совпадают, и печатает
+время ответа и ускорение для каждого размера списка.
+
+Запуск:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 10000 100000 --repeat 5
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import sys
+import time
+
+START = dt.datetime(2030, 1, 7, 8)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='число повторов, печатается лучшее время')
+    parser.add_argument('--series-share', type=float, default=0.1,
+                        help='доля повторений серий среди бронирований')
+    return parser.parse_args()
+
+
+def make_reservations(rows: int, series_share: float) -> list:
+    """
+    Создает несвязанные с сессией бронирования, как их возвращает
+    CRUDReservation.get_future_reservations_for_room.
+    """
+    from app.models import Reservation
+
+    series_every = round(1 / series_share) if series_share else 0
+    reservations = []
+    for i in range(rows):
+        from_reserve = START + dt.timedelta(minutes=30 * i)
+        is_series = series_every and i % series_every == 0
+        reservations.append(Reservation(
+            id=i + 1,
+            from_reserve=from_reserve,
+            to_reserve=from_reserve + dt.timedelta(minutes=25),
+            meetingroom_id=1,
+            user_id=i % 1000 + 1,
+            repeat_frequency='weekly' if is_series else None,
+            repeat_interval=1 if is_series else None,
+            repeat_count=10 if is_series else None,
+        ))
+    return reservations
+
+
+def create_app(reservations: list):
+    from fastapi import FastAPI
+
+    from app.core.serialization import dump_reservations, json_response
+    from app.schemas.reservation import ReservationDB
+
+    app = FastAPI()
+
+    @app.get(
+        '/response_model',
+        response_model=list[ReservationDB],
+        response_model_exclude_none=True
+    )
+    async def response_model():
+        return reservations
+
+    @app.get('/orjson', response_model=list[ReservationDB])
+    async def fast_path():
+        return json_response(dump_reservations(reservations))
+
+    return app
+
+
+async def measure(client, path: str, repeat: int) -> tuple[float, bytes]:
+    """
+    Запрашивает path repeat раз и возвращает лучшее время
+    в миллисекундах и тело ответа.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(path)
+        best = min(best, time.perf_counter() - started)
+        response.raise_for_status()
+    return best * 1000, response.content
+
+
+async def main(args: argparse.Namespace) -> int:
+    import json
+
+    import httpx
+
+    print(f'{"rows":>8} {"response_model ms":>18} {"orjson ms":>10} '
+          f'{"speedup":>8}')
+    for rows in args.rows:
+        app = create_app(make_reservations(rows, args.series_share))
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url='http://bench'
+        ) as client:
+            slow, expected = await measure(
+                client, '/response_model', args.repeat
+            )
+            fast, content = await measure(client, '/orjson', args.repeat)
+        if json.loads(content) != json.loads(expected):
+            print(f'{rows}: ответы различаются', file=sys.stderr)
+            return 1
+        print(f'{rows:>8} {slow:>18.1f} {fast:>10.1f} {slow / fast:>7.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    # Модели импортируют движок, но база данных в измерении не используется.
+    os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite://')
+    sys.exit(asyncio.run(main(parse_args())))